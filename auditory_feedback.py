@@ -0,0 +1,224 @@
+import queue
+import threading
+import time
+
+import numpy as np
+
+# ===================================
+# 청각 피드백 설정
+# ===================================
+SAMPLE_RATE = 44100
+
+# cue 이름 -> (주파수 Hz, 길이 s, 볼륨 0~1, pan -1(왼쪽)~1(오른쪽))
+CUE_SPECS = {
+    'proximity_far': (660, 0.08, 0.3, 0.0),
+    'proximity_near': (880, 0.08, 0.5, 0.0),
+    'proximity_critical': (1320, 0.06, 0.7, 0.0),
+    'lane_departure_left': (440, 0.15, 0.5, -1.0),
+    'lane_departure_right': (440, 0.15, 0.5, 1.0),
+}
+
+# cue 별 최소 재발생 간격 (s)
+CUE_COOLDOWN = {
+    'proximity_far': 0.6,
+    'proximity_near': 0.3,
+    'proximity_critical': 0.12,
+    'lane_departure_left': 0.5,
+    'lane_departure_right': 0.5,
+}
+
+
+def synthesize_tone(freq, duration, volume, pan=0.0, sample_rate=SAMPLE_RATE):
+    """사인파 톤을 (n, 2) int16 스테레오 버퍼로 만든다. 클릭 방지를 위해 앞뒤 5ms fade."""
+    n = int(sample_rate * duration)
+    t = np.arange(n) / sample_rate
+    wave = np.sin(2 * np.pi * freq * t)
+
+    fade = min(int(sample_rate * 0.005), n // 2)
+    if fade > 0:
+        ramp = np.linspace(0, 1, fade)
+        wave[:fade] *= ramp
+        wave[n - fade:] *= ramp[::-1]
+
+    left = volume * min(1.0, 1.0 - pan)
+    right = volume * min(1.0, 1.0 + pan)
+    stereo = np.stack([wave * left, wave * right], axis=1)
+    return (stereo * 32767).astype(np.int16)
+
+
+def mix_buffers(buffers):
+    """여러 버퍼를 더해서 하나로 만든다 (int16 범위로 clip)."""
+    if len(buffers) == 1:
+        return buffers[0]
+    n = max(b.shape[0] for b in buffers)
+    mixed = np.zeros((n, 2), dtype=np.int32)
+    for b in buffers:
+        mixed[:b.shape[0]] += b
+    return np.clip(mixed, -32768, 32767).astype(np.int16)
+
+
+class ToneBank():
+    def __init__(self, specs=CUE_SPECS, sample_rate=SAMPLE_RATE):
+        # 모든 cue를 미리 합성해 둔다 -> 재생 시점에는 합성 비용 없음
+        self.sample_rate = sample_rate
+        self.buffers = {
+            name: synthesize_tone(freq, duration, volume, pan, sample_rate)
+            for name, (freq, duration, volume, pan) in specs.items()
+        }
+
+    def __getitem__(self, name):
+        return self.buffers[name]
+
+    def __contains__(self, name):
+        return name in self.buffers
+
+
+# ===================================
+# 출력 장치
+# ===================================
+class NullAudioOutput():
+    """소리를 내지 않고 무엇이 언제 재생됐을지만 기록한다 (headless 테스트용)."""
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock  # AuditoryFeedback 과 같은 시계를 써야 지연이 의미 있다
+        self.played = []  # (요청 시각, 재생 시각, cue 이름 tuple, 샘플 수)
+        self._lock = threading.Lock()
+
+    def play(self, names, buffer, requested_at):
+        with self._lock:
+            self.played.append((requested_at, self.clock(), names, buffer.shape[0]))
+
+    def events(self):
+        with self._lock:
+            return list(self.played)
+
+    def latencies(self):
+        return [played_at - requested_at for requested_at, played_at, _, _ in self.events()]
+
+    def close(self):
+        pass
+
+
+class PygameAudioOutput():
+    def __init__(self, sample_rate=SAMPLE_RATE, buffer_size=256):
+        import pygame
+
+        self._pygame = pygame
+        if not pygame.mixer.get_init():
+            # buffer를 작게 잡아서 출력 지연을 줄인다
+            pygame.mixer.pre_init(sample_rate, -16, 2, buffer_size)
+            pygame.mixer.init()
+        self._sounds = {}
+
+    def play(self, names, buffer, requested_at):
+        sound = self._sounds.get(names)
+        if sound is None:
+            sound = self._pygame.sndarray.make_sound(np.ascontiguousarray(buffer))
+            self._sounds[names] = sound
+        sound.play()
+
+    def close(self):
+        self._sounds.clear()
+
+
+# ===================================
+# 청각 피드백 엔진
+# ===================================
+class AuditoryFeedback():
+    def __init__(self, output=None, queue_size=32, specs=CUE_SPECS, cooldown=CUE_COOLDOWN, clock=time.perf_counter):
+        # cooldown 판정과 큐 timestamp 는 모두 self.clock 기준
+        self.clock = clock
+        self.output = output if output is not None else PygameAudioOutput()
+        self.tones = ToneBank(specs)
+        self.cooldown = dict(cooldown)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._last_fired = {}
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='auditory-feedback', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        try:
+            self.queue.put_nowait(None)  # worker 깨우기
+        except queue.Full:
+            pass
+        self._thread.join(timeout=1.0)
+        self.output.close()
+
+    def reset(self):
+        """cooldown 기록을 지운다 (시뮬레이션 시간을 되감았을 때)."""
+        self._last_fired.clear()
+
+    def cue(self, name, now=None):
+        """cue를 큐에 넣는다. 시뮬레이션 스레드를 막지 않도록 큐가 차면 버린다.
+
+        now 를 넘길 때는 self.clock 과 같은 시계의 값이어야 한다 (cooldown 과 지연 측정에 같이 쓴다).
+        """
+        if name not in self.tones:
+            raise KeyError(f"unknown cue: {name}")
+        now = self.clock() if now is None else now
+        last = self._last_fired.get(name)
+        if last is not None and now - last < self.cooldown.get(name, 0):
+            return False
+        try:
+            self.queue.put_nowait((name, now))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._last_fired[name] = now
+        return True
+
+    def on_proximity(self, distance, thresholds=(10, 5, 2.5), now=None):
+        if distance is None:
+            return False
+        far, near, critical = thresholds
+        if distance <= critical:
+            return self.cue('proximity_critical', now)
+        elif distance <= near:
+            return self.cue('proximity_near', now)
+        elif distance <= far:
+            return self.cue('proximity_far', now)
+        return False
+
+    def on_lane_departure(self, offset, half_width=1.75, now=None):
+        # offset > 0 : 차선 중심에서 왼쪽으로 벗어남
+        if offset is None or abs(offset) <= half_width:
+            return False
+        if offset > 0:
+            return self.cue('lane_departure_left', now)
+        return self.cue('lane_departure_right', now)
+
+    def _run(self):
+        while self._running:
+            try:
+                item = self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is None:
+                continue
+
+            # 동시에 들어온 cue는 한 버퍼로 mixing
+            pending = [item]
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    pending.append(item)
+
+            names = tuple(sorted(set(name for name, _ in pending)))
+            requested_at = min(t for _, t in pending)
+            buffer = mix_buffers([self.tones[name] for name in names])
+            self.output.play(names, buffer, requested_at)
@@ -0,0 +1,86 @@
+import pygame
+
+
+def merge_rects(rects):
+    """겹치는 rect 들을 합쳐서 update 호출 수를 줄인다."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DisplayManager():
+    """캐시된 배경 위에 바뀐 영역만 다시 그리고 pygame.display.update(rects) 로 내보낸다.
+
+    프레임 순서: begin_frame() -> blit()/mark() -> present()
+    """
+
+    def __init__(self, screen, background=None, full_update_ratio=0.5):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.background = None
+        # 바뀐 면적이 화면의 이 비율을 넘으면 그냥 flip
+        self.full_update_ratio = full_update_ratio
+        self._previous = []
+        self._current = []
+        self._full_redraw = True
+        self.pixels_pushed = 0
+        if background is not None:
+            self.set_background(background)
+
+    def set_background(self, background):
+        self.background = background
+        self._full_redraw = True
+
+    def begin_frame(self):
+        """지난 프레임에 그린 영역을 배경으로 복원."""
+        if self._full_redraw:
+            if self.background is not None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.fill((0, 0, 0))
+        else:
+            for rect in self._previous:
+                self.restore(rect)
+        self._current = []
+
+    def restore(self, rect):
+        if self.background is not None:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill((0, 0, 0), rect)
+
+    def blit(self, surface, position, area=None):
+        rect = self.screen.blit(surface, position, area)
+        return self.mark(rect)
+
+    def mark(self, rect):
+        """직접 screen 에 그린 영역 (pygame.draw.* 반환값 등)을 등록."""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self._current.append(rect)
+        return rect
+
+    def present(self):
+        if self._full_redraw:
+            pygame.display.flip()
+            self.pixels_pushed = self.screen_rect.width * self.screen_rect.height
+            self._full_redraw = False
+        else:
+            dirty = merge_rects(self._previous + self._current)
+            area = sum(r.width * r.height for r in dirty)
+            if area > self.full_update_ratio * self.screen_rect.width * self.screen_rect.height:
+                pygame.display.flip()
+                self.pixels_pushed = self.screen_rect.width * self.screen_rect.height
+            else:
+                pygame.display.update(dirty)
+                self.pixels_pushed = area
+        self._previous = self._current
+        self._current = []
@@ -0,0 +1,118 @@
+import math
+
+
+# ===================================
+# 보조 함수
+# ===================================
+def dampenSteering(angle, elasticity, delta):
+    if angle == 0:
+        return 0
+    elif angle > 0:
+        return max(angle - elasticity, 0)
+    else:
+        return min(angle + elasticity, 0)
+
+def dampenSpeed(speed, velocity_dampening, delta):
+    if speed == 0:
+        return 0
+    elif speed > 0:
+        return max(speed - velocity_dampening * delta * (speed / 10), 0)
+    else:
+        return min(speed - velocity_dampening * delta * (speed / 10), 0)
+
+
+# ===================================
+# 적분기 (Car2.update 에서 사용)
+# ===================================
+class Dynamics():
+    """Car2 의 pose / angle / speed 를 dt 만큼 진행시킨다.
+
+    max_step 이 있으면 dt 를 max_step 이하의 substep 으로 나눠서 적분하므로
+    clock.tick 이 튀어도 (또는 headless 로 큰 dt 를 써도) 궤적이 바뀌지 않는다.
+    yaw rate 는 기존 모델 (steering * speed / steer_ratio) 이 기본이고,
+    wheelbase 를 주면 kinematic bicycle (speed / wheelbase * tan(steering)) 을 쓴다.
+    """
+
+    def __init__(self, max_step=None, steer_ratio=20, wheelbase=None, max_wheel_angle=0.6):
+        self.max_step = max_step
+        self.steer_ratio = steer_ratio
+        self.wheelbase = wheelbase
+        self.max_wheel_angle = max_wheel_angle
+
+    def yaw_rate(self, speed, steering_angle):
+        if self.wheelbase is None:
+            return steering_angle * speed / self.steer_ratio
+        wheel_angle = min(max(steering_angle, -self.max_wheel_angle), self.max_wheel_angle)
+        return speed / self.wheelbase * math.tan(wheel_angle)
+
+    def substeps(self, dt):
+        if self.max_step is None or dt <= self.max_step:
+            return 1
+        return int(math.ceil(dt / self.max_step))
+
+    def step(self, car, dt):
+        n = self.substeps(dt)
+        h = dt / n
+        for _ in range(n):
+            self.integrate(car, h)
+        car.vel[0] = math.cos(car.angle) * car.speed
+        car.vel[1] = math.sin(car.angle) * car.speed
+
+    def integrate(self, car, h):
+        raise NotImplementedError
+
+
+class EulerDynamics(Dynamics):
+    """기존 Car2.update 와 같은 explicit Euler (max_step 이 없으면 결과도 동일)."""
+
+    def step(self, car, dt):
+        n = self.substeps(dt)
+        h = dt / n
+        for _ in range(n):
+            car.angle += self.yaw_rate(car.speed, car.steering_angle) * h
+            car.vel[0] = math.cos(car.angle) * car.speed
+            car.vel[1] = math.sin(car.angle) * car.speed
+            car.pose[0] += car.vel[0] * h
+            car.pose[1] += car.vel[1] * h
+            if not car.constant_speed:
+                car.speed = dampenSpeed(car.speed, car.speed_dampening, h)
+
+
+class RK4Dynamics(Dynamics):
+    """(x, y, angle, speed) 전체를 RK4 로 적분. speed 감쇠 dv/dt = -k v / 10 도 포함."""
+
+    def derivative(self, car, state):
+        x, y, angle, speed = state
+        dv = 0 if car.constant_speed else -car.speed_dampening * speed / 10
+        return (math.cos(angle) * speed, math.sin(angle) * speed,
+                self.yaw_rate(speed, car.steering_angle), dv)
+
+    def integrate(self, car, h):
+        state = (car.pose[0], car.pose[1], car.angle, car.speed)
+        k1 = self.derivative(car, state)
+        k2 = self.derivative(car, [s + h / 2 * k for s, k in zip(state, k1)])
+        k3 = self.derivative(car, [s + h / 2 * k for s, k in zip(state, k2)])
+        k4 = self.derivative(car, [s + h * k for s, k in zip(state, k3)])
+        x, y, angle, speed = [s + h / 6 * (a + 2 * b + 2 * c + d)
+                              for s, a, b, c, d in zip(state, k1, k2, k3, k4)]
+        car.pose[0], car.pose[1], car.angle, car.speed = x, y, angle, speed
+
+
+class ArcDynamics(Dynamics):
+    """substep 동안 speed / steering 이 일정하다고 보고 원호를 정확히 따라간다."""
+
+    def integrate(self, car, h, eps=1e-9):
+        speed = car.speed
+        yaw_rate = self.yaw_rate(speed, car.steering_angle)
+        angle0 = car.angle
+        angle1 = angle0 + yaw_rate * h
+        if abs(yaw_rate) < eps:
+            car.pose[0] += math.cos(angle0) * speed * h
+            car.pose[1] += math.sin(angle0) * speed * h
+        else:
+            radius = speed / yaw_rate
+            car.pose[0] += radius * (math.sin(angle1) - math.sin(angle0))
+            car.pose[1] -= radius * (math.cos(angle1) - math.cos(angle0))
+        car.angle = angle1
+        if not car.constant_speed:
+            car.speed = dampenSpeed(speed, car.speed_dampening, h)
@@ -0,0 +1,188 @@
+import math
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# ===================================
+# 햅틱 명령 계산
+# ===================================
+HapticCommand = namedtuple('HapticCommand', ['torque', 'vibration', 'created_at'])
+
+HAPTIC_GAINS = {
+    'lane_offset': 1.5,      # Nm / m
+    'heading_error': 4.0,    # Nm / rad
+    'steering_damping': 0.5, # Nm / rad
+    'max_torque': 5.0,       # Nm
+}
+
+
+def compute_haptic_command(car, lane_offset=None, heading_error=None, nearest_distance=None,
+                           gains=HAPTIC_GAINS, vibration_range=(10, 2.5)):
+    """ego 상태로부터 핸들 토크/진동 명령을 만든다.
+
+    lane_offset > 0 은 차선 중심에서 왼쪽으로 벗어난 것 -> 오른쪽(음수) 토크로 복원.
+    """
+    torque = -gains['steering_damping'] * car.steering_angle
+    if lane_offset is not None:
+        torque -= gains['lane_offset'] * lane_offset
+    if heading_error is not None:
+        torque -= gains['heading_error'] * heading_error
+    max_torque = gains['max_torque']
+    torque = min(max(torque, -max_torque), max_torque)
+
+    vibration = 0.0
+    if nearest_distance is not None:
+        far, critical = vibration_range
+        if nearest_distance <= critical:
+            vibration = 1.0
+        elif nearest_distance < far:
+            vibration = (far - nearest_distance) / (far - critical)
+
+    return HapticCommand(torque, vibration, time.perf_counter())
+
+
+# ===================================
+# 장치 드라이버
+# ===================================
+class HapticDevice():
+    """실제 장치 드라이버는 이 클래스를 상속해서 send()를 구현한다."""
+
+    def open(self):
+        pass
+
+    def send(self, command, sent_at):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SimulatedHapticDevice(HapticDevice):
+    """하드웨어 없이 명령을 기록하고 지연/지터를 측정한다.
+
+    ring buffer 라서 capacity 를 넘으면 가장 오래된 샘플부터 덮어쓴다 (overwritten 으로 센다).
+    """
+
+    def __init__(self, capacity=600000):
+        self.capacity = capacity
+        self.sent_at = np.zeros(capacity)
+        self.torque = np.zeros(capacity)
+        self.vibration = np.zeros(capacity)
+        self.latency = np.full(capacity, np.nan)  # 새 명령이 처음 전달될 때만 기록
+        self.count = 0  # 지금까지 받은 전체 명령 수
+        self._last_created = None
+
+    @property
+    def overwritten(self):
+        return max(self.count - self.capacity, 0)
+
+    def send(self, command, sent_at):
+        i = self.count % self.capacity
+        self.sent_at[i] = sent_at
+        self.torque[i] = command.torque
+        self.vibration[i] = command.vibration
+        if command.created_at != self._last_created:
+            self.latency[i] = sent_at - command.created_at
+            self._last_created = command.created_at
+        else:
+            self.latency[i] = np.nan
+        self.count += 1
+
+    def recent(self, array):
+        """ring 에 남아 있는 샘플을 오래된 것부터 순서대로."""
+        if self.count <= self.capacity:
+            return array[:self.count]
+        start = self.count % self.capacity
+        return np.concatenate((array[start:], array[:start]))
+
+    def stats(self, rate):
+        n = min(self.count, self.capacity)
+        if n < 2:
+            return None
+        period = 1.0 / rate
+        intervals = np.diff(self.recent(self.sent_at))
+        latency = self.recent(self.latency)
+        latency = latency[~np.isnan(latency)]
+        return {
+            'samples': self.count,
+            'overwritten': self.overwritten,
+            'mean_rate': 1.0 / intervals.mean(),
+            'jitter_std': intervals.std(),
+            'jitter_max': np.abs(intervals - period).max(),
+            'latency_mean': latency.mean() if latency.size else math.nan,
+            'latency_p99': np.percentile(latency, 99) if latency.size else math.nan,
+            'latency_max': latency.max() if latency.size else math.nan,
+        }
+
+
+# ===================================
+# 햅틱 피드백 채널
+# ===================================
+class HapticFeedback():
+    def __init__(self, device=None, rate=1000, spin_margin=0.0015):
+        self.device = device if device is not None else SimulatedHapticDevice()
+        self.rate = rate
+        self.period = 1.0 / rate
+        # deadline 직전 spin_margin 동안은 sleep 대신 busy-wait (OS sleep 오차 보정).
+        # 주기의 20% 를 넘으면 spin 이 GIL 을 계속 잡아 시뮬레이션 스레드를 굶기므로 잘라낸다
+        self.spin_margin = min(spin_margin, 0.2 * self.period)
+        self.overruns = 0
+        self._command = HapticCommand(0.0, 0.0, time.perf_counter())
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return self
+        self.device.open()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='haptic-feedback', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self.device.close()
+
+    def update(self, car, lane_offset=None, heading_error=None, nearest_distance=None):
+        """시뮬레이션 스텝마다 호출. 최신 명령만 남기고 전송은 dispatch 스레드가 한다."""
+        command = compute_haptic_command(car, lane_offset, heading_error, nearest_distance)
+        with self._lock:
+            self._command = command
+        return command
+
+    def stats(self):
+        """장치 timing 통계 + overruns (목표 rate 를 못 맞춰 건너뛴 주기 수)."""
+        stats = getattr(self.device, 'stats', None)
+        stats = stats(self.rate) if stats is not None else None
+        if stats is None:
+            return {'overruns': self.overruns}
+        stats['overruns'] = self.overruns
+        return stats
+
+    def _run(self):
+        next_deadline = time.perf_counter() + self.period
+        while self._running:
+            remaining = next_deadline - time.perf_counter()
+            if remaining > self.spin_margin:
+                time.sleep(remaining - self.spin_margin)
+            while time.perf_counter() < next_deadline:
+                time.sleep(0)  # spin 중에도 GIL 을 놓는다
+
+            with self._lock:
+                command = self._command
+            self.device.send(command, time.perf_counter())
+
+            next_deadline += self.period
+            now = time.perf_counter()
+            if now > next_deadline:
+                # 한 주기 이상 밀리면 몰아서 보내지 않고 다음 슬롯으로 건너뛴다
+                missed = int((now - next_deadline) / self.period) + 1
+                self.overruns += missed
+                next_deadline += missed * self.period
@@ -0,0 +1,255 @@
+import collections
+import queue
+import socket
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# accelerate / turn 은 Car2.accelerate(dv) / Car2.turn(direction) 에 그대로 넘기는 값
+InputCommand = namedtuple('InputCommand', ['sampled_at', 'accelerate', 'turn'])
+
+SOCKET_FORMAT = '<3d'  # accelerate, turn, 보낸 시각 (time.time())
+
+
+def apply_command(car, accelerate, turn):
+    if accelerate:
+        car.accelerate(accelerate)
+    if turn:
+        car.turn(turn)
+
+
+# ===================================
+# 입력 장치
+# ===================================
+class InputSource():
+    """poll(now) -> (accelerate, turn).
+
+    realtime 이 False 인 source (scripted) 는 now 로 시뮬레이션 시간을 받고 스레드 없이 직접 부른다.
+    """
+    realtime = True
+
+    def open(self):
+        return self
+
+    def poll(self, now):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSource(InputSource):
+    realtime = False
+
+    def poll(self, now):
+        return 0.0, 0.0
+
+
+class KeyboardSource(InputSource):
+    """방향키. turn_step 부호로 좌표계 차이를 맞춘다 (지도 좌표 +1, 화면 좌표 -1 이 왼쪽)."""
+
+    def __init__(self, accel_step=0.2, turn_step=1.0):
+        import pygame
+        self._pygame = pygame
+        self.accel_step = accel_step
+        self.turn_step = turn_step
+
+    def poll(self, now):
+        pg = self._pygame
+        pressed = pg.key.get_pressed()
+        accelerate = self.accel_step * (pressed[pg.K_UP] - pressed[pg.K_DOWN])
+        turn = self.turn_step * (pressed[pg.K_LEFT] - pressed[pg.K_RIGHT])
+        return accelerate, turn
+
+
+class JoystickSource(InputSource):
+    """조이스틱 / 휠. 축 값은 main 스레드의 event 처리로 갱신된다."""
+
+    def __init__(self, index=0, steer_axis=0, throttle_axis=1, accel_step=0.2, turn_step=1.0,
+                 deadzone=0.1, invert_throttle=True):
+        import pygame
+        pygame.joystick.init()
+        if pygame.joystick.get_count() <= index:
+            raise RuntimeError('joystick %d not found' % index)
+        self.joystick = pygame.joystick.Joystick(index)
+        self.steer_axis = steer_axis
+        self.throttle_axis = throttle_axis
+        self.accel_step = accel_step
+        self.turn_step = turn_step
+        self.deadzone = deadzone
+        self.invert_throttle = invert_throttle
+
+    def _axis(self, axis):
+        value = self.joystick.get_axis(axis)
+        return 0.0 if abs(value) < self.deadzone else value
+
+    def poll(self, now):
+        throttle = self._axis(self.throttle_axis)
+        if self.invert_throttle:
+            throttle = -throttle
+        # 축 오른쪽(+) 이 오른쪽 조향 -> turn 은 음수
+        return self.accel_step * throttle, -self.turn_step * self._axis(self.steer_axis)
+
+
+class ScriptedSource(InputSource):
+    """시간 배열과 명령 배열 (zero-order hold). pygame 없이 batch 실행에 사용."""
+    realtime = False
+
+    def __init__(self, times, accelerate, turn):
+        self.times = np.asarray(times, dtype=float)
+        self.accelerate = np.asarray(accelerate, dtype=float)
+        self.turn = np.asarray(turn, dtype=float)
+
+    @classmethod
+    def from_file(cls, path):
+        """.npz (times, accelerate, turn) 또는 'time,accelerate,turn' 헤더의 csv."""
+        if path.endswith('.npz'):
+            with np.load(path) as data:
+                return cls(data['times'], data['accelerate'], data['turn'])
+        data = np.genfromtxt(path, delimiter=',', names=True)
+        return cls(data['time'], data['accelerate'], data['turn'])
+
+    def save(self, path):
+        np.savez(path, times=self.times, accelerate=self.accelerate, turn=self.turn)
+
+    @property
+    def duration(self):
+        return self.times[-1] if self.times.size else 0.0
+
+    def poll(self, now):
+        i = np.searchsorted(self.times, now, side='right') - 1
+        if i < 0:
+            return 0.0, 0.0
+        return float(self.accelerate[i]), float(self.turn[i])
+
+
+class SocketSource(InputSource):
+    """UDP 로 SOCKET_FORMAT 패킷을 받아 최신 명령을 유지한다. hold_time 동안 새 패킷이 없으면 입력 없음."""
+
+    def __init__(self, host='127.0.0.1', port=5005, hold_time=0.5):
+        self.address = (host, port)
+        self.hold_time = hold_time
+        self.transport_latencies = collections.deque(maxlen=10000)
+        self._socket = None
+        self._command = (0.0, 0.0)
+        self._received_at = None
+
+    def open(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(self.address)
+        self._socket.setblocking(False)
+        self.address = self._socket.getsockname()
+        return self
+
+    def poll(self, now):
+        size = struct.calcsize(SOCKET_FORMAT)
+        while True:
+            try:
+                packet = self._socket.recv(64)
+            except (BlockingIOError, InterruptedError):
+                break
+            if len(packet) != size:
+                continue
+            accelerate, turn, sent_at = struct.unpack(SOCKET_FORMAT, packet)
+            self._command = (accelerate, turn)
+            self._received_at = time.monotonic()
+            self.transport_latencies.append(time.time() - sent_at)
+        if self._received_at is None or time.monotonic() - self._received_at > self.hold_time:
+            return 0.0, 0.0
+        return self._command
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def send_command(sock, address, accelerate, turn):
+    """SocketSource 로 명령 하나를 보낸다 (원격 운전자 / 테스트용)."""
+    sock.sendto(struct.pack(SOCKET_FORMAT, accelerate, turn, time.time()), address)
+
+
+# ===================================
+# 시뮬레이션 rate 로 polling 하는 스레드
+# ===================================
+class InputPoller():
+    """source 를 자기 스레드에서 rate Hz 로 읽어 timestamp 와 함께 queue 에 넣는다.
+
+    main 루프는 latest() 로 가장 최근 명령을 꺼내고, 꺼낸 시각 - 샘플 시각을 입력 지연으로 기록한다.
+    queue 가 차면 가장 오래된 샘플을 버린다.
+    """
+
+    def __init__(self, source, rate=60, queue_size=64):
+        self.source = source
+        self.rate = rate
+        self.period = 1.0 / rate
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.latencies = collections.deque(maxlen=10000)
+        self._last = InputCommand(time.perf_counter(), 0.0, 0.0)
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return self
+        self.source.open()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='input-poller', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self.source.close()
+
+    def _run(self):
+        next_time = time.perf_counter()
+        while self._running:
+            accelerate, turn = self.source.poll(time.perf_counter())
+            command = InputCommand(time.perf_counter(), accelerate, turn)
+            try:
+                self.queue.put_nowait(command)
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.dropped += 1
+                self.queue.put_nowait(command)
+            next_time += self.period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.perf_counter()
+
+    def latest(self):
+        """쌓인 샘플을 모두 꺼내 가장 최근 명령을 반환 (새 샘플이 없으면 직전 명령)."""
+        now = time.perf_counter()
+        while True:
+            try:
+                command = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.latencies.append(now - command.sampled_at)
+            self._last = command
+        return self._last.accelerate, self._last.turn
+
+    def stats(self):
+        latencies = np.array(self.latencies)
+        if latencies.size == 0:
+            return {'samples': 0, 'dropped': self.dropped}
+        return {
+            'samples': latencies.size,
+            'dropped': self.dropped,
+            'latency_mean': latencies.mean(),
+            'latency_p99': np.percentile(latencies, 99),
+            'latency_max': latencies.max(),
+        }
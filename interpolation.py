@@ -0,0 +1,139 @@
+import math
+
+import numpy as np
+
+from obstacle_states import X, Y, ORIENTATION, VELOCITY
+from prediction import wrap_angle
+
+METHODS = ('linear', 'hermite')
+
+
+# ===================================
+# 두 sample 사이 보간 (모든 장애물을 한 번에)
+# ===================================
+def interpolate_states(states0, states1, fraction, dt=None, method='linear'):
+    """states0 (n, 4) -> states1 (n, 4) 사이 fraction (0~1, scalar 또는 (n,)) 위치의 state.
+
+    orientation 은 짧은 쪽으로 돌아가도록 wrap 한 차이로 보간하고 결과도 [-pi, pi) 로 둔다.
+    hermite 는 각 sample 의 velocity / orientation 을 접선으로 쓰는 3차 보간 (dt 필요) 이라
+    곡선 구간에서 위치가 매끄럽다. velocity 가 기록되지 않은 scenario 에서는 linear 를 쓴다.
+    """
+    states0 = np.asarray(states0, dtype=float)
+    states1 = np.asarray(states1, dtype=float)
+    u = np.asarray(fraction, dtype=float)
+    out = states0 + (states1 - states0) * (u[:, None] if u.ndim else u)
+    turn = wrap_angle(states1[:, ORIENTATION] - states0[:, ORIENTATION])
+    out[:, ORIENTATION] = wrap_angle(states0[:, ORIENTATION] + turn * u)
+
+    if method == 'hermite':
+        if dt is None:
+            raise ValueError('hermite interpolation needs dt')
+        u2, u3 = u * u, u * u * u
+        h00 = 2 * u3 - 3 * u2 + 1
+        h10 = u3 - 2 * u2 + u
+        h01 = -2 * u3 + 3 * u2
+        h11 = u3 - u2
+        for axis, trig in ((X, np.cos), (Y, np.sin)):
+            m0 = states0[:, VELOCITY] * trig(states0[:, ORIENTATION]) * dt
+            m1 = states1[:, VELOCITY] * trig(states1[:, ORIENTATION]) * dt
+            out[:, axis] = h00 * states0[:, axis] + h10 * m0 + h01 * states1[:, axis] + h11 * m1
+    elif method != 'linear':
+        raise ValueError('unknown interpolation method %r (%s)' % (method, ', '.join(METHODS)))
+    return out
+
+
+# ===================================
+# 연속 시간으로 읽는 table
+# ===================================
+class InterpolatedTable():
+    """time step 단위 table (ObstacleStateTable / TiledScenario) 을 실수 time step 으로 읽는다.
+
+    at(t) 의 t 는 시뮬레이션 시간 / dt. floor(t), floor(t) + 1 두 sample 이 모두 valid 하면 보간하고,
+    다음 sample 이 없으면 (궤적 끝) 마지막 state 를 유지, 이전 sample 이 없으면 (아직 등장 전) invalid.
+    정수 t 는 원래 table 과 같은 결과이고, ids / lengths / widths / dt 는 원래 table 그대로라
+    draw_dynamic_obstacles, nearest_obstacles, time_to_collision 에 그대로 넘길 수 있다.
+    """
+
+    def __init__(self, table, method='linear'):
+        if method not in METHODS:
+            raise ValueError('unknown interpolation method %r (%s)' % (method, ', '.join(METHODS)))
+        self.table = table
+        self.method = method
+        self._cached_time = None
+        self._cached = None
+
+    @property
+    def ids(self):
+        return self.table.ids
+
+    @property
+    def lengths(self):
+        return self.table.lengths
+
+    @property
+    def widths(self):
+        return self.table.widths
+
+    @property
+    def dt(self):
+        return self.table.dt
+
+    @property
+    def num_steps(self):
+        return self.table.num_steps
+
+    def __len__(self):
+        return len(self.table)
+
+    def at(self, time):
+        """실수 time step 의 (states (n, 4), valid (n,))."""
+        # 한 프레임에서 그리기 / 거리 / TTC 가 같은 시각을 여러 번 묻는다
+        if time == self._cached_time:
+            return self._cached
+        k = int(math.floor(time))
+        fraction = time - k
+        states0, valid0 = self.table.at(k)
+        if fraction == 0:
+            result = (states0, valid0)
+        else:
+            states1, valid1 = self.table.at(k + 1)
+            both = valid0 & valid1
+            states = states0.copy()
+            if both.any():
+                states[both] = interpolate_states(states0[both], states1[both], fraction, self.dt, self.method)
+            result = (states, valid0)
+        self._cached_time = time
+        self._cached = result
+        return result
+
+    def clear(self):
+        """원래 table 의 내용이 바뀌었을 때 (tile 교체 등)."""
+        self._cached_time = None
+        self._cached = None
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from main_rev import load_scenario
+    from obstacle_states import ObstacleStateTable
+
+    parser = argparse.ArgumentParser(description='benchmark continuous-time obstacle interpolation')
+    parser.add_argument('scenario', nargs='?', default='./scenario/USA_Lanker-1_1_T-1.xml')
+    parser.add_argument('--copies', type=int, default=100, help='replicate obstacles to stress the batch')
+    parser.add_argument('--method', choices=METHODS, default='linear')
+    args = parser.parse_args()
+
+    scenario, _ = load_scenario(args.scenario)
+    table = ObstacleStateTable.from_scenario(scenario)
+    big = ObstacleStateTable(np.arange(len(table) * args.copies), np.tile(table.states, (args.copies, 1, 1)),
+                             np.tile(table.valid, (args.copies, 1)), table.dt,
+                             np.tile(table.lengths, args.copies), np.tile(table.widths, args.copies))
+    interpolated = InterpolatedTable(big, method=args.method)
+    times = np.linspace(0, big.num_steps - 1, 2000)
+    started = time.perf_counter()
+    for t in times:
+        interpolated.at(float(t))
+    elapsed = (time.perf_counter() - started) / len(times)
+    print(f"{len(big)} obstacles, {args.method}: {elapsed * 1e6:.0f} us per query")
@@ -0,0 +1,150 @@
+import bisect
+from collections import namedtuple
+
+import numpy as np
+
+from input_sources import ScriptedSource
+
+CAR_FIELDS = ('pose', 'vel', 'speed', 'angle', 'steering_angle', 'gear', 'constant_speed', 'delta')
+ROUTE_FIELDS = ('lanelets', 'cost_to_goal', 'progress', 'current', 'replans', 'repairs', 'goal_reached')
+
+Keyframe = namedtuple('Keyframe', ['time_step', 'sim_time', 'car', 'route', 'extras'])
+
+
+# ===================================
+# 상태 저장 / 복원
+# ===================================
+def capture_car(car):
+    return tuple(list(v) if isinstance(v, list) else v for v in (getattr(car, f) for f in CAR_FIELDS))
+
+
+def restore_car(car, state):
+    for field, value in zip(CAR_FIELDS, state):
+        setattr(car, field, list(value) if isinstance(value, list) else value)
+
+
+def capture_route(route):
+    if route is None:
+        return None
+    lanelets = None if route.lanelets is None else tuple(route.lanelets)
+    cost = None if route.cost_to_goal is None else tuple(route.cost_to_goal)
+    return (lanelets, cost, route.progress, route.current, route.replans, route.repairs, route.goal_reached)
+
+
+def restore_route(route, state):
+    if route is None or state is None:
+        return
+    lanelets, cost, progress, current, replans, repairs, goal_reached = state
+    route.lanelets = None if lanelets is None else list(lanelets)
+    route.cost_to_goal = None if cost is None else list(cost)
+    route._position = {} if lanelets is None else {i: k for k, i in enumerate(lanelets)}
+    route.progress = progress
+    route.current = current
+    route.replans = replans
+    route.repairs = repairs
+    route.goal_reached = goal_reached
+
+
+# ===================================
+# Timeline
+# ===================================
+class Timeline():
+    """step 별 입력 (dt, accelerate, turn) 과 interval step 마다의 keyframe 을 기록한다.
+
+    seek(k) 는 k 이전의 가장 가까운 keyframe 을 복원하고 그 뒤 입력만 다시 적분하므로
+    최대 interval step 만 재생한다. 기록된 범위를 넘어가면 입력 없이 default_dt 로 진행.
+    extras 는 snapshot() / restore(state) 를 가진 객체 (예: TrafficSimulation).
+    """
+
+    def __init__(self, car, route=None, interval=50, default_dt=1 / 30, capacity=4096, extras=()):
+        self.car = car
+        self.route = route
+        self.extras = list(extras)
+        self.interval = interval
+        self.default_dt = default_dt
+        self.dt = np.zeros(capacity)
+        self.accelerate = np.zeros(capacity)
+        self.turn = np.zeros(capacity)
+        self.length = 0         # 입력이 기록된 step 수
+        self._steps = []        # keyframe time_step (정렬)
+        self._keyframes = {}
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def keyframe_steps(self):
+        return list(self._steps)
+
+    def snapshot(self, time_step, sim_time, force=False):
+        """step 을 시작하기 전 상태를 interval 마다 저장."""
+        if not force and time_step % self.interval:
+            return None
+        if time_step not in self._keyframes:
+            bisect.insort(self._steps, time_step)
+        keyframe = Keyframe(time_step, sim_time, capture_car(self.car), capture_route(self.route),
+                            [extra.snapshot() for extra in self.extras])
+        self._keyframes[time_step] = keyframe
+        return keyframe
+
+    def record(self, time_step, dt, accelerate, turn):
+        """time_step 의 입력을 기록. 과거로 seek 한 뒤 새로 입력하면 그 이후 기록은 버린다 (새 분기)."""
+        if time_step < self.length:
+            self.truncate(time_step)
+        elif time_step > self.length:
+            # 기록 없이 건너뛴 구간은 입력 없음으로 채움
+            self._reserve(time_step)
+            self.dt[self.length:time_step] = self.default_dt
+            self.accelerate[self.length:time_step] = 0
+            self.turn[self.length:time_step] = 0
+        self._reserve(time_step + 1)
+        self.dt[time_step] = dt
+        self.accelerate[time_step] = accelerate
+        self.turn[time_step] = turn
+        self.length = time_step + 1
+
+    def truncate(self, time_step):
+        self.length = min(self.length, time_step)
+        cut = bisect.bisect_right(self._steps, time_step)
+        for step in self._steps[cut:]:
+            del self._keyframes[step]
+        del self._steps[cut:]
+
+    def _reserve(self, size):
+        if size <= self.dt.shape[0]:
+            return
+        capacity = max(size, 2 * self.dt.shape[0])
+        self.dt = np.resize(self.dt, capacity)
+        self.accelerate = np.resize(self.accelerate, capacity)
+        self.turn = np.resize(self.turn, capacity)
+
+    def inputs(self, time_step):
+        if time_step < self.length:
+            return self.dt[time_step], self.accelerate[time_step], self.turn[time_step]
+        return self.default_dt, 0.0, 0.0
+
+    def script(self):
+        """기록된 입력을 시뮬레이션 시간 기준 ScriptedSource 로 (녹화한 운전을 batch 로 다시 돌릴 때)."""
+        times = np.concatenate([[0.0], np.cumsum(self.dt[:self.length])[:-1]])
+        return ScriptedSource(times, self.accelerate[:self.length].copy(), self.turn[:self.length].copy())
+
+    def seek(self, target, step_fn):
+        """target step 시작 상태로 되돌린다. step_fn(dt, accelerate, turn) 이 한 step 을 진행. 반환: sim_time."""
+        target = max(int(target), 0)
+        i = bisect.bisect_right(self._steps, target) - 1
+        if i < 0:
+            raise ValueError('no keyframe at or before step %d' % target)
+        keyframe = self._keyframes[self._steps[i]]
+        restore_car(self.car, keyframe.car)
+        restore_route(self.route, keyframe.route)
+        for extra, state in zip(self.extras, keyframe.extras):
+            extra.restore(state)
+
+        sim_time = keyframe.sim_time
+        for k in range(keyframe.time_step, target):
+            # 기록 범위 밖으로 진행하는 경우에도 keyframe 을 남겨 다음 seek 를 빠르게
+            self.snapshot(k, sim_time)
+            dt, accelerate, turn = self.inputs(k)
+            step_fn(dt, accelerate, turn)
+            sim_time += dt
+        return sim_time
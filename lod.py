@@ -0,0 +1,89 @@
+import numpy as np
+
+from shared_scenario import concat_vertices
+
+# 단순화 허용 오차 (m). 0 은 원본
+DEFAULT_TOLERANCES = (0.0, 0.05, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+def douglas_peucker(points, tolerance):
+    """polyline (n, 2) 에서 남길 점의 bool mask. 끝점은 항상 남는다."""
+    n = points.shape[0]
+    keep = np.zeros(n, dtype=bool)
+    if n < 3 or tolerance <= 0:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        ab = b - a
+        length = np.hypot(ab[0], ab[1])
+        inner = points[first + 1:last] - a
+        if length < 1e-12:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(ab[0] * inner[:, 1] - ab[1] * inner[:, 0]) / length
+        k = int(distances.argmax())
+        if distances[k] > tolerance:
+            split = first + 1 + k
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+class LaneletLOD():
+    """lanelet 경계 / 다각형을 tolerance 별로 미리 단순화해 둔다 (load 시 한 번).
+
+    level(scale) 은 단순화 오차가 pixel_tolerance px 이하인 가장 거친 단계를 고르므로
+    멀리서 볼수록 점 수가 줄어 화면에 그리는 점 수가 줌에 거의 무관해진다.
+    """
+
+    def __init__(self, lefts, rights, tolerances=DEFAULT_TOLERANCES, pixel_tolerance=0.5):
+        self.tolerances = tuple(sorted(tolerances))
+        self.pixel_tolerance = pixel_tolerance
+        self.bboxes = np.array([[min(l[:, 0].min(), r[:, 0].min()), min(l[:, 1].min(), r[:, 1].min()),
+                                 max(l[:, 0].max(), r[:, 0].max()), max(l[:, 1].max(), r[:, 1].max())]
+                                for l, r in zip(lefts, rights)]).reshape(-1, 4)
+        self.levels = []
+        # 각 단계는 바로 앞 단계의 결과를 다시 단순화 (점이 적어 빠르고, 오차는 tolerance 합 이하)
+        simple_lefts, simple_rights = list(lefts), list(rights)
+        for tolerance in self.tolerances:
+            simple_lefts = [l[douglas_peucker(l, tolerance)] for l in simple_lefts]
+            simple_rights = [r[douglas_peucker(r, tolerance)] for r in simple_rights]
+            left_vertices, left_offsets = concat_vertices(simple_lefts)
+            right_vertices, right_offsets = concat_vertices(simple_rights)
+            self.levels.append({
+                'left_vertices': left_vertices, 'left_offsets': left_offsets,
+                'right_vertices': right_vertices, 'right_offsets': right_offsets,
+            })
+
+    @classmethod
+    def from_graph(cls, graph, **kwargs):
+        return cls(graph.lefts, graph.rights, **kwargs)
+
+    def __len__(self):
+        return self.bboxes.shape[0]
+
+    def level_for_scale(self, scale):
+        """scale (px / m) 에서 쓸 단계 index."""
+        allowed = self.pixel_tolerance / max(scale, 1e-9)
+        return max(int(np.searchsorted(self.tolerances, allowed, side='right')) - 1, 0)
+
+    def visible(self, world_bbox):
+        x0, y0, x1, y1 = world_bbox
+        b = self.bboxes
+        return np.flatnonzero((b[:, 2] >= x0) & (b[:, 0] <= x1) & (b[:, 3] >= y0) & (b[:, 1] <= y1))
+
+    def vertex_count(self, level):
+        return self.levels[level]['left_vertices'].shape[0] + self.levels[level]['right_vertices'].shape[0]
+
+    def polylines(self, level, indices):
+        """indices lanelet 의 (left, right) 경계 목록."""
+        data = self.levels[level]
+        lo, ro = data['left_offsets'], data['right_offsets']
+        return [(data['left_vertices'][lo[i]:lo[i + 1]], data['right_vertices'][ro[i]:ro[i + 1]]) for i in indices]
@@ -1,13 +1,23 @@
-import pygame
+import argparse
 import math
+import os
+import threading
+import time
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from matplotlib.patches import Rectangle, Circle
-from commonroad.common.file_reader import CommonRoadFileReader
-from commonroad.visualization.mp_renderer import MPRenderer
-import imageio
-from PIL import Image
+
+from dynamics import ArcDynamics, EulerDynamics, dampenSteering
+from input_sources import InputPoller, apply_command
+from interpolation import InterpolatedTable
+from keyframes import Timeline
+from main_rev import (FEEDBACK_MODE, build_auditory_feedback, build_haptic_feedback, build_input_source,
+                      build_run_log, build_telemetry, build_visual_feedback, load_scenario)
+from obstacle_states import ObstacleStateTable, nearest_obstacles
+from prediction import TrajectoryPredictor, predict_ego_path, predicted_min_distance
+from routing import LaneletGraph, Route
+from telemetry import event_mask
+
+# pygame / matplotlib / commonroad renderer / PIL 은 필요한 기능이 켜졌을 때만 import
 
 # ===================================
 # Color 정의
@@ -23,25 +33,11 @@ PURPLE = (128, 0, 128)
 # ===================================
 # 보조 함수
 # ===================================
-def dampenSteering(angle, elasticity, delta):
-    if angle == 0:
-        return 0
-    elif angle > 0:
-        return max(angle - elasticity, 0)
-    else:
-        return min(angle + elasticity, 0)
-
-def dampenSpeed(speed, velocity_dampening, delta):
-    if speed == 0:
-        return 0
-    elif speed > 0:
-        return max(speed - velocity_dampening * delta * (speed / 10), 0)
-    else:
-        return min(speed - velocity_dampening * delta * (speed / 10), 0)
-
-def updateSpeedometer(screen, car):
-    font = pygame.font.SysFont('Calibri', 25, True, False)
-    x_base = 1400  # 오른쪽 공간 시작점
+def updateSpeedometer(display, car, font=None):
+    if font is None:
+        import pygame
+        font = pygame.font.SysFont('Calibri', 25, True, False)
+    x_base = display.screen_rect.width - 600  # 오른쪽 공간 시작점
 
     if car.gear == "D":
         gear_text = font.render("Gear: Drive", True, BLACK)
@@ -52,45 +48,15 @@ def updateSpeedometer(screen, car):
     else:
         gear_text = font.render("Gear: unknown", True, BLACK)
 
-    screen.blit(gear_text, (x_base, 40))
+    display.blit(gear_text, (x_base, 40))
     speed_text = font.render(f"Speed: {int(car.speed)} km/h", True, BLACK)
-    screen.blit(speed_text, (x_base, 80))
-
-def draw_dynamic_obstacles_on_matplotlib(ax, scenario, car, current_time_step, distance_threshold=30):
-    car_x, car_y = car.pose
-
-    for obstacle in scenario.dynamic_obstacles:
-        predicted_state = None
-        for state in obstacle.prediction.trajectory.state_list:
-            if state.time_step == current_time_step:
-                predicted_state = state
-                break
-
-        if predicted_state:
-            pos_x, pos_y = predicted_state.position
-            distance = math.hypot(pos_x - car_x, pos_y - car_y)
-
-            if distance <= distance_threshold:
-                color = 'red'
-                radius = 1.5  # 원의 반지름
-                circle = Circle(
-                    (pos_x, pos_y),
-                    radius=radius,
-                    edgecolor=color,
-                    facecolor=color,
-                    lw=2,
-                    zorder=20
-                )
-                ax.add_patch(circle)
-
-
-
+    display.blit(speed_text, (x_base, 80))
 
 # ===================================
 # Car2 클래스
 # ===================================
 class Car2():
-    def __init__(self, color, x, y, speed=0, angle=0):
+    def __init__(self, color, x, y, speed=0, angle=0, dynamics=None):
         self.color = color
         self.vel = [0, 0]
         self.speed = speed
@@ -107,6 +73,8 @@ class Car2():
         self.gear = "STOP"
         self.constant_speed = False
         self.steering_angle = 0
+        # 적분기 교체 가능 (기본은 기존과 같은 Euler 한 스텝)
+        self.dynamics = dynamics if dynamics is not None else EulerDynamics()
 
     def accelerate(self, dv):
         if self.gear == "STOP":
@@ -137,111 +105,371 @@ class Car2():
 
     def update(self, delta):
         self.delta = delta
-        self.angle += self.steering_angle * delta * self.speed / 20
-        self.vel[0] = math.cos(self.angle) * self.speed
-        self.vel[1] = math.sin(self.angle) * self.speed
-        self.pose[0] += self.vel[0] * delta
-        self.pose[1] += self.vel[1] * delta
+        self.dynamics.step(self, delta)
+        # 조향 입력은 프레임 단위 (turn() 한 번 = 한 프레임 동안 유지) 라서 substep 마다가 아니라
+        # 프레임 끝에 한 번만 복원한다. substep 마다 줄이면 첫 substep 이후 조향이 사라진다
         self.steering_angle = dampenSteering(self.steering_angle, self.steering_elasticity, delta)
-        if not self.constant_speed:
-            self.speed = dampenSpeed(self.speed, self.speed_dampening, delta)
-
-    def draw_on_matplotlib(self, ax):
-        rect = Rectangle(
-            (self.pose[0] - self.length/2, self.pose[1] - self.width/2),
-            self.length, self.width,
-            angle=np.degrees(self.angle),
-            edgecolor='green',
-            facecolor='green',
-            lw=2,
-            zorder=10
-        )
-        ax.add_patch(rect)
+
+    def draw(self, display, view):
+        from scenario_render import draw_box
+        return draw_box(display, view, self.pose[0], self.pose[1], self.angle,
+                        self.length, self.width, GREEN)
 
 # ===================================
-# Main Simulation
+# 입력 / 한 step 진행 (실시간 루프와 seek 재생이 같은 코드를 사용)
 # ===================================
-file_path = "./scenario/USA_Lanker-2_25_T-1.xml"
-scenario, planning_problem_set = CommonRoadFileReader(file_path).open()
-max_time_step = max([obs.prediction.final_time_step for obs in scenario.dynamic_obstacles]) if scenario.dynamic_obstacles else 50
-
-pygame.init()
-screen = pygame.display.set_mode((2000, 1600))
-pygame.display.set_caption('CommonRoad + Car Driving')
-clock = pygame.time.Clock()
-
-car = Car2(color='green', x=0, y=0)
-car.constant_speed = True
-car.speed = 5
-car.angle = math.radians(60)
+# seek key -> 이동할 step 수 (None 은 처음으로)
+SEEK_KEYS = {'home': None, 'page up': -100, 'page down': 100, ',': -10, '.': 10}
+# zoom key -> 배율 (None 은 전체 지도로)
+ZOOM_KEYS = {'=': 1.25, '-': 0.8, '0': None}
 
-current_time_step = 0
-frames = []  # gif 저장용
 
-running = True
-while running:
-    dt = clock.tick(30) / 1000
+def step_ego(car, route, dt, accelerate, turn):
+    apply_command(car, accelerate, turn)
+    car.update(dt)
+    if route is not None:
+        route.update(car.pose)
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+# ===================================
+# Main Simulation
+# ===================================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='CommonRoad + Car Driving')
+    parser.add_argument('--scenario', default='./scenario/USA_Lanker-2_25_T-1.xml')
+    parser.add_argument('--size', default='2000x1600', help='window size WIDTHxHEIGHT')
+    parser.add_argument('--record', default='./results/simulation.gif', help='GIF output path')
+    parser.add_argument('--no-record', dest='record', action='store_const', const=None,
+                        help='do not record frames')
+    parser.add_argument('--headless', action='store_true',
+                        help='no window; fixed dt, no keyboard input (drawing only when recording)')
+    parser.add_argument('--feedback', default=FEEDBACK_MODE, choices=['B', 'V', 'A', 'H', 'C'])
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--zoom', type=float, default=None,
+                        help='follow the ego at this zoom relative to the whole-map view (keys = - 0)')
+    parser.add_argument('--lod-distance', type=float, default=60.0,
+                        help='obstacles farther than this from the ego are drawn as points')
+    parser.add_argument('--input', default=None, choices=['keyboard', 'joystick', 'socket', 'script', 'none'],
+                        help='driver input (default: keyboard, or none when headless)')
+    parser.add_argument('--script', default=None, help='scripted driver (.npz or time,accelerate,turn csv)')
+    parser.add_argument('--port', type=int, default=5005, help='UDP port for --input socket')
+    parser.add_argument('--input-rate', type=int, default=60, help='input polling rate (Hz)')
+    parser.add_argument('--save-input', default=None, help='save the driven input as a script (.npz)')
+    parser.add_argument('--steps', type=int, default=None,
+                        help='stop after this many simulation steps (frames); default: when the scenario ends')
+    parser.add_argument('--start-step', type=int, default=0,
+                        help='start at this simulation step (replayed without input, no drawing)')
+    parser.add_argument('--interpolation', default='linear', choices=['linear', 'hermite'],
+                        help='obstacle interpolation between scenario time steps')
+    parser.add_argument('--keyframe-interval', type=int, default=50, help='steps between state snapshots for seeking')
+    parser.add_argument('--traffic', type=int, default=0,
+                        help='replace replayed obstacles with this many IDM vehicles reacting to the ego')
+    parser.add_argument('--tiles', default=None,
+                        help='stream obstacles from a tiled scenario directory around the ego (python tiling.py)')
+    parser.add_argument('--seed', type=int, default=None, help='traffic random seed')
+    parser.add_argument('--log', default=None, help='per-step run log path (KPIs: python metrics.py LOG...)')
+    parser.add_argument('--telemetry', default=None,
+                        help='stream live telemetry to HOST:PORT (UDP) or a Unix socket path (view: python telemetry.py TARGET)')
+    args = parser.parse_args(argv)
+    args.size = tuple(int(v) for v in args.size.lower().split('x'))
+    if args.input is None:
+        args.input = 'script' if args.script else ('none' if args.headless else 'keyboard')
+    if args.headless and args.input in ('keyboard', 'joystick'):
+        parser.error('--input %s needs a window' % args.input)
+    return args
+
+
+def start_loading(file_path):
+    """scenario 파싱을 백그라운드 스레드에서 시작. 반환된 함수를 부르면 결과를 기다린다."""
+    result = {}
+
+    def load():
+        try:
+            result['value'] = load_scenario(file_path)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=load, name='scenario-loader', daemon=True)
+    thread.start()
+
+    def wait():
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    return wait
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    draw = not args.headless or args.record is not None
+    if args.headless:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+    # XML 파싱과 창/폰트 초기화를 겹쳐서 진행
+    wait_for_scenario = start_loading(args.scenario)
+
+    screen = clock = font = None
+    if draw:
+        import pygame
+        pygame.init()
+        screen = pygame.display.set_mode(args.size)
+        pygame.display.set_caption('CommonRoad + Car Driving')
+        clock = pygame.time.Clock()
+        font = pygame.font.SysFont('Calibri', 25, True, False)
+
+    scenario, planning_problem_set = wait_for_scenario()
+    max_time_step = max([obs.prediction.final_time_step for obs in scenario.dynamic_obstacles]) if scenario.dynamic_obstacles else 50
+    # lanelet 그래프는 load 시 한 번만 만들고, 경로는 매 스텝 점진적으로 갱신
+    lanelet_graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    traffic = tiles = None
+    if args.traffic > 0:
+        from traffic import TrafficSimulation
+        # 루프는 step k 에서 ego 를 진행한 뒤 k 의 장애물을 보므로 초기 상태를 -1 로 둔다
+        traffic = TrafficSimulation(lanelet_graph, args.traffic, dt=scenario.dt, seed=args.seed, time_step=-1)
+        if len(traffic) < traffic.requested:
+            print(f"Traffic: only {len(traffic)} of {traffic.requested} vehicles fit on the lanelets")
+        obstacle_table = traffic
+    elif args.tiles is not None:
+        from tiling import TiledScenario
+        # ego 주변 tile 만 메모리에 둔다 (지도/경로는 아직 scenario 파일에서)
+        tiles = TiledScenario(args.tiles)
+        obstacle_table = tiles
+    else:
+        obstacle_table = ObstacleStateTable.from_scenario(scenario)
+    predictor = TrajectoryPredictor(obstacle_table, horizon_steps=30)
+    # 기록된 궤적과 IDM traffic 모두 dt 간격 sample 이므로 ego 시계 (sim_time) 에 맞춰 보간해서 본다.
+    # (traffic 은 프레임 dt 와 무관하게 scenario dt 고정 step 으로 적분 -> predictor 의 dt 와 같다)
+    obstacles = InterpolatedTable(obstacle_table, method=args.interpolation)
+
+    def obstacle_clock(sim_time):
+        """(장애물 연속 time step, 예측에 쓰는 sample step)."""
+        if traffic is not None:
+            # traffic 은 직전 / 현재 step 만 보관하므로 예측은 가장 최근 sample 에서 (yaw rate 추정에 직전 step 필요)
+            return traffic.clock(), traffic.time_step
+        t = round(sim_time / obstacle_table.dt, 9)
+        return t, int(math.floor(t))
+
+    def clamp_step(step):
+        step = max(step, 0)
+        return step if args.steps is None else min(step, args.steps - 1)
+
+    planning_problem = next(iter(planning_problem_set.planning_problem_dict.values()), None)
+    try:
+        route = Route.from_planning_problem(lanelet_graph, planning_problem) if planning_problem is not None else None
+    except ValueError:
+        route = None
+
+    display = view = None
+    if draw:
+        from display_manager import DisplayManager
+        from lod import LaneletLOD
+        from scenario_render import CameraBackground, LaneletRaster, render_static_map, draw_dynamic_obstacles, static_shapes
+
+        # 지도는 한 번만 렌더링 -> 매 프레임 바뀐 영역만 갱신
+        background, overview = render_static_map(scenario, planning_problem_set, args.size)
+        display = DisplayManager(screen, background)
+        view = overview
+        # 확대해서 ego 를 따라갈 때는 단순화 단계를 골라 lanelet 을 직접 그린다 (멀리서는 raster).
+        # 카메라가 격자 한 칸 움직이거나 배율이 바뀔 때만 다시 그린다
+        lanelet_lod = LaneletLOD.from_graph(lanelet_graph)
+        camera = CameraBackground(args.size, lanelet_lod, LaneletRaster(lanelet_lod),
+                                  static_shapes(scenario, planning_problem_set))
+    zoom = args.zoom
+
+    # 프레임이 튀어도 궤적이 바뀌지 않도록 1/60 s 이하 substep 으로 원호 적분
+    car = Car2(color='green', x=0, y=0, dynamics=ArcDynamics(max_step=1 / 60))
+    car.constant_speed = True
+    car.speed = 5
+    car.angle = math.radians(60)
+
+    auditory = build_auditory_feedback(args.feedback, headless=args.headless)
+    haptic = build_haptic_feedback(args.feedback)
+    visual = build_visual_feedback(args.size, args.feedback) if draw else None
+    run_log = build_run_log(args.log, args.scenario, args.feedback)
+    telemetry = build_telemetry(args.telemetry)
+    if run_log is not None or telemetry is not None:
+        from metrics import time_to_collision
+
+    # keyframe + 입력 기록 -> 임의 step 으로 빠르게 이동 (Home / PageUp / PageDown / , / .)
+    timeline = Timeline(car, route, interval=args.keyframe_interval, default_dt=1 / args.fps,
+                        extras=[traffic] if traffic is not None else [])
+    timeline.snapshot(0, 0.0)
+
+    def replay(dt, accelerate, turn):
+        step_ego(car, route, dt, accelerate, turn)
+        if traffic is not None:
+            traffic.advance(dt, egos=[(car.pose[0], car.pose[1], car.speed)])
+
+    current_time_step = 0
+    sim_time = 0.0
+    if args.start_step > 0:
+        current_time_step = clamp_step(args.start_step)
+        sim_time = timeline.seek(current_time_step, replay)
+        predictor.clear()
+    frames = []  # gif 저장용
+    if args.record is not None:
+        from PIL import Image
+
+    # 실시간 source 는 자기 스레드에서 polling, scripted source 는 시뮬레이션 시간으로 직접 조회
+    source = build_input_source(args.input, script=args.script, port=args.port)
+    poller = InputPoller(source, rate=args.input_rate).start() if source.realtime else None
+
+    running = True
+    while running:
+        events = []  # telemetry 로 보낼 이번 step 의 피드백 / 상태 이벤트
+        if args.headless:
+            dt = 1 / args.fps
+            step_started = time.perf_counter()
+        else:
+            dt = clock.tick(args.fps) / 1000
+            step_started = time.perf_counter()
+
+            seek_to = None
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and pygame.key.name(event.key) in SEEK_KEYS:
+                    delta = SEEK_KEYS[pygame.key.name(event.key)]
+                    seek_to = 0 if delta is None else (current_time_step if seek_to is None else seek_to) + delta
+                elif event.type == pygame.KEYDOWN and pygame.key.name(event.key) in ZOOM_KEYS:
+                    factor = ZOOM_KEYS[pygame.key.name(event.key)]
+                    zoom = None if factor is None else (zoom or 1.0) * factor
+                    if zoom is None:
+                        view = overview
+                        display.set_background(background)
+                        camera.clear()
+            if seek_to is not None:
+                current_time_step = clamp_step(seek_to)
+                sim_time = timeline.seek(current_time_step, replay)
+                predictor.clear()
+                if auditory is not None:
+                    auditory.reset()
+                events.append('seek')
+
+        accelerate, turn = poller.latest() if poller is not None else source.poll(sim_time)
+        timeline.snapshot(current_time_step, sim_time)
+        timeline.record(current_time_step, dt, accelerate, turn)
+        replans = route.replans if route is not None else 0
+        replay(dt, accelerate, turn)
+        if route is not None and route.replans != replans:
+            events.append('replan')
+        sim_time += dt
+        obstacle_time, obstacle_step = obstacle_clock(sim_time)
+        # 보간에 필요한 다음 step 의 chunk 까지 읽어 둔다
+        if tiles is not None and (tiles.update(car.pose, obstacle_step) | tiles.update(car.pose, obstacle_step + 1)):
+            predictor.clear()
+            obstacles.clear()
+            events.append('tile_load')
+
+        lane_offset = half_width = heading_error = None
+        if route is not None and route.current is not None:
+            lane_offset, half_width, lane_heading = lanelet_graph.lateral_offset(route.current, np.asarray(car.pose))
+            heading_error = (car.angle - lane_heading + math.pi) % (2 * math.pi) - math.pi
+
+        if draw:
+            if zoom is not None:
+                view, moved = camera.update(car.pose, overview.scale * zoom)
+                if moved:
+                    display.set_background(camera.surface)
+            display.begin_frame()
+            car.draw(display, view)
+            nearest_distance, nearby = draw_dynamic_obstacles(display, view, obstacles, car, obstacle_time, distance_threshold=10,
+                                                              detail_distance=args.lod_distance)
+        else:
+            nearest_distance, nearby = nearest_obstacles(obstacles, obstacle_time, car.pose, distance_threshold=10)
+
+        # 장애물/ego 예측 경로로 앞으로 가까워질 장애물까지 반영
+        prediction = predictor.predict(obstacle_step)
+        ego_path = predict_ego_path(car, horizon=predictor.horizon_steps * predictor.dt, steps=predictor.horizon_steps)
+        predicted_distance, _ = predicted_min_distance(prediction, ego_path)
+        approaching = np.flatnonzero(predicted_distance <= 10)
+        if approaching.size:
+            nearest_distance = min(nearest_distance, predicted_distance[approaching].min())
+
+        if auditory is not None:
+            if auditory.on_proximity(nearest_distance):
+                events.append('proximity')
+            if lane_offset is not None and auditory.on_lane_departure(lane_offset, half_width):
+                events.append('lane_departure')
+        if haptic is not None:
+            haptic.update(car, lane_offset=lane_offset, heading_error=heading_error, nearest_distance=nearest_distance)
+        if visual is not None:
+            if nearby:
+                positions, distances = zip(*nearby)
+                visual.add_warning_zones(view, positions, distances)
+            for i in approaching:
+                visual.add_predicted_path(view, prediction.ctrv[i], obstacle_table.widths[i])
+            visual.add_predicted_path(view, ego_path, car.width)
+            visual.add_lane_departure(lane_offset, half_width)
+            visual.draw(display)
+
+        ttc = np.inf
+        if run_log is not None or telemetry is not None:
+            velocity = (car.speed * math.cos(car.angle), car.speed * math.sin(car.angle))
+            ttc = time_to_collision(obstacles, obstacle_time, car.pose, velocity)
+        if run_log is not None:
+            run_log.append(sim_time, car, lane_offset=lane_offset, nearest_distance=nearest_distance, ttc=ttc,
+                           time_step=current_time_step)
+
+        if draw:
+            updateSpeedometer(display, car, font)
+            display.present()
+
+        if telemetry is not None:
+            telemetry.publish(sim_time, current_time_step, car.speed, frame_time=dt,
+                              step_time=time.perf_counter() - step_started, nearest_distance=nearest_distance,
+                              ttc=ttc, events=event_mask(*events))
+
+        # 현재 프레임 저장
+        if args.record is not None:
+            frame = pygame.surfarray.array3d(screen)
+            frame = np.transpose(frame, (1, 0, 2))
+            image = Image.fromarray(frame)
+            frames.append(image)
+
+        current_time_step += 1
+        # --steps 가 있으면 그 step 수에서, 없으면 scenario 의 마지막 time step 에서 끝낸다
+        if args.steps is not None:
+            done = current_time_step >= args.steps
+        else:
+            done = obstacle_time >= max_time_step - 1
+        if done:
             running = False
 
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_UP]:
-        car.accelerate(0.2)
-    if keys[pygame.K_DOWN]:
-        car.accelerate(-0.2)
-    if keys[pygame.K_LEFT]:
-        car.turn(1)
-    if keys[pygame.K_RIGHT]:
-        car.turn(-1)
-
-    fig, ax = plt.subplots(figsize=(40, 30))
-    renderer = MPRenderer(ax=ax)
-    renderer.draw_params.show_labels = False
-    renderer.draw_params.time_begin = current_time_step
-    renderer.draw_params.time_end = current_time_step
-    scenario.draw(renderer)
-    planning_problem_set.draw(renderer)
-    renderer.render()
+    if poller is not None:
+        poller.stop()
+        print("Input timing:", poller.stats())
+    if args.save_input is not None:
+        timeline.script().save(args.save_input)
+        print(f"입력 저장 완료: {args.save_input}")
+    if run_log is not None:
+        run_log.close()
+        print(f"로그 저장 완료: {run_log.path} ({run_log.steps} steps)")
+    if telemetry is not None:
+        telemetry.stop()
+        print("Telemetry:", telemetry.stats())
+    if auditory is not None:
+        auditory.stop()
+    if haptic is not None:
+        haptic.stop()
+        print("Haptic timing:", haptic.stats())
+    if draw:
+        pygame.quit()
+
+    # ===== GIF 저장 =====
+    if frames:
+        frames[0].save(
+            args.record,
+            format='GIF',
+            append_images=frames[1:],
+            save_all=True,
+            duration=33,
+            loop=0
+        )
+        print(f"GIF 저장 완료: {args.record}")
 
-    car.update(dt)
-    car.draw_on_matplotlib(ax)
-    draw_dynamic_obstacles_on_matplotlib(ax, scenario, car, current_time_step, distance_threshold=10)
-
-    canvas = FigureCanvas(fig)
-    canvas.draw()
-    renderer_backend = canvas.get_renderer()
-    raw_data = renderer_backend.buffer_rgba()
-    size = canvas.get_width_height()
-    background = pygame.image.frombuffer(raw_data, size, "RGBA")
-    background = pygame.transform.scale(background, (2000, 1600))
-
-    plt.close(fig)
-
-    screen.blit(background, (0, 0))
-    updateSpeedometer(screen, car)
-    pygame.display.flip()
-
-    # 현재 프레임 저장
-    frame = pygame.surfarray.array3d(screen)
-    frame = np.transpose(frame, (1, 0, 2))
-    image = Image.fromarray(frame)
-    frames.append(image)
-
-    current_time_step += 1
-    if current_time_step >= max_time_step:
-        running = False
-
-pygame.quit()
-
-# ===== GIF 저장 =====
-frames[0].save(
-    './results/simulation.gif',
-    format='GIF',
-    append_images=frames[1:],
-    save_all=True,
-    duration=33,
-    loop=0
-)
-print("GIF 저장 완료: simulation.gif")
+
+if __name__ == "__main__":
+    main()
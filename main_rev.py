@@ -1,36 +1,87 @@
 # module
+import os
 
+# 피드백 모듈은 해당 모드에서만 필요하므로 build_* 안에서 import (시작 시간 단축)
 
 FEEDBACK_MODE = 'B' # B, V, A, H, C
 
 #######################################################################
 #                   Environment file loading
 #######################################################################
-
+def load_scenario(file_path):
+    from commonroad.common.file_reader import CommonRoadFileReader
+    return CommonRoadFileReader(file_path).open()
 
 
 #######################################################################
 #                   Controller Setting
 #######################################################################
-
+def build_input_source(kind='keyboard', script=None, port=5005):
+    # keyboard / joystick 은 pygame 창이 있을 때만, script / none 은 pygame 없이 사용 가능
+    from input_sources import JoystickSource, KeyboardSource, NullSource, ScriptedSource, SocketSource
+    if kind == 'keyboard':
+        return KeyboardSource(accel_step=0.2, turn_step=1)
+    if kind == 'joystick':
+        return JoystickSource()
+    if kind == 'socket':
+        return SocketSource(port=port)
+    if kind == 'script':
+        return ScriptedSource.from_file(script)
+    return NullSource()
 
 
 #######################################################################
 #                   Visual Feedback
 #######################################################################
-
+def build_visual_feedback(screen_size, mode=FEEDBACK_MODE):
+    # V(시각) 또는 C(복합) 모드에서만 사용
+    if mode not in ('V', 'C'):
+        return None
+    from visual_feedback import VisualFeedbackLayer
+    return VisualFeedbackLayer(screen_size)
 
 
 #######################################################################
 #                   Auditory Feedback
 #######################################################################
+def build_auditory_feedback(mode=FEEDBACK_MODE, headless=False):
+    # A(청각) 또는 C(복합) 모드에서만 사용
+    if mode not in ('A', 'C'):
+        return None
+    from auditory_feedback import AuditoryFeedback, NullAudioOutput
+    output = NullAudioOutput() if headless else None
+    return AuditoryFeedback(output=output).start()
 
 
 #######################################################################
 #                   Haptic Feedback
 #######################################################################
+def build_haptic_feedback(mode=FEEDBACK_MODE, device=None, rate=1000):
+    # H(햅틱) 또는 C(복합) 모드에서만 사용. 장치가 없으면 시뮬레이션 장치
+    if mode not in ('H', 'C'):
+        return None
+    from haptic_feedback import HapticFeedback, SimulatedHapticDevice
+    if device is None:
+        device = SimulatedHapticDevice()
+    return HapticFeedback(device=device, rate=rate).start()
 
 
 #######################################################################
 #                       Log Generation
 #######################################################################
+def build_run_log(path, scenario_file, mode=FEEDBACK_MODE):
+    # --log 을 줬을 때만 step 별 로그 기록 (metrics.py 로 KPI 계산)
+    if path is None:
+        return None
+    from metrics import RunLogWriter
+    scenario = os.path.splitext(os.path.basename(scenario_file))[0]
+    # offline_render.py 가 같은 지도를 다시 그릴 수 있도록 scenario 경로도 남긴다
+    return RunLogWriter(path, scenario=scenario, meta={'feedback_mode': mode, 'scenario_file': os.path.abspath(scenario_file)})
+
+
+def build_telemetry(target):
+    # --telemetry 를 줬을 때만 live telemetry 전송 (python telemetry.py TARGET 로 확인)
+    if target is None:
+        return None
+    from telemetry import TelemetryPublisher
+    return TelemetryPublisher(target).start()
@@ -0,0 +1,363 @@
+import argparse
+import glob
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from obstacle_states import X, Y, ORIENTATION, VELOCITY
+
+# ===================================
+# run log 형식
+# ===================================
+# [MAGIC][header 길이 uint32][JSON header][padding -> HEADER_ALIGN] 뒤에 고정 크기 record 가 이어진다.
+# record 수는 파일 크기로 계산하므로 중간에 끊긴 로그도 그대로 읽을 수 있다.
+MAGIC = b'RUNLOG1\n'
+HEADER_ALIGN = 64
+
+GEARS = ('STOP', 'D', 'R')
+GEAR_CODES = {gear: code for code, gear in enumerate(GEARS)}
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('time_step', '<i4'),         # 시뮬레이션 step (seek 하면 불연속). 장애물 시각은 time / scenario dt
+    ('x', '<f8'),
+    ('y', '<f8'),
+    ('angle', '<f8'),
+    ('speed', '<f8'),
+    ('steering', '<f8'),
+    ('gear', '<i1'),
+    ('lane_offset', '<f8'),       # 차선 밖이면 nan
+    ('nearest_distance', '<f8'),  # 장애물이 없으면 inf
+    ('ttc', '<f8'),               # 가까워지는 장애물이 없으면 inf
+], align=True)
+
+TTC_BINS = np.array([0, 0.5, 1, 1.5, 2, 3, 4, 6, 8, 10, np.inf])
+TTC_WARNING = 2.0
+
+
+def time_to_collision(table, time_step, position, velocity):
+    """모든 장애물에 대해 거리 / 접근 속도를 한 번에 계산해 최소 TTC 를 반환 (접근 중인 장애물이 없으면 inf)."""
+    states, valid = table.at(time_step)
+    states = states[valid]
+    if states.shape[0] == 0:
+        return np.inf
+    dp = states[:, [X, Y]] - np.asarray(position, dtype=float)
+    obstacle_velocity = states[:, VELOCITY, None] * np.column_stack(
+        [np.cos(states[:, ORIENTATION]), np.sin(states[:, ORIENTATION])])
+    dv = obstacle_velocity - np.asarray(velocity, dtype=float)
+    distance = np.hypot(dp[:, 0], dp[:, 1])
+    closing = -np.einsum('ij,ij->i', dp, dv) / np.maximum(distance, 1e-9)
+    ttc = np.where(closing > 0, distance / np.where(closing > 0, closing, 1.0), np.inf)
+    return ttc.min()
+
+
+class RunLogWriter():
+    """step 마다 record 하나. chunk_size 만큼 모아서 파일에 쓴다."""
+
+    def __init__(self, path, scenario='', run_id=None, meta=None, chunk_size=1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        header = {'scenario': scenario, 'run_id': run_id if run_id is not None else os.path.basename(path),
+                  'fields': RECORD_DTYPE.names, 'meta': dict(meta or {})}
+        body = json.dumps(header).encode('utf-8')
+        size = len(MAGIC) + 4 + len(body)
+        padding = -size % HEADER_ALIGN
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + struct.pack('<I', len(body) + padding) + body + b' ' * padding)
+        self._buffer = np.zeros(chunk_size, dtype=RECORD_DTYPE)
+        self._count = 0
+        self.steps = 0
+
+    def append(self, time, car, lane_offset=None, nearest_distance=None, ttc=None, time_step=-1):
+        record = self._buffer[self._count]
+        record['time'] = time
+        record['time_step'] = time_step
+        record['x'], record['y'] = car.pose[0], car.pose[1]
+        record['angle'] = car.angle
+        record['speed'] = car.speed
+        record['steering'] = car.steering_angle
+        record['gear'] = GEAR_CODES.get(car.gear, -1)
+        record['lane_offset'] = np.nan if lane_offset is None else lane_offset
+        record['nearest_distance'] = np.inf if nearest_distance is None else nearest_distance
+        record['ttc'] = np.inf if ttc is None else ttc
+        self._count += 1
+        self.steps += 1
+        if self._count == self._buffer.shape[0]:
+            self.flush()
+
+    def flush(self):
+        if self._count:
+            self._buffer[:self._count].tofile(self._file)
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(path):
+    """(header dict, record 시작 offset)."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a run log")
+        (length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(length).decode('utf-8'))
+    if tuple(header['fields']) != RECORD_DTYPE.names:
+        raise ValueError(f"{path}: unsupported record fields {header['fields']}")
+    return header, len(MAGIC) + 4 + length
+
+
+def open_run_log(path):
+    """(header, record memmap). 파일 전체를 메모리에 올리지 않는다."""
+    header, offset = read_header(path)
+    count = (os.path.getsize(path) - offset) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=RECORD_DTYPE)
+    return header, np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,))
+
+
+def iter_chunks(records, chunk_size=1 << 16):
+    for start in range(0, records.shape[0], chunk_size):
+        yield records[start:start + chunk_size]
+
+
+# ===================================
+# KPI 계산 (chunk 단위 streaming)
+# ===================================
+class RunKPIAccumulator():
+    """chunk 를 차례로 넣으면 합/최소값만 유지한다. 미분(가속도, jerk)은 이전 chunk 의 마지막 샘플을 이어 붙여 계산."""
+
+    def __init__(self):
+        self.steps = 0
+        self.duration = 0.0
+        self.min_distance = np.inf
+        self.min_ttc = np.inf
+        self.ttc_warning_time = 0.0
+        self.ttc_histogram = np.zeros(len(TTC_BINS) - 1, dtype=np.int64)
+        self.lane_sq_sum = 0.0
+        self.lane_count = 0
+        self.jerk_sq_sum = 0.0
+        self.jerk_count = 0
+        self.jerk_max = 0.0
+        self.gear_time = np.zeros(len(GEARS))
+        self._tail = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def update(self, chunk):
+        if chunk.shape[0] == 0:
+            return
+        self.steps += chunk.shape[0]
+
+        # 경계의 미분을 위해 직전 chunk 의 마지막 2 샘플을 앞에 붙인다
+        joined = np.concatenate([self._tail, np.asarray(chunk)])
+        time = joined['time']
+        # seek 로 시간을 되감은 구간은 지속 시간 0
+        dt = np.maximum(np.diff(time), 0)
+        new_dt = dt[len(self._tail) - 1:] if len(self._tail) else dt
+        self.duration += new_dt.sum()
+
+        distance = chunk['nearest_distance']
+        if distance.size:
+            self.min_distance = min(self.min_distance, distance.min())
+
+        ttc = chunk['ttc']
+        self.min_ttc = min(self.min_ttc, ttc.min())
+        self.ttc_histogram += np.histogram(ttc[np.isfinite(ttc)], bins=TTC_BINS)[0]
+
+        # step 의 지속 시간은 다음 샘플까지의 dt (마지막 샘플은 다음 chunk 에서 처리)
+        held = joined[len(self._tail) - 1:-1] if len(self._tail) else joined[:-1]
+        if held.shape[0]:
+            self.ttc_warning_time += new_dt[held['ttc'] < TTC_WARNING].sum()
+            gear = held['gear']
+            known = gear >= 0
+            self.gear_time += np.bincount(gear[known], weights=new_dt[known], minlength=len(GEARS))
+
+        offset = chunk['lane_offset']
+        finite = np.isfinite(offset)
+        self.lane_sq_sum += np.square(offset[finite]).sum()
+        self.lane_count += int(finite.sum())
+
+        if joined.shape[0] >= 3:
+            safe_dt = np.where(dt > 0, dt, np.nan)
+            acceleration = np.diff(joined['speed']) / safe_dt
+            jerk = np.diff(acceleration) / safe_dt[1:]
+            # 이전 chunk 에서 이미 계산한 jerk 는 제외
+            jerk = jerk[max(len(self._tail) - 2, 0):]
+            jerk = jerk[np.isfinite(jerk)]
+            if jerk.size:
+                self.jerk_sq_sum += np.square(jerk).sum()
+                self.jerk_count += jerk.size
+                self.jerk_max = max(self.jerk_max, np.abs(jerk).max())
+
+        self._tail = joined[-2:].copy()
+
+    def result(self):
+        return {
+            'steps': self.steps,
+            'duration': self.duration,
+            'min_distance': self.min_distance,
+            'min_ttc': self.min_ttc,
+            'ttc_warning_time': self.ttc_warning_time,
+            'lane_offset_rms': np.sqrt(self.lane_sq_sum / self.lane_count) if self.lane_count else np.nan,
+            'jerk_rms': np.sqrt(self.jerk_sq_sum / self.jerk_count) if self.jerk_count else np.nan,
+            'jerk_max': self.jerk_max,
+            **{f'time_{gear}': t for gear, t in zip(GEARS, self.gear_time)},
+            # scenario 단위로 다시 합치기 위한 합계
+            'lane_sq_sum': self.lane_sq_sum, 'lane_count': self.lane_count,
+            'jerk_sq_sum': self.jerk_sq_sum, 'jerk_count': self.jerk_count,
+            'ttc_histogram': self.ttc_histogram,
+        }
+
+
+def run_kpis(path, chunk_size=1 << 16):
+    header, records = open_run_log(path)
+    accumulator = RunKPIAccumulator()
+    for chunk in iter_chunks(records, chunk_size):
+        accumulator.update(chunk)
+    row = accumulator.result()
+    row['run'] = str(header['run_id'])
+    row['scenario'] = header['scenario']
+    return row
+
+
+# ===================================
+# 요약 표
+# ===================================
+RUN_COLUMNS = ['run', 'scenario', 'steps', 'duration', 'min_distance', 'min_ttc', 'ttc_warning_time',
+               'lane_offset_rms', 'jerk_rms', 'jerk_max'] + [f'time_{gear}' for gear in GEARS]
+SCENARIO_COLUMNS = ['scenario', 'runs', 'steps', 'duration', 'min_distance', 'mean_min_distance',
+                    'min_ttc', 'ttc_p05', 'ttc_warning_ratio', 'lane_offset_rms', 'jerk_rms', 'jerk_max'] \
+    + [f'time_{gear}' for gear in GEARS]
+
+
+def to_table(rows, columns):
+    """dict 목록 -> column 별 numpy 배열 dict."""
+    return {column: np.array([row[column] for row in rows]) for column in columns}
+
+
+def run_table(paths, workers=1, chunk_size=1 << 16):
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            rows = list(pool.map(run_kpis, paths, [chunk_size] * len(paths), chunksize=max(len(paths) // (workers * 4), 1)))
+    else:
+        rows = [run_kpis(path, chunk_size) for path in paths]
+    return rows
+
+
+def histogram_quantile(histogram, q):
+    """TTC_BINS 히스토그램에서 분위수 (bin 내부는 선형 보간, 마지막 bin 은 하한)."""
+    total = histogram.sum()
+    if total == 0:
+        return np.inf
+    cumulative = np.cumsum(histogram)
+    i = int(np.searchsorted(cumulative, q * total))
+    lower, upper = TTC_BINS[i], TTC_BINS[i + 1]
+    if not np.isfinite(upper):
+        return lower
+    before = cumulative[i - 1] if i else 0
+    return lower + (upper - lower) * (q * total - before) / max(histogram[i], 1)
+
+
+def scenario_table(run_rows):
+    """per-run 합계를 scenario 별로 다시 합친다 (RMS 는 제곱합으로 합산)."""
+    table = to_table(run_rows, ['scenario', 'steps', 'duration', 'min_distance', 'min_ttc', 'ttc_warning_time',
+                                'lane_sq_sum', 'lane_count', 'jerk_sq_sum', 'jerk_count', 'jerk_max']
+                     + [f'time_{gear}' for gear in GEARS])
+    histograms = np.array([row['ttc_histogram'] for row in run_rows]).reshape(len(run_rows), len(TTC_BINS) - 1)
+    names, inverse = np.unique(table['scenario'], return_inverse=True)
+    n = len(names)
+
+    def total(column):
+        return np.bincount(inverse, weights=table[column], minlength=n)
+
+    def grouped_min(column):
+        out = np.full(n, np.inf)
+        np.minimum.at(out, inverse, table[column])
+        return out
+
+    def grouped_max(column):
+        out = np.zeros(n)
+        np.maximum.at(out, inverse, table[column])
+        return out
+
+    merged = np.zeros((n, histograms.shape[1]), dtype=np.int64)
+    np.add.at(merged, inverse, histograms)
+    duration = total('duration')
+    lane_count = total('lane_count')
+    jerk_count = total('jerk_count')
+    runs = np.bincount(inverse, minlength=n)
+    finite_distance = np.where(np.isfinite(table['min_distance']), table['min_distance'], 0)
+    finite_runs = np.bincount(inverse, weights=np.isfinite(table['min_distance']), minlength=n)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = {
+            'scenario': names,
+            'runs': runs,
+            'steps': total('steps').astype(np.int64),
+            'duration': duration,
+            'min_distance': grouped_min('min_distance'),
+            'mean_min_distance': np.where(finite_runs > 0, np.bincount(inverse, weights=finite_distance, minlength=n) / finite_runs, np.inf),
+            'min_ttc': grouped_min('min_ttc'),
+            'ttc_p05': np.array([histogram_quantile(h, 0.05) for h in merged]),
+            'ttc_warning_ratio': np.where(duration > 0, total('ttc_warning_time') / duration, 0.0),
+            'lane_offset_rms': np.sqrt(total('lane_sq_sum') / lane_count),
+            'jerk_rms': np.sqrt(total('jerk_sq_sum') / jerk_count),
+            'jerk_max': grouped_max('jerk_max'),
+        }
+    for gear in GEARS:
+        result[f'time_{gear}'] = total(f'time_{gear}')
+    return result
+
+
+def format_table(table, columns):
+    rows = [[f"{v:.3f}" if isinstance(v, (float, np.floating)) else str(v) for v in values]
+            for values in zip(*(table[c] for c in columns))]
+    widths = [max([len(c)] + [len(r[i]) for r in rows]) for i, c in enumerate(columns)]
+    lines = ['  '.join(c.rjust(w) for c, w in zip(columns, widths))]
+    lines += ['  '.join(v.rjust(w) for v, w in zip(r, widths)) for r in rows]
+    return '\n'.join(lines)
+
+
+def write_csv(path, table, columns):
+    import csv
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(zip(*(table[c].tolist() for c in columns)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='safety KPIs over run logs')
+    parser.add_argument('logs', nargs='+', help='run log files or glob patterns')
+    parser.add_argument('--workers', type=int, default=1, help='processes (useful for long logs)')
+    parser.add_argument('--chunk', type=int, default=1 << 16, help='records per chunk')
+    parser.add_argument('--runs', action='store_true', help='print the per-run table')
+    parser.add_argument('--csv', default=None, help='write the per-scenario table as CSV')
+    parser.add_argument('--runs-csv', default=None, help='write the per-run table as CSV')
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.logs for path in (glob.glob(pattern) or [pattern])})
+    rows = run_table(paths, args.workers, args.chunk)
+    runs = to_table(rows, RUN_COLUMNS)
+    scenarios = scenario_table(rows)
+    if args.runs:
+        print(format_table(runs, RUN_COLUMNS))
+        print()
+    print(format_table(scenarios, SCENARIO_COLUMNS))
+    if args.runs_csv:
+        write_csv(args.runs_csv, runs, RUN_COLUMNS)
+    if args.csv:
+        write_csv(args.csv, scenarios, SCENARIO_COLUMNS)
@@ -0,0 +1,70 @@
+import numpy as np
+
+# state 배열의 열 순서
+X, Y, ORIENTATION, VELOCITY = range(4)
+
+
+class ObstacleStateTable():
+    """모든 dynamic obstacle 의 궤적을 (장애물, time step, [x, y, orientation, velocity]) 배열로 묶어 둔다.
+
+    time step 마다 state_list 를 뒤지는 대신 states[:, k] 한 번으로 전체 장애물 상태를 얻는다.
+    """
+
+    def __init__(self, ids, states, valid, dt, lengths, widths):
+        self.ids = np.asarray(ids)
+        self.states = np.asarray(states, dtype=float)
+        self.valid = np.asarray(valid, dtype=bool)
+        self.dt = dt
+        self.lengths = np.asarray(lengths, dtype=float)
+        self.widths = np.asarray(widths, dtype=float)
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    @property
+    def num_steps(self):
+        return self.states.shape[1]
+
+    @classmethod
+    def from_scenario(cls, scenario):
+        obstacles = scenario.dynamic_obstacles
+        num_steps = max([obs.prediction.final_time_step for obs in obstacles]) + 1 if obstacles else 1
+        n = len(obstacles)
+        states = np.zeros((n, num_steps, 4))
+        valid = np.zeros((n, num_steps), dtype=bool)
+        lengths = np.zeros(n)
+        widths = np.zeros(n)
+        ids = np.zeros(n, dtype=np.int64)
+
+        for i, obstacle in enumerate(obstacles):
+            ids[i] = obstacle.obstacle_id
+            shape = obstacle.obstacle_shape
+            lengths[i] = getattr(shape, 'length', 4.5)
+            widths[i] = getattr(shape, 'width', 2.0)
+            for state in [obstacle.initial_state] + list(obstacle.prediction.trajectory.state_list):
+                k = state.time_step
+                if k < 0 or k >= num_steps:
+                    continue
+                states[i, k] = (state.position[0], state.position[1],
+                                getattr(state, 'orientation', 0.0), getattr(state, 'velocity', 0.0))
+                valid[i, k] = True
+
+        return cls(ids, states, valid, scenario.dt, lengths, widths)
+
+    def at(self, time_step):
+        """time_step 의 (states (n, 4), valid (n,)). 범위 밖이면 모두 invalid."""
+        if time_step < 0 or time_step >= self.num_steps:
+            return np.zeros((len(self), 4)), np.zeros(len(self), dtype=bool)
+        return self.states[:, time_step], self.valid[:, time_step]
+
+
+def nearest_obstacles(table, time_step, point, distance_threshold=30):
+    """point 에서 가장 가까운 장애물 거리와 distance_threshold 이내 장애물 [(position, distance)]."""
+    states, valid = table.at(time_step)
+    positions = states[valid, :2]
+    if positions.shape[0] == 0:
+        return None, []
+    distances = np.hypot(positions[:, 0] - point[0], positions[:, 1] - point[1])
+    close = distances <= distance_threshold
+    nearby = [(tuple(position), distance) for position, distance in zip(positions[close], distances[close])]
+    return distances.min(), nearby
@@ -0,0 +1,297 @@
+import argparse
+import io
+import math
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from metrics import GEARS, open_run_log
+
+# ===================================
+# GIF 조각 (모든 프레임이 같은 global palette 를 쓰므로 조각을 byte 단위로 이어 붙일 수 있다)
+# ===================================
+GIF_TRAILER = b';'
+GIF_LOOP = b'!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00'
+
+
+def _color_table_size(flags):
+    return 3 * (2 << (flags & 0x07)) if flags & 0x80 else 0
+
+
+def _skip_sub_blocks(data, i):
+    while data[i]:
+        i += data[i] + 1
+    return i + 1
+
+
+def gif_image_block(data):
+    """단일 프레임 GIF 파일에서 (global color table, image descriptor ~ LZW 데이터) 를 꺼낸다."""
+    flags = data[10]
+    table_end = 13 + _color_table_size(flags)
+    global_table = data[13:table_end]
+    i = table_end
+    while i < len(data):
+        if data[i] == 0x21:         # extension
+            i = _skip_sub_blocks(data, i + 2)
+        elif data[i] == 0x2C:       # image descriptor
+            start = i
+            i += 10 + _color_table_size(data[i + 9])
+            i = _skip_sub_blocks(data, i + 1)
+            return global_table, data[start:i]
+        else:
+            break
+    raise ValueError('no image block in GIF data')
+
+
+def gif_header(size, palette, loop=True):
+    """palette: 256 색 RGB bytes (768)."""
+    w, h = size
+    header = b'GIF89a' + struct.pack('<HHBBB', w, h, 0xF7, 0, 0) + bytes(palette)
+    return header + GIF_LOOP if loop else header
+
+
+def encode_gif_frame(image, palette_image, delay):
+    """RGB PIL image -> graphic control extension + image block (delay 는 1/100 s)."""
+    from PIL import Image
+
+    indexed = image.quantize(palette=palette_image, dither=Image.Dither.NONE)
+    buffer = io.BytesIO()
+    indexed.save(buffer, 'GIF', optimize=False)
+    global_table, block = gif_image_block(buffer.getvalue())
+    if not block[9] & 0x80 and global_table != bytes(palette_image.getpalette()[:768]):
+        # PIL 이 palette 를 바꿔 썼으면 그 palette 를 local color table 로 붙인다
+        bits = (len(global_table) // 3).bit_length() - 2
+        block = block[:9] + bytes([block[9] | 0x80 | bits]) + global_table + block[10:]
+    return b'!\xf9\x04\x00' + struct.pack('<H', delay) + b'\x00\x00' + block
+
+
+def build_palette(image, reserved=()):
+    """첫 프레임에서 뽑은 palette + 동적 요소 색 (장애물 / 경고 / ego)."""
+    from PIL import Image
+
+    reserved = list(dict.fromkeys(tuple(c) for c in reserved))
+    adaptive = image.quantize(colors=256 - len(reserved), method=Image.Quantize.MEDIANCUT)
+    colors = adaptive.getpalette()[:3 * (256 - len(reserved))]
+    colors += [0] * (3 * (256 - len(reserved)) - len(colors))
+    for color in reserved:
+        colors += list(color)
+    return colors
+
+
+# ===================================
+# worker (프로세스마다 지도 배경 / 장애물 표를 한 번만 준비)
+# ===================================
+_worker = {}
+
+
+def init_worker(scenario_file, size, zoom=None, lod_distance=60.0):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+
+    from display_manager import DisplayManager
+    from interpolation import InterpolatedTable
+    from main import Car2
+    from main_rev import load_scenario
+    from obstacle_states import ObstacleStateTable
+    from scenario_render import render_static_map
+
+    pygame.init()
+    screen = pygame.display.set_mode(size)
+    scenario, planning_problem_set = load_scenario(scenario_file)
+    background, overview = render_static_map(scenario, planning_problem_set, size)
+    _worker.update({
+        'screen': screen,
+        'display': DisplayManager(screen, background),
+        'overview': overview,
+        # main.py 와 같이 장애물은 ego 시계 (record time) 에 맞춰 보간
+        'obstacles': InterpolatedTable(ObstacleStateTable.from_scenario(scenario)),
+        'car': Car2(color='green', x=0, y=0),
+        'font': pygame.font.SysFont('Calibri', 25, True, False),
+        'zoom': zoom,
+        'lod_distance': lod_distance,
+        'camera': None,
+    })
+    if zoom is not None:
+        from lod import LaneletLOD
+        from routing import LaneletGraph
+        from scenario_render import CameraBackground, LaneletRaster, static_shapes
+
+        lod = LaneletLOD.from_graph(LaneletGraph.from_lanelet_network(scenario.lanelet_network))
+        _worker['camera'] = CameraBackground(size, lod, LaneletRaster(lod), static_shapes(scenario, planning_problem_set))
+
+
+def render_record(record):
+    """record 하나를 main.py 와 같은 방식으로 그린 RGB 배열 (h, w, 3)."""
+    import pygame
+
+    from main import updateSpeedometer
+    from scenario_render import draw_dynamic_obstacles
+
+    w = _worker
+    car, display = w['car'], w['display']
+    car.pose = [float(record['x']), float(record['y'])]
+    car.angle = float(record['angle'])
+    car.speed = float(record['speed'])
+    car.steering_angle = float(record['steering'])
+    car.gear = GEARS[record['gear']] if 0 <= record['gear'] < len(GEARS) else 'unknown'
+
+    view = w['overview']
+    if w['zoom'] is not None:
+        view, moved = w['camera'].update(car.pose, view.scale * w['zoom'])
+        if moved:
+            display.set_background(w['camera'].surface)
+    display.begin_frame()
+    car.draw(display, view)
+    obstacles = w['obstacles']
+    draw_dynamic_obstacles(display, view, obstacles, car, round(float(record['time']) / obstacles.dt, 9),
+                           distance_threshold=10, detail_distance=w['lod_distance'])
+    updateSpeedometer(display, car, w['font'])
+    display.present()
+    return np.transpose(pygame.surfarray.array3d(w['screen']), (1, 0, 2))
+
+
+def first_frame_palette(log_path):
+    from scenario_render import OBSTACLE_COLOR, WARNING_COLOR
+    from PIL import Image
+
+    from main import BLACK, GREEN
+
+    _, records = open_run_log(log_path)
+    image = Image.fromarray(render_record(records[0]))
+    _worker['display'].set_background(_worker['display'].background)
+    return build_palette(image, reserved=[OBSTACLE_COLOR, WARNING_COLOR, GREEN, BLACK])
+
+
+def render_segment(log_path, indices, output, fmt, fps, palette=None):
+    """indices 의 record 를 순서대로 그려 output 에 조각으로 저장. 반환: (프레임 수, 걸린 시간)."""
+    started = time.perf_counter()
+    _, records = open_run_log(log_path)
+    # 조각의 첫 프레임은 배경부터 다시 그린다
+    _worker['display'].set_background(_worker['display'].background)
+    if fmt == 'gif':
+        from PIL import Image
+
+        palette_image = Image.new('P', (1, 1))
+        palette_image.putpalette(palette)
+        delay = max(int(round(100 / fps)), 2)
+        with open(output, 'wb') as f:
+            for i in indices:
+                f.write(encode_gif_frame(Image.fromarray(render_record(records[i])), palette_image, delay))
+    else:
+        import imageio.v2 as imageio
+
+        with imageio.get_writer(output, fps=fps, codec='libx264', macro_block_size=1) as writer:
+            for i in indices:
+                writer.append_data(render_record(records[i]))
+    return len(indices), time.perf_counter() - started
+
+
+# ===================================
+# 조각 나누기 / 합치기
+# ===================================
+def split_frames(count, stride, segments):
+    """record index (stride 간격) 를 연속된 segments 개 구간으로."""
+    indices = np.arange(0, count, max(stride, 1))
+    return [part for part in np.array_split(indices, min(segments, len(indices))) if len(part)]
+
+
+def concat_gif(parts, output, size, palette):
+    with open(output, 'wb') as out:
+        out.write(gif_header(size, palette))
+        for part in parts:
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out)
+        out.write(GIF_TRAILER)
+
+
+def concat_mp4(parts, output):
+    import imageio_ffmpeg
+
+    listing = output + '.parts.txt'
+    with open(listing, 'w') as f:
+        f.writelines(f"file '{os.path.abspath(part)}'\n" for part in parts)
+    try:
+        subprocess.run([imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                        '-i', listing, '-c', 'copy', output], check=True)
+    finally:
+        os.remove(listing)
+
+
+def render_run(log_path, output, scenario_file=None, size=(2000, 1600), workers=None, stride=1, fps=None,
+               zoom=None, lod_distance=60.0, segments_per_worker=4):
+    """run log 를 여러 프로세스에서 나눠 그린 뒤 GIF / MP4 하나로 합친다. 반환: 통계 dict."""
+    started = time.perf_counter()
+    header, records = open_run_log(log_path)
+    if records.shape[0] == 0:
+        raise ValueError(f"{log_path}: empty run log")
+    scenario_file = scenario_file or header['meta'].get('scenario_file')
+    if not scenario_file:
+        raise ValueError(f"{log_path}: no scenario file in the log header, pass one explicitly")
+    fmt = 'mp4' if output.lower().endswith('.mp4') else 'gif'
+    if fps is None:
+        dt = np.diff(records['time'])
+        dt = dt[dt > 0]
+        fps = min(1.0 / (float(np.median(dt)) * stride), 50.0) if dt.size else 30.0
+    workers = workers or os.cpu_count() or 1
+    parts = split_frames(records.shape[0], stride, workers * segments_per_worker)
+    duration = float(np.maximum(np.diff(records['time']), 0).sum())
+    init_args = (scenario_file, tuple(size), zoom, lod_distance)
+
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix='render_', dir=directory or None)
+    paths = [os.path.join(tmp, f'part_{k:05d}.{fmt}') for k in range(len(parts))]
+    try:
+        if workers > 1 and len(parts) > 1:
+            with ProcessPoolExecutor(workers, initializer=init_worker, initargs=init_args) as pool:
+                palette = pool.submit(first_frame_palette, log_path).result() if fmt == 'gif' else None
+                futures = [pool.submit(render_segment, log_path, part, path, fmt, fps, palette)
+                           for part, path in zip(parts, paths)]
+                results = [future.result() for future in futures]
+        else:
+            init_worker(*init_args)
+            palette = first_frame_palette(log_path) if fmt == 'gif' else None
+            results = [render_segment(log_path, part, path, fmt, fps, palette) for part, path in zip(parts, paths)]
+        if fmt == 'gif':
+            concat_gif(paths, output, size, palette)
+        else:
+            concat_mp4(paths, output)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    frames = sum(n for n, _ in results)
+    elapsed = time.perf_counter() - started
+    return {'frames': frames, 'segments': len(parts), 'workers': workers, 'fps': fps,
+            'run_duration': duration, 'render_time': elapsed,
+            'frame_time': sum(t for _, t in results) / max(frames, 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='render a run log (main.py --log) to GIF / MP4 in parallel')
+    parser.add_argument('log')
+    parser.add_argument('output', help='.gif or .mp4 (mp4 needs imageio-ffmpeg)')
+    parser.add_argument('--scenario', default=None, help='scenario XML (default: the path stored in the log)')
+    parser.add_argument('--size', default='2000x1600', help='frame size WIDTHxHEIGHT')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    parser.add_argument('--stride', type=int, default=1, help='render every n-th record')
+    parser.add_argument('--fps', type=float, default=None, help='output frame rate (default: from the log)')
+    parser.add_argument('--zoom', type=float, default=None, help='follow the ego like main.py --zoom')
+    parser.add_argument('--lod-distance', type=float, default=60.0)
+    args = parser.parse_args()
+
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+    stats = render_run(args.log, args.output, args.scenario, size, args.workers, args.stride, args.fps,
+                       args.zoom, args.lod_distance)
+    speedup = stats['run_duration'] / stats['render_time'] if stats['render_time'] > 0 else math.inf
+    print(f"{stats['frames']} frames in {stats['segments']} segments on {stats['workers']} workers: "
+          f"{stats['render_time']:.1f} s for a {stats['run_duration']:.1f} s run ({speedup:.1f}x realtime), "
+          f"{stats['frame_time'] * 1000:.1f} ms/frame")
+    print(f"저장 완료: {args.output}")
@@ -0,0 +1,121 @@
+import math
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from obstacle_states import X, Y, ORIENTATION, VELOCITY
+
+# positions: (n, steps + 1, 3 [x, y, orientation]), index 0 은 현재 상태
+Prediction = namedtuple('Prediction', ['time_step', 'valid', 'cv', 'ctrv', 'yaw_rate'])
+
+
+def wrap_angle(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+def rollout_cv(states, steps, dt):
+    """constant velocity: 모든 장애물을 한 번에 steps 만큼 전개."""
+    t = np.arange(steps + 1) * dt
+    x0, y0 = states[:, X, None], states[:, Y, None]
+    theta = states[:, ORIENTATION, None]
+    v = states[:, VELOCITY, None]
+    out = np.empty((states.shape[0], steps + 1, 3))
+    out[..., 0] = x0 + v * np.cos(theta) * t
+    out[..., 1] = y0 + v * np.sin(theta) * t
+    out[..., 2] = theta
+    return out
+
+
+def rollout_ctrv(states, yaw_rates, steps, dt, eps=1e-4):
+    """constant turn rate and velocity: 원호 위를 정확히 전개 (yaw rate ~ 0 이면 CV)."""
+    t = np.arange(steps + 1) * dt
+    x0, y0 = states[:, X, None], states[:, Y, None]
+    theta0 = states[:, ORIENTATION, None]
+    v = states[:, VELOCITY, None]
+    w = yaw_rates[:, None]
+
+    theta = theta0 + w * t
+    turning = np.abs(w) > eps
+    safe_w = np.where(turning, w, 1.0)
+    x_arc = x0 + v / safe_w * (np.sin(theta) - np.sin(theta0))
+    y_arc = y0 - v / safe_w * (np.cos(theta) - np.cos(theta0))
+    x_line = x0 + v * np.cos(theta0) * t
+    y_line = y0 + v * np.sin(theta0) * t
+
+    out = np.empty((states.shape[0], steps + 1, 3))
+    out[..., 0] = np.where(turning, x_arc, x_line)
+    out[..., 1] = np.where(turning, y_arc, y_line)
+    out[..., 2] = theta
+    return out
+
+
+class TrajectoryPredictor():
+    def __init__(self, table, horizon_steps=30, cache_size=64):
+        self.table = table
+        self.horizon_steps = horizon_steps
+        self.dt = table.dt
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def clear(self):
+        # table 내용이 바뀌었을 때 (seek, 실시간 교통)
+        self._cache.clear()
+
+    def estimate_yaw_rates(self, time_step):
+        """직전 time step 과의 orientation 차이로 yaw rate 추정 (이전 상태가 없으면 0)."""
+        states, valid = self.table.at(time_step)
+        previous, previous_valid = self.table.at(time_step - 1)
+        both = valid & previous_valid
+        diff = wrap_angle(states[:, ORIENTATION] - previous[:, ORIENTATION])
+        return np.where(both, diff / self.dt, 0.0)
+
+    def predict(self, time_step):
+        cached = self._cache.get(time_step)
+        if cached is not None:
+            self._cache.move_to_end(time_step)
+            return cached
+
+        states, valid = self.table.at(time_step)
+        yaw_rates = self.estimate_yaw_rates(time_step)
+        prediction = Prediction(
+            time_step, valid,
+            rollout_cv(states, self.horizon_steps, self.dt),
+            rollout_ctrv(states, yaw_rates, self.horizon_steps, self.dt),
+            yaw_rates,
+        )
+
+        self._cache[time_step] = prediction
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return prediction
+
+
+def predicted_min_distance(prediction, ego_path, model='ctrv'):
+    """ego 예측 경로 (steps + 1, 3) 와 각 장애물 예측 경로 사이의 최소 거리와 그 step.
+
+    유효하지 않은 장애물은 inf.
+    """
+    positions = getattr(prediction, model)
+    steps = min(positions.shape[1], ego_path.shape[0])
+    delta = positions[:, :steps, :2] - ego_path[None, :steps, :2]
+    distances = np.hypot(delta[..., 0], delta[..., 1])
+    min_step = distances.argmin(axis=1)
+    min_distance = distances[np.arange(distances.shape[0]), min_step]
+    min_distance = np.where(prediction.valid, min_distance, np.inf)
+    return min_distance, min_step
+
+
+def predict_ego_path(car, horizon=2.0, steps=20, steer_ratio=20):
+    """현재 speed/steering 유지 가정으로 ego 경로를 예측 (Car2.update 와 같은 회전 모델)."""
+    dt = horizon / steps
+    x, y = car.pose
+    angle = car.angle
+    yaw_rate = car.steering_angle * car.speed / steer_ratio
+    path = np.empty((steps + 1, 3))
+    path[0] = (x, y, angle)
+    for i in range(1, steps + 1):
+        angle += yaw_rate * dt
+        x += math.cos(angle) * car.speed * dt
+        y += math.sin(angle) * car.speed * dt
+        path[i] = (x, y, angle)
+    return path
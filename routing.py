@@ -0,0 +1,296 @@
+import heapq
+import math
+
+import numpy as np
+
+
+def shape_center(shape):
+    """commonroad shape / occupancy 의 중심점 (버전별로 속성 이름이 달라서 둘 다 본다)."""
+    for name in ('center', 'rect_center'):
+        center = getattr(shape, name, None)
+        if center is not None:
+            return np.asarray(getattr(center, 'coords', [center])[0], dtype=float)
+    shapes = getattr(shape, 'shapes', None)
+    if shapes:
+        return np.mean([shape_center(s) for s in shapes], axis=0)
+    return None
+
+
+# ===================================
+# Lanelet 그래프 (load 시 한 번만 만든다)
+# ===================================
+class LaneletGraph():
+    def __init__(self, ids, successors, adj_left, adj_right, centers, lefts, rights,
+                 polygons=None, bboxes=None, lengths=None):
+        """polygons / bboxes / lengths 를 주면 (shared_scenario 의 공유 배열 view) 다시 계산하지 않는다."""
+        self.ids = list(ids)
+        self.index = {lanelet_id: i for i, lanelet_id in enumerate(self.ids)}
+        self.successors = successors  # index 리스트의 리스트
+        self.adj_left = adj_left      # 같은 방향 왼쪽 차선 index 또는 None
+        self.adj_right = adj_right
+        self.centers = centers
+        self.lefts = lefts
+        self.rights = rights
+        if polygons is None:
+            polygons = [np.vstack([left, right[::-1]]) for left, right in zip(lefts, rights)]
+        self.polygons = polygons
+        self._paths = None
+        if bboxes is None:
+            bboxes = np.array([[p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()] for p in polygons])
+        self.bboxes = bboxes.reshape(-1, 4)
+        self._bbox_tuples = [tuple(b) for b in self.bboxes.tolist()]
+        if lengths is None:
+            lengths = np.array([np.hypot(*np.diff(c, axis=0).T).sum() for c in centers])
+        self.lengths = lengths
+        self.starts = np.array([c[0] for c in centers]).reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def paths(self):
+        """point-in-polygon 은 matplotlib Path (C 구현) 로, bbox 는 python tuple 로 먼저 거른다.
+
+        matplotlib import 가 느리므로 처음 위치를 찾을 때 만든다.
+        """
+        if self._paths is None:
+            from matplotlib.path import Path
+            self._paths = [Path(polygon) for polygon in self.polygons]
+        return self._paths
+
+    @classmethod
+    def from_lanelet_network(cls, network):
+        lanelets = network.lanelets
+        ids = [lanelet.lanelet_id for lanelet in lanelets]
+        index = {lanelet_id: i for i, lanelet_id in enumerate(ids)}
+
+        def same_direction(adj_id, same):
+            return index.get(adj_id) if adj_id is not None and same else None
+
+        successors = [[index[s] for s in lanelet.successor if s in index] for lanelet in lanelets]
+        adj_left = [same_direction(lanelet.adj_left, lanelet.adj_left_same_direction) for lanelet in lanelets]
+        adj_right = [same_direction(lanelet.adj_right, lanelet.adj_right_same_direction) for lanelet in lanelets]
+        centers = [np.asarray(lanelet.center_vertices, dtype=float) for lanelet in lanelets]
+        lefts = [np.asarray(lanelet.left_vertices, dtype=float) for lanelet in lanelets]
+        rights = [np.asarray(lanelet.right_vertices, dtype=float) for lanelet in lanelets]
+        return cls(ids, successors, adj_left, adj_right, centers, lefts, rights)
+
+    def neighbours(self, i):
+        """(index, 'successor' | 'left' | 'right')"""
+        result = [(j, 'successor') for j in self.successors[i]]
+        if self.adj_left[i] is not None:
+            result.append((self.adj_left[i], 'left'))
+        if self.adj_right[i] is not None:
+            result.append((self.adj_right[i], 'right'))
+        return result
+
+    def contains(self, i, point, tolerance=0.0):
+        """tolerance (m) 를 주면 경계에서 그만큼 떨어진 바깥 점도 포함 (이웃과 공유하는 경계 위의 점)."""
+        x0, y0, x1, y1 = self._bbox_tuples[i]
+        x, y = point
+        if not (x0 - tolerance <= x <= x1 + tolerance and y0 - tolerance <= y <= y1 + tolerance):
+            return False
+        if tolerance <= 0:
+            return self.paths[i].contains_point((x, y))
+        # Path 의 radius 부호는 polygon 방향에 따라 확장/축소가 바뀌므로 둘 다 확인
+        path = self.paths[i]
+        return path.contains_point((x, y), radius=tolerance) or path.contains_point((x, y), radius=-tolerance)
+
+    def locate(self, point, hint=None):
+        """point 가 들어 있는 lanelet index. hint 와 그 이웃을 먼저 확인해서 대부분 O(1)."""
+        if hint is not None:
+            if self.contains(hint, point):
+                return hint
+            for j, _ in self.neighbours(hint):
+                if self.contains(j, point):
+                    return j
+        b = self.bboxes
+        candidates = np.flatnonzero((b[:, 0] <= point[0]) & (point[0] <= b[:, 2]) &
+                                    (b[:, 1] <= point[1]) & (point[1] <= b[:, 3]))
+        for i in candidates:
+            if self.paths[i].contains_point((point[0], point[1])):
+                return int(i)
+        return None
+
+    def lateral_offset(self, i, point):
+        """centerline 기준 부호 있는 횡방향 거리 (왼쪽 +), 차선 반폭, centerline 방향."""
+        center = self.centers[i]
+        a, b = center[:-1], center[1:]
+        ab = b - a
+        seg_len2 = np.maximum((ab ** 2).sum(axis=1), 1e-12)
+        t = np.clip(((point - a) * ab).sum(axis=1) / seg_len2, 0, 1)
+        closest = a + t[:, None] * ab
+        d2 = ((point - closest) ** 2).sum(axis=1)
+        k = int(d2.argmin())
+        direction = ab[k] / math.sqrt(seg_len2[k])
+        rel = point - closest[k]
+        offset = direction[0] * rel[1] - direction[1] * rel[0]
+        half_width = np.hypot(*(self.lefts[i][min(k, len(self.lefts[i]) - 1)] -
+                                self.rights[i][min(k, len(self.rights[i]) - 1)])) / 2
+        return offset, half_width, math.atan2(direction[1], direction[0])
+
+
+# ===================================
+# A* 경로 + 점진적 수정
+# ===================================
+class Route():
+    def __init__(self, graph, goal_indices, lane_change_cost=5.0, max_repair_expansions=200, boundary_tolerance=0.05):
+        self.graph = graph
+        self.goal_indices = set(goal_indices)
+        self.goal_starts = graph.starts[sorted(self.goal_indices)]
+        # lane change 비용이 차선 폭보다 크면 직선거리 heuristic 이 admissible
+        self.lane_change_cost = lane_change_cost
+        self.max_repair_expansions = max_repair_expansions
+        # 경로 lanelet 과 공유하는 경계 위 (이 거리 이내) 에서는 경로 lanelet 으로 본다
+        self.boundary_tolerance = boundary_tolerance
+        self.lanelets = None      # 경로 (index 리스트)
+        self.cost_to_goal = None  # 각 경로 lanelet 에서 goal 까지 남은 비용
+        self._position = {}       # lanelet index -> 경로 안에서의 위치
+        self.progress = 0
+        self.current = None
+        self.replans = 0
+        self.repairs = 0
+        self.goal_reached = False
+
+    @classmethod
+    def from_planning_problem(cls, graph, planning_problem, **kwargs):
+        goal = planning_problem.goal
+        goal_indices = set()
+        lanelets_of_goal = getattr(goal, 'lanelets_of_goal_position', None)
+        if lanelets_of_goal:
+            for lanelet_ids in lanelets_of_goal.values():
+                goal_indices.update(graph.index[i] for i in lanelet_ids if i in graph.index)
+        if not goal_indices:
+            for state in goal.state_list:
+                position = getattr(state, 'position', None)
+                center = shape_center(position) if position is not None else None
+                if center is not None:
+                    i = graph.locate(center)
+                    if i is not None:
+                        goal_indices.add(i)
+        if not goal_indices:
+            raise ValueError('goal region does not overlap any lanelet')
+        return cls(graph, goal_indices, **kwargs)
+
+    def heuristic(self, i):
+        return np.hypot(*(self.goal_starts - self.graph.starts[i]).T).min()
+
+    def edge_cost(self, i, kind):
+        return self.graph.lengths[i] if kind == 'successor' else self.lane_change_cost
+
+    def _search(self, start, terminal_cost, max_expansions=None):
+        """terminal_cost: lanelet index -> 거기서 goal 까지 이미 알고 있는 비용."""
+        counter = 0
+        heap = [(self.heuristic(start), counter, 0.0, start, False)]
+        parent = {start: None}
+        best_g = {start: 0.0}
+        expansions = 0
+        while heap:
+            _, _, g, i, terminal = heapq.heappop(heap)
+            if terminal:
+                path = []
+                while i is not None:
+                    path.append(i)
+                    i = parent[i]
+                return path[::-1]
+            if g > best_g.get(i, math.inf):
+                continue
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                return None
+            if i in terminal_cost:
+                counter += 1
+                heapq.heappush(heap, (g + terminal_cost[i], counter, g + terminal_cost[i], i, True))
+            for j, kind in self.graph.neighbours(i):
+                g_new = g + self.edge_cost(i, kind)
+                if g_new < best_g.get(j, math.inf):
+                    best_g[j] = g_new
+                    parent[j] = i
+                    counter += 1
+                    heapq.heappush(heap, (g_new + self.heuristic(j), counter, g_new, j, False))
+        return None
+
+    def _set_route(self, lanelets):
+        cost = [0.0] * len(lanelets)
+        for k in range(len(lanelets) - 2, -1, -1):
+            i, j = lanelets[k], lanelets[k + 1]
+            kind = 'successor' if j in self.graph.successors[i] else 'lane_change'
+            cost[k] = cost[k + 1] + self.edge_cost(i, kind)
+        self.lanelets = lanelets
+        self.cost_to_goal = cost
+        self._position = {i: k for k, i in enumerate(lanelets)}
+        self.progress = 0
+
+    def plan(self, start):
+        """start 에서 goal 까지 처음부터 A*."""
+        path = self._search(start, {i: 0.0 for i in self.goal_indices})
+        self.replans += 1
+        if path is None:
+            self.lanelets = None
+            return None
+        self._set_route(path)
+        return path
+
+    def repair(self, start):
+        """경로를 벗어났을 때 남은 경로에 다시 합류하는 짧은 구간만 찾아서 이어 붙인다."""
+        remaining = self.lanelets[self.progress:]
+        remaining_cost = self.cost_to_goal[self.progress:]
+        terminal_cost = dict(zip(remaining, remaining_cost))
+        for i in self.goal_indices:
+            terminal_cost.setdefault(i, 0.0)
+        prefix = self._search(start, terminal_cost, self.max_repair_expansions)
+        if prefix is None:
+            return self.plan(start)
+
+        self.repairs += 1
+        join = prefix[-1]
+        if join in terminal_cost and join in remaining:
+            self._set_route(prefix[:-1] + remaining[remaining.index(join):])
+        else:
+            self._set_route(prefix)
+        return self.lanelets
+
+    def update(self, position):
+        """매 스텝 ego 위치로 현재 lanelet 과 경로 진행 상황을 갱신한다."""
+        # 교차로처럼 lanelet 이 겹치는 곳에서는 경로 위 lanelet (현재, 다음) 을 우선
+        if self.lanelets is not None:
+            for tolerance in (0.0, self.boundary_tolerance):
+                for k in (self.progress, self.progress + 1):
+                    if k < len(self.lanelets) and self.graph.contains(self.lanelets[k], position, tolerance):
+                        return self._advance(k)
+        current = self.graph.locate(position, hint=self.current)
+        if current is None or current == self.current:
+            return self.current
+        self.current = current
+        if self.goal_reached:
+            # goal 을 지나서 나간 경우: 경로는 그대로 두고 다시 계획하지 않는다
+            return current
+        if self.lanelets is None:
+            self.plan(current)
+        elif current in self._position:
+            return self._advance(self._position[current])
+        else:
+            self.repair(current)
+        self.goal_reached = current in self.goal_indices
+        return current
+
+    def _advance(self, k):
+        self.progress = k
+        self.current = self.lanelets[k]
+        if self.current in self.goal_indices:
+            self.goal_reached = True
+        return self.current
+
+    def remaining(self):
+        if self.lanelets is None:
+            return []
+        return [self.graph.ids[i] for i in self.lanelets[self.progress:]]
+
+    def distance_to_goal(self):
+        if self.lanelets is None:
+            return None
+        return self.cost_to_goal[self.progress]
+
+    def reached_goal(self):
+        """한 번 goal lanelet 에 들어가면 그 뒤로 계속 True."""
+        return self.goal_reached
@@ -0,0 +1,296 @@
+import math
+
+import numpy as np
+
+from prediction import wrap_angle
+from routing import LaneletGraph
+from shared_scenario import concat_vertices, occupancy_grid
+
+PROFILES = ('straight', 'curved', 'ramp', 'random')
+
+
+# ===================================
+# 도로 모양 (test/lane_following.py 의 paramaterizedTurn / turn45 를 곡률 구간으로)
+# ===================================
+def curvature_profile(kind, length, rng=None, radius=150.0, slope=0.3):
+    """[(구간 길이, 곡률)] 목록 (길이 합 = length, 곡률 > 0 은 왼쪽).
+
+    curved : paramaterizedTurn 과 같은 S 자 (왼쪽 1/4 원, 오른쪽 반원, 왼쪽 1/4 원)
+    ramp   : turn45 처럼 직선 뒤 atan(slope) 만큼 꺾인 직선 (꺾이는 곳은 반지름 radius 원호)
+    random : 직선과 원호를 rng 로 번갈아 이어 붙임
+    """
+    if kind == 'straight':
+        return [(length, 0.0)]
+    if kind == 'curved':
+        # 원호 전체 (2 pi r) 가 도로의 80% 를 넘지 않도록 반지름을 줄인다
+        r = min(radius, 0.8 * length / (2 * math.pi))
+        lead = (length - 2 * math.pi * r) / 2
+        return [(lead, 0.0), (math.pi * r / 2, 1 / r), (math.pi * r, -1 / r), (math.pi * r / 2, 1 / r), (lead, 0.0)]
+    if kind == 'ramp':
+        angle = math.atan(slope)
+        r = min(radius, 0.3 * length / angle)
+        lead = (length - r * angle) / 2
+        return [(lead, 0.0), (r * angle, 1 / r), (lead, 0.0)]
+    if kind == 'random':
+        rng = rng if rng is not None else np.random.default_rng()
+        segments = []
+        remaining = length
+        straight = True
+        while remaining > 1e-9:
+            piece = min(rng.uniform(20.0, 80.0), remaining)
+            curvature = 0.0 if straight else rng.uniform(-1 / 40, 1 / 40)
+            segments.append((piece, curvature))
+            remaining -= piece
+            straight = not straight
+        return segments
+    raise ValueError('unknown road profile %r (%s)' % (kind, ', '.join(PROFILES)))
+
+
+def integrate_centerline(profile, step=2.0, heading=0.0):
+    """곡률 구간을 호 길이 step 간격으로 적분. 반환: (points (n, 2), headings (n,)), 시작점은 원점."""
+    ends = np.cumsum([piece for piece, _ in profile])
+    curvatures = np.array([k for _, k in profile])
+    length = ends[-1]
+    s = np.linspace(0.0, length, max(int(math.ceil(length / step)), 1) + 1)
+    ds = np.diff(s)
+    # 각 sample 구간 중간의 곡률로 heading 적분, 위치는 중간 heading 으로 (2 차 정확도)
+    k = curvatures[np.minimum(np.searchsorted(ends, s[:-1] + ds / 2), len(profile) - 1)]
+    headings = heading + np.concatenate([[0.0], np.cumsum(k * ds)])
+    middle = (headings[:-1] + headings[1:]) / 2
+    points = np.zeros((s.shape[0], 2))
+    points[1:, 0] = np.cumsum(ds * np.cos(middle))
+    points[1:, 1] = np.cumsum(ds * np.sin(middle))
+    return points, headings
+
+
+def offset_polyline(points, headings, offset):
+    """왼쪽 (+) 으로 offset 만큼 평행 이동한 polyline."""
+    normal = np.column_stack([-np.sin(headings), np.cos(headings)])
+    return points + offset * normal
+
+
+# ===================================
+# packed scenario 생성 (shared_scenario.pack_scenario 와 같은 배열)
+# ===================================
+def generate_packed(seed=0, rows=4, cols=4, lanes=3, segments=10, segment_length=25.0, lane_width=3.5,
+                    profile='random', obstacles=1000, num_steps=200, dt=0.1, speed_range=(5.0, 20.0),
+                    step=2.0, gap=20.0, resolution=None):
+    """rows x cols 개 도로 (각 lanes 차선 x segments lanelet) 와 차선을 따라 달리는 장애물.
+
+    같은 인자와 seed 면 항상 같은 배열이 나온다. resolution 을 주면 occupancy grid 도 만든다
+    (큰 지도에서는 grid 가 매우 커지므로 기본은 빈 grid).
+    반환: (arrays, meta) -> shared_scenario.save_packed / SharedScenarioStore.create
+    """
+    if segments < 1 or segment_length <= 0 or step <= 0:
+        raise ValueError('segments, segment_length and step must be positive')
+    rng = np.random.default_rng(seed)
+    length = segments * segment_length
+    # lanelet 마다 sample 이 2 개 이상 (segment 경계가 겹치지 않게) 되도록 간격을 줄인다
+    step = min(step, segment_length)
+
+    # ----- 도로: 원점에서 만든 뒤 bbox 가 겹치지 않게 격자로 배치 -----
+    roads = []
+    for _ in range(rows * cols):
+        points, headings = integrate_centerline(curvature_profile(profile, length, rng), step,
+                                                heading=rng.uniform(-math.pi, math.pi))
+        roads.append((points, headings))
+    half = lanes * lane_width / 2
+    bboxes = np.array([[p[:, 0].min() - half, p[:, 1].min() - half, p[:, 0].max() + half, p[:, 1].max() + half]
+                       for p, _ in roads])
+    cell = max((bboxes[:, 2] - bboxes[:, 0]).max(), (bboxes[:, 3] - bboxes[:, 1]).max()) + gap
+
+    ids, successors, adj_left, adj_right = [], [], [], []
+    centers, lefts, rights = [], [], []
+    lane_lines = []  # (lanelet index 목록, center polyline, heading) 차선별, 장애물 궤적용
+    for road, ((points, headings), bbox) in enumerate(zip(roads, bboxes)):
+        r, c = divmod(road, cols)
+        points = points + np.array([c * cell - bbox[0], r * cell - bbox[1]])
+        # segment 경계 sample index (경계 점은 앞뒤 lanelet 이 공유)
+        bounds = np.round(np.linspace(0, points.shape[0] - 1, segments + 1)).astype(int)
+        first = len(ids)
+        for lane in range(lanes):
+            offset = (lane - (lanes - 1) / 2) * lane_width
+            center = offset_polyline(points, headings, offset)
+            left = offset_polyline(points, headings, offset + lane_width / 2)
+            right = offset_polyline(points, headings, offset - lane_width / 2)
+            indices = []
+            for segment in range(segments):
+                a, b = bounds[segment], bounds[segment + 1] + 1
+                index = first + lane * segments + segment
+                indices.append(index)
+                ids.append(index + 1)
+                successors.append([index + 1] if segment + 1 < segments else [])
+                adj_left.append(index + segments if lane + 1 < lanes else -1)
+                adj_right.append(index - segments if lane > 0 else -1)
+                centers.append(center[a:b])
+                lefts.append(left[a:b])
+                rights.append(right[a:b])
+            lane_lines.append((indices, center, headings))
+
+    # ----- 장애물: 차선 하나를 골라 일정 속도로 진행, 차선 끝을 지나면 사라짐 -----
+    times = np.arange(num_steps) * dt
+    states = np.zeros((obstacles, num_steps, 4))
+    valid = np.zeros((obstacles, num_steps), dtype=bool)
+    lane_of = rng.integers(len(lane_lines), size=obstacles)
+    speeds = rng.uniform(*speed_range, size=obstacles)
+    start = rng.uniform(0.0, 0.8, size=obstacles)
+    for lane in np.unique(lane_of):
+        members = np.flatnonzero(lane_of == lane)
+        _, center, headings = lane_lines[lane]
+        station = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(center, axis=0).T))])
+        s = start[members, None] * station[-1] + speeds[members, None] * times[None, :]
+        valid[members] = s <= station[-1]
+        states[members, :, 0] = np.interp(s, station, center[:, 0])
+        states[members, :, 1] = np.interp(s, station, center[:, 1])
+        states[members, :, 2] = wrap_angle(np.interp(s, station, headings))
+        states[members, :, 3] = speeds[members, None]
+    states[~valid] = 0.0
+
+    center_vertices, center_offsets = concat_vertices(centers)
+    left_vertices, left_offsets = concat_vertices(lefts)
+    right_vertices, right_offsets = concat_vertices(rights)
+    successor_arrays = [np.asarray(s, dtype=np.int64) for s in successors]
+    successor_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    successor_offsets[1:] = np.cumsum([len(s) for s in successor_arrays])
+    graph = LaneletGraph(ids, successors, [None if i < 0 else i for i in adj_left],
+                         [None if i < 0 else i for i in adj_right], centers, lefts, rights)
+    polygon_vertices, polygon_offsets = concat_vertices(graph.polygons)
+    if resolution is not None:
+        grid, origin = occupancy_grid(graph, resolution)
+    else:
+        grid, origin = np.zeros((0, 0), dtype=np.uint8), np.zeros(2)
+
+    arrays = {
+        'lanelet_ids': np.asarray(ids, dtype=np.int64),
+        'center_vertices': center_vertices, 'center_offsets': center_offsets,
+        'left_vertices': left_vertices, 'left_offsets': left_offsets,
+        'right_vertices': right_vertices, 'right_offsets': right_offsets,
+        'successors': np.concatenate(successor_arrays), 'successor_offsets': successor_offsets,
+        'adj_left': np.asarray(adj_left, dtype=np.int64), 'adj_right': np.asarray(adj_right, dtype=np.int64),
+        'polygon_vertices': polygon_vertices, 'polygon_offsets': polygon_offsets,
+        'lanelet_bboxes': graph.bboxes, 'lanelet_lengths': graph.lengths,
+        'obstacle_ids': np.arange(obstacles, dtype=np.int64) + len(ids) + 1,
+        'obstacle_states': states, 'obstacle_valid': valid,
+        'obstacle_lengths': np.full(obstacles, 4.5), 'obstacle_widths': np.full(obstacles, 2.0),
+        'occupancy': grid, 'occupancy_origin': origin,
+    }
+    meta = {
+        'dt': dt, 'resolution': resolution if resolution is not None else 0.5,
+        'generator': {'seed': seed, 'rows': rows, 'cols': cols, 'lanes': lanes, 'segments': segments,
+                      'segment_length': segment_length, 'lane_width': lane_width, 'profile': profile,
+                      'obstacles': obstacles, 'num_steps': num_steps},
+    }
+    return arrays, meta
+
+
+# ===================================
+# CommonRoad XML (main.py 로 바로 열 수 있게)
+# ===================================
+def to_commonroad(arrays, meta, name='ZAM_Synthetic-1_1_T-1'):
+    """packed 배열 -> (Scenario, PlanningProblemSet). 장애물이 많으면 느리므로 XML 이 필요할 때만."""
+    from commonroad.common.common_scenario import ScenarioID
+    from commonroad.geometry.obstacle_shapes.rect_obstacle_shape import RectObstacleShape
+    from commonroad.planning.planning_problem import PlanningProblemSet
+    from commonroad.prediction.prediction import TrajectoryPrediction
+    from commonroad.scenario.lanelet import Lanelet, LaneletType
+    from commonroad.scenario.obstacle import DynamicObstacle, ObstacleType
+    from commonroad.scenario.scenario import Scenario
+    from commonroad.scenario.state import ExtendedPMState, InitialState
+    from commonroad.scenario.trajectory import Trajectory
+
+    from shared_scenario import split_vertices
+
+    scenario = Scenario(meta['dt'], scenario_id=ScenarioID.from_benchmark_id(name, '2020a'))
+    ids = arrays['lanelet_ids']
+    successors = split_vertices(arrays['successors'], arrays['successor_offsets'])
+    predecessors = [[] for _ in ids]
+    for i, targets in enumerate(successors):
+        for j in targets:
+            predecessors[j].append(int(ids[i]))
+    lanelets = []
+    for i, (center, left, right) in enumerate(zip(split_vertices(arrays['center_vertices'], arrays['center_offsets']),
+                                                  split_vertices(arrays['left_vertices'], arrays['left_offsets']),
+                                                  split_vertices(arrays['right_vertices'], arrays['right_offsets']))):
+        left_index, right_index = arrays['adj_left'][i], arrays['adj_right'][i]
+        lanelets.append(Lanelet(
+            left, center, right, int(ids[i]),
+            predecessor=predecessors[i], successor=[int(ids[j]) for j in successors[i]],
+            adjacent_left=int(ids[left_index]) if left_index >= 0 else None,
+            adjacent_left_same_direction=True if left_index >= 0 else None,
+            adjacent_right=int(ids[right_index]) if right_index >= 0 else None,
+            adjacent_right_same_direction=True if right_index >= 0 else None,
+            lanelet_type={LaneletType.UNKNOWN},
+        ))
+    scenario.add_objects(lanelets)
+
+    states, valid = arrays['obstacle_states'], arrays['obstacle_valid']
+    obstacles = []
+    for i, obstacle_id in enumerate(arrays['obstacle_ids'].tolist()):
+        steps = np.flatnonzero(valid[i])
+        if steps.size < 2:
+            continue
+        shape = RectObstacleShape(length=float(arrays['obstacle_lengths'][i]), width=float(arrays['obstacle_widths'][i]))
+        x, y, orientation, velocity = states[i, steps[0]]
+        initial = InitialState(time_step=int(steps[0]), position=np.array([x, y]), orientation=orientation,
+                               velocity=velocity, acceleration=0.0, yaw_rate=0.0, slip_angle=0.0)
+        trajectory = Trajectory(int(steps[1]), [
+            ExtendedPMState(time_step=int(k), position=states[i, k, :2].copy(), velocity=states[i, k, 3],
+                            orientation=states[i, k, 2], acceleration=0.0)
+            for k in steps[1:]])
+        obstacles.append(DynamicObstacle(obstacle_id, ObstacleType.CAR, shape, initial,
+                                         TrajectoryPrediction(trajectory, shape)))
+    scenario.add_objects(obstacles)
+    return scenario, PlanningProblemSet()
+
+
+def write_xml(path, arrays, meta):
+    from commonroad.common.file_writer import CommonRoadFileWriter, OverwriteExistingFile
+    from commonroad.common.util import FileFormat
+    from commonroad.scenario.scenario import Tag
+
+    scenario, planning_problem_set = to_commonroad(arrays, meta)
+    writer = CommonRoadFileWriter(scenario, planning_problem_set, author='scenario_generator', affiliation='',
+                                  source='synthetic (seed %s)' % meta['generator']['seed'],
+                                  tags={Tag.SIMULATED, Tag.MULTI_LANE},
+                                  file_format=FileFormat.XML)
+    writer.write_to_file(path, OverwriteExistingFile.ALWAYS)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    from shared_scenario import load_packed, save_packed
+
+    parser = argparse.ArgumentParser(description='generate a synthetic scenario (packed .npz, optional CommonRoad XML)')
+    parser.add_argument('output', help='packed scenario (.npz, see shared_scenario.load_packed)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rows', type=int, default=4, help='roads per grid column')
+    parser.add_argument('--cols', type=int, default=4, help='roads per grid row')
+    parser.add_argument('--lanes', type=int, default=3)
+    parser.add_argument('--segments', type=int, default=10, help='lanelets per lane')
+    parser.add_argument('--segment-length', type=float, default=25.0)
+    parser.add_argument('--profile', choices=PROFILES, default='random')
+    parser.add_argument('--obstacles', type=int, default=1000)
+    parser.add_argument('--steps', type=int, default=200, help='time steps of obstacle trajectories')
+    parser.add_argument('--dt', type=float, default=0.1)
+    parser.add_argument('--occupancy', type=float, default=None, help='also build an occupancy grid at this resolution (m)')
+    parser.add_argument('--xml', default=None, help='also write CommonRoad XML (slow for many obstacles)')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    arrays, meta = generate_packed(args.seed, args.rows, args.cols, args.lanes, args.segments, args.segment_length,
+                                   profile=args.profile, obstacles=args.obstacles, num_steps=args.steps, dt=args.dt,
+                                   resolution=args.occupancy)
+    generated = time.perf_counter() - started
+    save_packed(args.output, arrays, meta)
+    started = time.perf_counter()
+    load_packed(args.output)
+    loaded = time.perf_counter() - started
+    print(f"{len(arrays['lanelet_ids'])} lanelets, {len(arrays['obstacle_ids'])} obstacles x {args.steps} steps: "
+          f"generated in {generated:.2f} s, {os.path.getsize(args.output) / 1e6:.1f} MB, loads in {loaded:.2f} s -> {args.output}")
+    if args.xml:
+        started = time.perf_counter()
+        write_xml(args.xml, arrays, meta)
+        print(f"XML written in {time.perf_counter() - started:.2f} s -> {args.xml}")
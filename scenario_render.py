@@ -0,0 +1,310 @@
+import math
+
+import numpy as np
+import pygame
+
+from obstacle_states import X, Y, ORIENTATION, nearest_obstacles
+from visual_feedback import View
+
+OBSTACLE_COLOR = (21, 101, 192)
+WARNING_COLOR = (255, 0, 0)
+LANELET_COLOR = (200, 200, 200)
+LANELET_EDGE_COLOR = (120, 120, 120)
+MAP_BACKGROUND_COLOR = (255, 255, 255)
+# commonroad MPRenderer 기본 색 (render_static_map 과 같은 모양)
+STATIC_OBSTACLE_COLOR = (217, 85, 88)
+STATIC_OBSTACLE_EDGE_COLOR = (131, 29, 32)
+GOAL_COLOR = (241, 181, 20)
+
+
+# ===================================
+# 정적 지도 (한 번만 렌더링해서 캐시)
+# ===================================
+def render_static_map(scenario, planning_problem_set, screen_size, figsize=(40, 30)):
+    """lanelet / 정적 장애물 / planning problem 만 그린 배경과 world->screen 변환을 만든다."""
+    # matplotlib / commonroad renderer 는 지도를 그릴 때만 필요
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+    from commonroad.visualization.mp_renderer import MPRenderer
+
+    fig, ax = plt.subplots(figsize=figsize)
+    renderer = MPRenderer(ax=ax)
+    renderer.draw_params.show_labels = False
+    renderer.draw_params.time_begin = 0
+    renderer.draw_params.time_end = 0
+    scenario.lanelet_network.draw(renderer)
+    for obstacle in scenario.static_obstacles:
+        obstacle.draw(renderer)
+    planning_problem_set.draw(renderer)
+    renderer.render()
+
+    canvas = FigureCanvas(fig)
+    canvas.draw()
+    raw_data = canvas.get_renderer().buffer_rgba()
+    size = canvas.get_width_height()
+    background = pygame.image.frombuffer(raw_data, size, "RGBA")
+    background = pygame.transform.scale(background, screen_size)
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
+    view = View.from_axes(ax, size, screen_size)
+
+    plt.close(fig)
+    return background, view
+
+
+def render_lanelets(surface, view, lod, raster=None):
+    """보이는 lanelet 만 현재 scale 에 맞는 단순화 단계로 그린다 (카메라가 움직일 때마다 다시 그리는 배경용).
+
+    raster (LaneletRaster) 가 view 를 덮으면 미리 그려둔 이미지를 대신 쓴다.
+    반환: 그린 점 수
+    """
+    if raster is not None and raster.covers(view):
+        raster.render(surface, view)
+        return 0
+    screen_size = surface.get_size()
+    surface.fill(MAP_BACKGROUND_COLOR)
+    level = lod.level_for_scale(view.scale)
+    indices = lod.visible(view.world_bbox(screen_size))
+    polylines = lod.polylines(level, indices)
+    if not polylines:
+        return 0
+    # 보이는 점 전체를 한 번에 변환한 뒤 lanelet 별로 나눈다
+    sizes = [(len(left), len(right)) for left, right in polylines]
+    points = view.to_screen(np.concatenate([np.concatenate(pair) for pair in polylines])).tolist()
+    start = 0
+    for n_left, n_right in sizes:
+        left = points[start:start + n_left]
+        right = points[start + n_left:start + n_left + n_right]
+        start += n_left + n_right
+        pygame.draw.polygon(surface, LANELET_COLOR, left + right[::-1])
+        if n_left > 1:
+            pygame.draw.lines(surface, LANELET_EDGE_COLOR, False, left)
+        if n_right > 1:
+            pygame.draw.lines(surface, LANELET_EDGE_COLOR, False, right)
+    return len(points)
+
+
+class LaneletRaster():
+    """지도 전체 lanelet 을 scale (px / m) 로 한 번 그려 둔 surface.
+
+    view.scale 이 raster scale 이하인 (멀리서 보는) 경우 보이는 부분만 잘라 축소 blit 하므로
+    lanelet 수와 상관없이 화면 크기에 비례하는 비용으로 그린다. max_pixels 를 넘으면 scale 을 낮춘다.
+    """
+
+    def __init__(self, lod, scale=2.0, max_pixels=8_000_000):
+        x0, y0 = lod.bboxes[:, :2].min(axis=0)
+        x1, y1 = lod.bboxes[:, 2:].max(axis=0)
+        area = max((x1 - x0) * (y1 - y0), 1e-9)
+        self.scale = min(scale, math.sqrt(max_pixels / area))
+        self.view = View(np.array([[self.scale, 0], [0, -self.scale]]), np.array([-self.scale * x0, self.scale * y1]))
+        size = (max(int(math.ceil((x1 - x0) * self.scale)), 1), max(int(math.ceil((y1 - y0) * self.scale)), 1))
+        self.surface = pygame.Surface(size)
+        render_lanelets(self.surface, self.view, lod)
+
+    def covers(self, view):
+        """raster 로 그려도 되는 view 인지 (축 정렬, y 위쪽, raster 보다 거친 scale)."""
+        m = view.matrix
+        return m[0, 1] == 0 and m[1, 0] == 0 and m[1, 1] < 0 and view.scale <= self.scale
+
+    def render(self, surface, view):
+        surface.fill(MAP_BACKGROUND_COLOR)
+        x0, y0, x1, y1 = view.world_bbox(surface.get_size())
+        (rx0, ry0), (rx1, ry1) = self.view.to_screen([(x0, y1), (x1, y0)])
+        left, top = int(math.floor(rx0)), int(math.floor(ry0))
+        clip = pygame.Rect(left, top, int(math.ceil(rx1)) - left, int(math.ceil(ry1)) - top).clip(self.surface.get_rect())
+        if clip.width == 0 or clip.height == 0:
+            return
+        # 잘라낸 raster 영역이 목적 화면에서 차지하는 위치
+        (dx0, dy0), (dx1, dy1) = view.to_screen(self.view.to_world([clip.topleft, clip.bottomright]))
+        size = (max(int(round(dx1 - dx0)), 1), max(int(round(dy1 - dy0)), 1))
+        surface.blit(pygame.transform.smoothscale(self.surface.subsurface(clip), size), (int(round(dx0)), int(round(dy0))))
+
+
+def occupancy_polygons(occupancy):
+    """commonroad occupancy (group 포함) -> world 다각형 (n, 2) 목록."""
+    if occupancy is None:
+        return []
+    if hasattr(occupancy, 'occupancies'):
+        return [polygon for part in occupancy.occupancies for polygon in occupancy_polygons(part)]
+    if hasattr(occupancy, 'vertices'):
+        return [np.asarray(occupancy.vertices, dtype=float)]
+    return [np.asarray(occupancy.shapely_object.exterior.coords, dtype=float)]
+
+
+def static_shapes(scenario, planning_problem_set):
+    """render_static_map 이 lanelet 위에 그리는 정적 장애물 / goal 영역의 (다각형, 색, 테두리 색) 목록."""
+    shapes = []
+    for obstacle in scenario.static_obstacles:
+        for polygon in occupancy_polygons(obstacle.occupancy_at_time(0)):
+            shapes.append((polygon, STATIC_OBSTACLE_COLOR, STATIC_OBSTACLE_EDGE_COLOR))
+    for problem in planning_problem_set.planning_problem_dict.values():
+        for state in problem.goal.state_list:
+            for polygon in occupancy_polygons(getattr(state, 'position', None)):
+                shapes.append((polygon, GOAL_COLOR, None))
+    return shapes
+
+
+def draw_static_shapes(surface, view, shapes):
+    for polygon, color, edge_color in shapes:
+        points = view.to_screen(polygon).tolist()
+        pygame.draw.polygon(surface, color, points)
+        if edge_color is not None:
+            pygame.draw.polygon(surface, edge_color, points, 1)
+
+
+class CameraBackground():
+    """ego 를 따라가는 확대 배경 (lanelet + 정적 장애물 / goal).
+
+    카메라 중심을 tile px 격자에 맞춰 두므로 격자 한 칸을 넘거나 scale 이 바뀔 때만 다시 그린다.
+    그 사이 프레임은 DisplayManager 가 바뀐 영역만 배경에서 복원한다.
+    """
+
+    def __init__(self, screen_size, lod, raster=None, shapes=(), tile=64):
+        self.screen_size = screen_size
+        self.lod = lod
+        self.raster = raster
+        self.shapes = list(shapes)
+        self.tile = tile
+        self.surface = pygame.Surface(screen_size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.view = None
+        self._key = None
+
+    def update(self, center, scale):
+        """반환: (view, 배경을 다시 그렸는지)."""
+        step = self.tile / scale
+        cell = (round(center[0] / step), round(center[1] / step), scale)
+        if cell == self._key:
+            return self.view, False
+        self._key = cell
+        self.view = View.centered((cell[0] * step, cell[1] * step), scale, self.screen_size)
+        render_lanelets(self.surface, self.view, self.lod, self.raster)
+        draw_static_shapes(self.surface, self.view, self.shapes)
+        return self.view, True
+
+    def clear(self):
+        """다른 배경으로 바꿨다가 돌아올 때 다시 그리도록."""
+        self._key = None
+
+
+# ===================================
+# 동적 요소 (매 프레임)
+# ===================================
+def box_corners(x, y, angle, length, width):
+    c, s = math.cos(angle), math.sin(angle)
+    half = np.array([[length, width], [-length, width], [-length, -width], [length, -width]]) / 2
+    return half @ np.array([[c, s], [-s, c]]) + (x, y)
+
+
+def draw_box(display, view, x, y, angle, length, width, color):
+    corners = view.to_screen(box_corners(x, y, angle, length, width))
+    return display.mark(pygame.draw.polygon(display.screen, color, corners.tolist()))
+
+
+# box_corners 와 같은 꼭짓점 순서 (앞왼쪽, 뒤왼쪽, 뒤오른쪽, 앞오른쪽)
+BOX_SIGNS = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+
+
+def box_corners_batch(states, lengths, widths, out=None):
+    """장애물 n 개의 box 꼭짓점 (n, 4, 2) 을 한 번에. out 을 주면 그 버퍼에 쓴다."""
+    n = states.shape[0]
+    out = np.empty((n, 4, 2)) if out is None else out[:n]
+    c, s = np.cos(states[:, ORIENTATION]), np.sin(states[:, ORIENTATION])
+    dx, dy = lengths / 2, widths / 2
+    for k, (sx, sy) in enumerate(BOX_SIGNS):
+        out[:, k, 0] = states[:, X] + sx * dx * c - sy * dy * s
+        out[:, k, 1] = states[:, Y] + sx * dx * s + sy * dy * c
+    return out
+
+
+def draw_obstacle_points(display, positions, color=OBSTACLE_COLOR, size=3):
+    """멀리 있는 장애물은 점 하나로. 화면 밖 점은 건너뛴다."""
+    bounds = display.screen_rect
+    positions = positions.astype(int)
+    inside = ((positions[:, 0] >= bounds.left) & (positions[:, 0] < bounds.right)
+              & (positions[:, 1] >= bounds.top) & (positions[:, 1] < bounds.bottom))
+    half = size // 2
+    screen, mark = display.screen, display.mark
+    for x, y in positions[inside].tolist():
+        mark(screen.fill(color, (x - half, y - half, size, size)))
+
+
+class ObstacleLayer():
+    """장애물 그리기에 쓰는 버퍼 / sprite 를 프레임 사이에 재사용한다.
+
+    box 꼭짓점은 재사용 버퍼에 한 번에 계산하고 (장애물마다 numpy 배열을 만들지 않음),
+    경고 원은 반지름별로 한 번 그려둔 sprite 를 blit 한다.
+    """
+
+    def __init__(self, color=OBSTACLE_COLOR, warning_color=WARNING_COLOR):
+        self.color = color
+        self.warning_color = warning_color
+        self._corners = np.empty((0, 4, 2))
+        self._sprites = {}
+
+    def corners(self, view, states, lengths, widths):
+        """screen 좌표 꼭짓점 (n, 4, 2). 버퍼가 모자라면 두 배로 늘린다."""
+        n = states.shape[0]
+        if self._corners.shape[0] < n:
+            self._corners = np.empty((max(n, 2 * self._corners.shape[0]), 4, 2))
+        corners = box_corners_batch(states, lengths, widths, self._corners)
+        flat = corners.reshape(-1, 2)
+        flat[:] = flat @ view.matrix.T
+        flat += view.offset
+        return corners
+
+    def warning_sprite(self, radius):
+        sprite = self._sprites.get(radius)
+        if sprite is None:
+            sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1))
+            sprite.fill((0, 0, 0))
+            sprite.set_colorkey((0, 0, 0))
+            pygame.draw.circle(sprite, self.warning_color, (radius, radius), radius)
+            self._sprites[radius] = sprite
+        return sprite
+
+    def draw(self, display, view, table, car, current_time_step, distance_threshold=30,
+             detail_distance=None, min_box_px=4):
+        states, valid = table.at(current_time_step)
+        indices = np.flatnonzero(valid)
+        detailed = table.lengths[indices] * view.scale >= min_box_px
+        if detail_distance is not None and car is not None:
+            distances = np.hypot(states[indices, X] - car.pose[0], states[indices, Y] - car.pose[1])
+            detailed &= distances <= detail_distance
+        boxes = indices[detailed]
+        if boxes.size:
+            corners = self.corners(view, states[boxes], table.lengths[boxes], table.widths[boxes])
+            screen, mark, color = display.screen, display.mark, self.color
+            for polygon in corners.tolist():
+                mark(pygame.draw.polygon(screen, color, polygon))
+        far = indices[~detailed]
+        if far.size:
+            draw_obstacle_points(display, view.to_screen(states[far, :2]), self.color)
+
+        if car is None:
+            return None, []
+
+        nearest, nearby = nearest_obstacles(table, current_time_step, car.pose, distance_threshold)
+        if nearby:
+            radius = max(int(1.5 * view.scale), 2)  # 반지름 1.5 m
+            sprite = self.warning_sprite(radius)
+            centers = view.to_screen(np.array([position for position, _ in nearby]))
+            for x, y in (centers - radius).astype(int).tolist():
+                display.blit(sprite, (x, y))
+        return nearest, nearby
+
+
+_default_layer = ObstacleLayer()
+
+
+def draw_dynamic_obstacles(display, view, table, car, current_time_step, distance_threshold=30,
+                           detail_distance=None, min_box_px=4, layer=None):
+    """현재 time step 의 장애물을 그리고, ego 근처 장애물은 빨간 원으로 표시한다.
+
+    table 은 ObstacleStateTable. car 가 None 이면 (ego 가 지도 좌표계에 있지 않을 때) 장애물만 그린다.
+    ego 에서 detail_distance 보다 멀거나 화면에서 min_box_px 보다 작은 장애물은 점으로 그린다 (LOD).
+    layer (ObstacleLayer) 를 주지 않으면 모듈 기본 layer 의 버퍼 / sprite 를 재사용한다.
+    """
+    return (layer or _default_layer).draw(display, view, table, car, current_time_step, distance_threshold,
+                                          detail_distance, min_box_px)
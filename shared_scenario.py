@@ -0,0 +1,218 @@
+import ctypes
+import gc
+import json
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from obstacle_states import ObstacleStateTable
+from routing import LaneletGraph
+
+ALIGNMENT = 64
+
+
+# ===================================
+# scenario -> 숫자 배열
+# ===================================
+def concat_vertices(vertex_list):
+    """길이가 다른 (n_i, 2) 배열들을 하나로 붙이고 경계 offset (n + 1,) 을 같이 반환."""
+    offsets = np.zeros(len(vertex_list) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(v) for v in vertex_list])
+    data = np.concatenate(vertex_list) if vertex_list else np.zeros((0, 2))
+    return data.astype(float), offsets
+
+
+def split_vertices(data, offsets):
+    return [data[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def occupancy_grid(graph, resolution=0.5):
+    """lanelet 이 덮는 cell 은 1 인 uint8 grid. origin 은 (x, y) 좌하단."""
+    if len(graph) == 0:
+        return np.zeros((0, 0), dtype=np.uint8), np.zeros(2)
+    x0, y0 = graph.bboxes[:, 0].min(), graph.bboxes[:, 1].min()
+    x1, y1 = graph.bboxes[:, 2].max(), graph.bboxes[:, 3].max()
+    cols = int(np.ceil((x1 - x0) / resolution)) + 1
+    rows = int(np.ceil((y1 - y0) / resolution)) + 1
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    for path, (bx0, by0, bx1, by1) in zip(graph.paths, graph.bboxes):
+        c0, c1 = int((bx0 - x0) / resolution), int((bx1 - x0) / resolution) + 1
+        r0, r1 = int((by0 - y0) / resolution), int((by1 - y0) / resolution) + 1
+        cc, rr = np.meshgrid(np.arange(c0, c1), np.arange(r0, r1))
+        centers = np.column_stack([x0 + (cc.ravel() + 0.5) * resolution, y0 + (rr.ravel() + 0.5) * resolution])
+        inside = path.contains_points(centers).reshape(cc.shape)
+        grid[r0:r1, c0:c1] |= inside.astype(np.uint8)
+    return grid, np.array([x0, y0])
+
+
+def pack_scenario(scenario, resolution=0.5):
+    """공유할 배열 dict 와 작은 meta dict."""
+    graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    table = ObstacleStateTable.from_scenario(scenario)
+
+    centers, center_offsets = concat_vertices(graph.centers)
+    lefts, left_offsets = concat_vertices(graph.lefts)
+    rights, right_offsets = concat_vertices(graph.rights)
+    successors = [np.asarray(s, dtype=np.int64) for s in graph.successors]
+    successor_offsets = np.zeros(len(graph) + 1, dtype=np.int64)
+    successor_offsets[1:] = np.cumsum([len(s) for s in successors])
+    grid, origin = occupancy_grid(graph, resolution)
+    polygons, polygon_offsets = concat_vertices(graph.polygons)
+
+    arrays = {
+        'lanelet_ids': np.asarray(graph.ids, dtype=np.int64),
+        'center_vertices': centers, 'center_offsets': center_offsets,
+        'left_vertices': lefts, 'left_offsets': left_offsets,
+        'right_vertices': rights, 'right_offsets': right_offsets,
+        'successors': np.concatenate(successors) if successors else np.zeros(0, dtype=np.int64),
+        'successor_offsets': successor_offsets,
+        'adj_left': np.array([-1 if a is None else a for a in graph.adj_left], dtype=np.int64),
+        'adj_right': np.array([-1 if a is None else a for a in graph.adj_right], dtype=np.int64),
+        'polygon_vertices': polygons, 'polygon_offsets': polygon_offsets,
+        'lanelet_bboxes': graph.bboxes, 'lanelet_lengths': graph.lengths,
+        'obstacle_ids': table.ids, 'obstacle_states': table.states, 'obstacle_valid': table.valid,
+        'obstacle_lengths': table.lengths, 'obstacle_widths': table.widths,
+        'occupancy': grid, 'occupancy_origin': origin,
+    }
+    meta = {'dt': table.dt, 'resolution': resolution}
+    return arrays, meta
+
+
+def save_packed(path, arrays, meta=None):
+    """pack_scenario 형식 배열을 .npz 하나로 (meta 는 JSON 문자열로 같이 저장)."""
+    np.savez(path, _meta=np.array(json.dumps(dict(meta or {}))), **arrays)
+
+
+def load_packed(path):
+    """save_packed 의 역. (arrays, meta) 는 SharedScenarioStore.create 에 그대로 넘길 수 있다."""
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != '_meta'}
+        meta = json.loads(str(data['_meta'])) if '_meta' in data.files else {}
+    return arrays, meta
+
+
+# ===================================
+# 공유 메모리 저장소
+# ===================================
+class SharedScenarioStore():
+    """부모가 create() 로 한 번 만들고, worker 는 spec 으로 attach() 해서 읽기 전용 view 를 쓴다.
+
+    spec 은 작은 dict (이름, dtype, shape, offset) 이라 pickle 비용이 거의 없다.
+    """
+
+    def __init__(self, shm, spec, owner):
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        self.meta = spec['meta']
+        self._unlinked = False
+        self.arrays = {}
+        # numpy 는 shm.buf 로 만든 배열의 base 를 mmap 으로 두고 buffer export 는 놓아 버려서, view 가 남은 채로
+        # close() 하면 해제된 메모리를 가리키게 된다 (segfault). export 를 쥐고 있는 ctypes 배열을 base 로 쓰면
+        # view (와 그 slice) 가 살아 있는 동안 close() 가 BufferError 로 막힌다
+        exporter = (ctypes.c_char * shm.size).from_buffer(shm.buf)
+        for name, (dtype, shape, offset) in spec['arrays'].items():
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=exporter, offset=offset)
+            if not owner:
+                array.flags.writeable = False
+            self.arrays[name] = array
+
+    @classmethod
+    def create(cls, arrays, meta=None):
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            size = (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+            layout[name] = (array.dtype.str, array.shape, size)
+            size += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        spec = {'name': shm.name, 'arrays': layout, 'meta': dict(meta or {})}
+        store = cls(shm, spec, owner=True)
+        for name, array in arrays.items():
+            store.arrays[name][...] = array
+        return store
+
+    @classmethod
+    def from_scenario(cls, scenario, resolution=0.5):
+        arrays, meta = pack_scenario(scenario, resolution)
+        return cls.create(arrays, meta)
+
+    @classmethod
+    def attach(cls, spec):
+        try:
+            # python 3.13+: worker 가 끝날 때 resource tracker 가 unlink 하지 않도록
+            shm = shared_memory.SharedMemory(name=spec['name'], track=False)
+        except TypeError:
+            # python < 3.13 은 attach 도 tracker 에 등록된다. multiprocessing 자식은 부모의 tracker 를
+            # 같이 쓰므로 (등록은 set 이라 중복되지 않음) 그대로 두고, 따로 실행된 프로세스가 자기 tracker 를
+            # 새로 띄운 경우만 등록을 지운다 (안 지우면 그 프로세스가 끝날 때 segment 가 unlink 된다)
+            own_tracker = getattr(resource_tracker._resource_tracker, '_fd', None) is None
+            shm = shared_memory.SharedMemory(name=spec['name'])
+            if own_tracker:
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, spec, owner=False)
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """mapping 을 닫고, owner 면 이름도 unlink 한다.
+
+        arrays / lanelet_graph() / obstacle_table() 에서 받은 view 가 남아 있으면 mapping 을 풀 수 없어
+        BufferError. 이름은 그 전에 unlink 되므로 새 attach 는 막히고, view 를 버린 뒤 다시 close() 하면 된다.
+        """
+        self.arrays = {}
+        if self.owner and not self._unlinked:
+            self.shm.unlink()
+            self._unlinked = True
+        try:
+            self.shm.close()
+            return
+        except BufferError:
+            # 순환 참조 (예: import 중에 잡힌 예외의 traceback 이 잡고 있는 frame) 에만 남은 view 를 치우고 한 번 더
+            gc.collect()
+        try:
+            self.shm.close()
+        except BufferError:
+            raise BufferError('shared scenario views are still referenced; drop them before close()') from None
+
+    # ----- 공유 배열 위의 객체 (vertex 복사 없음) -----
+    def lanelet_graph(self):
+        """vertex / polygon / bbox 는 공유 메모리 view. polygon 배열이 없는 예전 .npz 는 worker 마다 다시 만든다."""
+        a = self.arrays
+        successors = split_vertices(a['successors'], a['successor_offsets'])
+        geometry = {}
+        if 'polygon_vertices' in a:
+            geometry = {'polygons': split_vertices(a['polygon_vertices'], a['polygon_offsets']),
+                        'bboxes': a['lanelet_bboxes'], 'lengths': a['lanelet_lengths']}
+        return LaneletGraph(
+            a['lanelet_ids'].tolist(),
+            [s.tolist() for s in successors],
+            [None if i < 0 else int(i) for i in a['adj_left']],
+            [None if i < 0 else int(i) for i in a['adj_right']],
+            split_vertices(a['center_vertices'], a['center_offsets']),
+            split_vertices(a['left_vertices'], a['left_offsets']),
+            split_vertices(a['right_vertices'], a['right_offsets']),
+            **geometry,
+        )
+
+    def obstacle_table(self):
+        a = self.arrays
+        return ObstacleStateTable(a['obstacle_ids'], a['obstacle_states'], a['obstacle_valid'],
+                                  self.meta['dt'], a['obstacle_lengths'], a['obstacle_widths'])
+
+    def occupied(self, points):
+        """world 좌표 (n, 2) 가 lanelet 위인지 occupancy grid 로 확인."""
+        grid = self.arrays['occupancy']
+        cells = np.floor((np.asarray(points) - self.arrays['occupancy_origin']) / self.meta['resolution']).astype(int)
+        inside = (cells[:, 0] >= 0) & (cells[:, 0] < grid.shape[1]) & (cells[:, 1] >= 0) & (cells[:, 1] < grid.shape[0])
+        result = np.zeros(len(cells), dtype=bool)
+        result[inside] = grid[cells[inside, 1], cells[inside, 0]].astype(bool)
+        return result
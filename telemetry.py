@@ -0,0 +1,292 @@
+import collections
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+
+# ===================================
+# packet 형식
+# ===================================
+# [PACKET_HEADER: magic, sample 수, packet 번호][SAMPLE_DTYPE record * 수]
+# packet 번호가 건너뛰면 consumer 쪽에서 잃어버린 packet 으로 센다.
+PACKET_MAGIC = b'TLM1'
+PACKET_HEADER = struct.Struct('<4sIQ')
+
+SAMPLE_DTYPE = np.dtype([
+    ('wall_time', '<f8'),         # time.time() (보낸 쪽 시계, 전송 지연 측정용)
+    ('sim_time', '<f8'),
+    ('step', '<i4'),
+    ('events', '<u4'),            # EVENTS bit mask
+    ('speed', '<f4'),
+    ('frame_time', '<f4'),        # 프레임 간격 (s)
+    ('step_time', '<f4'),         # 한 step 계산에 걸린 시간 (s)
+    ('nearest_distance', '<f4'),  # 장애물이 없으면 inf
+    ('ttc', '<f4'),               # 계산하지 않았거나 접근 장애물이 없으면 inf
+    ('reward', '<f4'),            # 학습 환경용 (없으면 nan)
+])
+
+# datagram 하나에 들어가는 최대 sample 수 (UDP payload 65507 byte)
+MAX_BATCH = (65507 - PACKET_HEADER.size) // SAMPLE_DTYPE.itemsize
+
+EVENTS = ('proximity', 'lane_departure', 'seek', 'tile_load', 'replan')
+EVENT_BITS = {name: 1 << i for i, name in enumerate(EVENTS)}
+
+
+def event_mask(*names):
+    mask = 0
+    for name in names:
+        mask |= EVENT_BITS[name]
+    return mask
+
+
+def event_names(mask):
+    return [name for name in EVENTS if mask & EVENT_BITS[name]]
+
+
+def parse_address(target):
+    """'host:port' / 'port' -> UDP (host, port), 그 외 문자열은 Unix datagram socket 경로."""
+    if isinstance(target, tuple):
+        return target
+    host, _, port = str(target).rpartition(':')
+    if port.isdigit():
+        return (host or '127.0.0.1', int(port))
+    return str(target)
+
+
+def _socket_for(address):
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    return socket.socket(family, socket.SOCK_DGRAM)
+
+
+def pack_samples(samples, sequence):
+    records = np.array(samples, dtype=SAMPLE_DTYPE)
+    return PACKET_HEADER.pack(PACKET_MAGIC, records.shape[0], sequence) + records.tobytes()
+
+
+def unpack_samples(packet):
+    """packet -> (packet 번호, sample 배열). 형식이 맞지 않으면 ValueError."""
+    if len(packet) < PACKET_HEADER.size:
+        raise ValueError('short telemetry packet')
+    magic, count, sequence = PACKET_HEADER.unpack_from(packet)
+    if magic != PACKET_MAGIC or len(packet) != PACKET_HEADER.size + count * SAMPLE_DTYPE.itemsize:
+        raise ValueError('bad telemetry packet')
+    return sequence, np.frombuffer(packet, dtype=SAMPLE_DTYPE, offset=PACKET_HEADER.size, count=count)
+
+
+# ===================================
+# publisher (시뮬레이션 쪽)
+# ===================================
+class TelemetryPublisher():
+    """publish() 는 tuple 하나를 queue 에 넣기만 하고, 전송은 백그라운드 스레드가 batch 로 한다.
+
+    queue 가 차거나 socket buffer 가 차면 기다리지 않고 버린다 (dropped / send_errors 로 집계).
+    받는 쪽이 없어도 시뮬레이션 루프에는 영향이 없다.
+    """
+
+    def __init__(self, target='127.0.0.1:5006', batch_size=64, max_delay=0.1, queue_size=4096):
+        self.address = parse_address(target)
+        self.batch_size = min(batch_size, MAX_BATCH)
+        self.max_delay = max_delay
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.published = 0
+        self.dropped = 0
+        self.sent = 0
+        self.packets = 0
+        self.send_errors = 0
+        self._sequence = 0
+        self._socket = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return self
+        self._socket = _socket_for(self.address)
+        self._socket.setblocking(False)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self._socket.close()
+
+    def publish(self, sim_time, step=0, speed=np.nan, frame_time=np.nan, step_time=np.nan,
+                nearest_distance=np.inf, ttc=np.inf, reward=np.nan, events=0):
+        """시뮬레이션 스레드에서 step 마다 호출. 버려졌으면 False."""
+        if nearest_distance is None:
+            nearest_distance = np.inf
+        try:
+            self.queue.put_nowait((time.time(), sim_time, step, events, speed, frame_time, step_time,
+                                   nearest_distance, ttc, reward))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.published += 1
+        return True
+
+    def _run(self):
+        batch = []
+        deadline = None
+        # stop() 후에도 queue 에 남은 sample 은 보내고 끝낸다
+        while self._running or batch or not self.queue.empty():
+            timeout = self.max_delay if deadline is None else max(deadline - time.perf_counter(), 0)
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+                if deadline is None:
+                    deadline = time.perf_counter() + self.max_delay
+                # 이미 쌓인 sample 은 기다리지 않고 한 번에
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch and (len(batch) >= self.batch_size or time.perf_counter() >= deadline or not self._running):
+                self._send(batch)
+                batch = []
+                deadline = None
+
+    def _send(self, batch):
+        packet = pack_samples(batch, self._sequence)
+        self._sequence += 1
+        try:
+            self._socket.sendto(packet, self.address)
+        except OSError:
+            # buffer 가 찼거나 받는 쪽이 없음 (Unix socket) -> 버린다
+            self.send_errors += len(batch)
+            return
+        self.sent += len(batch)
+        self.packets += 1
+
+    def stats(self):
+        return {'published': self.published, 'dropped': self.dropped, 'sent': self.sent,
+                'packets': self.packets, 'send_errors': self.send_errors}
+
+
+# ===================================
+# consumer (대시보드 / 테스트 쪽)
+# ===================================
+class TelemetryConsumer():
+    """publisher 의 packet 을 받아 sample 배열로 돌려준다. 최근 history 개 sample 을 보관."""
+
+    def __init__(self, target='127.0.0.1:5006', history=10000):
+        self.address = parse_address(target)
+        self.samples = collections.deque(maxlen=history)
+        self.received = 0
+        self.lost_packets = 0
+        self.bad_packets = 0
+        self._next_sequence = None
+        self._socket = None
+
+    def open(self):
+        self._socket = _socket_for(self.address)
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)  # 이전 실행이 남긴 socket 파일
+        self._socket.bind(self.address)
+        if not isinstance(self.address, str):
+            self.address = self._socket.getsockname()
+        return self
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def receive(self, timeout=0.5):
+        """timeout 동안 처음 packet 을 기다리고, 이미 도착한 packet 은 모두 읽어 sample 배열로."""
+        chunks = []
+        self._socket.settimeout(timeout)
+        while True:
+            try:
+                packet = self._socket.recv(65536)
+            except (socket.timeout, BlockingIOError):
+                break
+            self._socket.settimeout(0)
+            try:
+                sequence, samples = unpack_samples(packet)
+            except ValueError:
+                self.bad_packets += 1
+                continue
+            if self._next_sequence is not None and sequence > self._next_sequence:
+                self.lost_packets += sequence - self._next_sequence
+            self._next_sequence = sequence + 1
+            chunks.append(samples)
+        if not chunks:
+            return np.zeros(0, dtype=SAMPLE_DTYPE)
+        samples = np.concatenate(chunks)
+        self.received += samples.shape[0]
+        self.samples.extend(samples)
+        return samples
+
+
+def _p99_ms(values):
+    values = values[np.isfinite(values)]
+    return float(np.percentile(values, 99) * 1000) if values.size else np.nan
+
+
+def summarize(samples):
+    """sample 배열 -> 한 줄 요약 dict (대시보드 출력용)."""
+    if samples.shape[0] == 0:
+        return {'samples': 0}
+    events = {name: int(np.count_nonzero(samples['events'] & bit)) for name, bit in EVENT_BITS.items()}
+    return {
+        'samples': samples.shape[0],
+        'sim_time': float(samples['sim_time'][-1]),
+        'speed': float(samples['speed'][-1]),
+        'min_distance': float(samples['nearest_distance'].min()),
+        'min_ttc': float(samples['ttc'].min()),
+        'frame_p99_ms': _p99_ms(samples['frame_time']),
+        'step_p99_ms': _p99_ms(samples['step_time']),
+        'latency_ms': float((time.time() - samples['wall_time'][-1]) * 1000),
+        'events': {name: n for name, n in events.items() if n},
+    }
+
+
+def benchmark_publish(n=100000):
+    """publish() 한 번의 평균 비용 (s). 받는 쪽 없이 측정."""
+    publisher = TelemetryPublisher(queue_size=n + 1).start()
+    started = time.perf_counter()
+    for i in range(n):
+        publisher.publish(i * 0.01, i, 10.0, 0.016, 0.002, 5.0, np.inf)
+    elapsed = (time.perf_counter() - started) / n
+    publisher.stop()
+    return elapsed, publisher.stats()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='print live telemetry from main.py --telemetry')
+    parser.add_argument('target', nargs='?', default='127.0.0.1:5006', help='host:port or Unix socket path')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between summary lines')
+    parser.add_argument('--bench', action='store_true', help='measure publish() cost and exit')
+    args = parser.parse_args()
+
+    if args.bench:
+        cost, stats = benchmark_publish()
+        print(f"publish: {cost * 1e6:.2f} us per sample, {stats}")
+    else:
+        with TelemetryConsumer(args.target) as consumer:
+            print(f"listening on {consumer.address}")
+            try:
+                while True:
+                    window = []
+                    until = time.perf_counter() + args.interval
+                    while time.perf_counter() < until:
+                        window.append(consumer.receive(timeout=max(until - time.perf_counter(), 0.01)))
+                    print(summarize(np.concatenate(window)), f"lost packets: {consumer.lost_packets}")
+            except KeyboardInterrupt:
+                pass
@@ -219,7 +219,7 @@ class Car2():
 
         # print(self.image.get_size())
         w, h = self.image.get_size()
-        self.screen.blit(
+        self.rect = self.screen.blit(
             self.image, (self.pose[0] - w / 2, self.pose[1] - h / 2))
 
         # print('drew car: '+str(self.pose))
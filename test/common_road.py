@@ -1,9 +1,17 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import PolyCollection
 
 from commonroad.common.file_reader import CommonRoadFileReader
 from commonroad.visualization.mp_renderer import MPRenderer
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from obstacle_states import ObstacleStateTable
+from scenario_render import box_corners_batch
+
 # 설정
 file_path = "./scenario/USA_Lanker-1_1_T-1.xml"  # 시나리오 경로
 max_time_steps = 40  # 몇 개 time step까지 애니메이션 할지
@@ -15,31 +23,64 @@ scenario, planning_problem_set = CommonRoadFileReader(file_path).open()
 fig, ax = plt.subplots(figsize=(25, 10))
 
 
-# update 함수 정의
-def update(frame):
-    ax.clear()
+# 각 frame 은 time step 만으로 결정되므로 seek 는 다음에 그릴 step 만 바꾸면 된다
+# (Home: 처음, End: 마지막, 방향키 좌/우: -/+1, PageUp/PageDown: -/+10)
+SEEK_KEYS = {'home': None, 'left': -1, 'right': 1, 'pageup': -10, 'pagedown': 10}
+playback = {'step': 0}
+
+
+def on_key(event):
+    if event.key == 'end':
+        playback['step'] = max_time_steps - 1
+    elif event.key in SEEK_KEYS:
+        delta = SEEK_KEYS[event.key]
+        playback['step'] = 0 if delta is None else min(max(playback['step'] + delta, 0), max_time_steps - 1)
+
 
-    # 새로운 Renderer 만들고 설정
-    rnd = MPRenderer(ax=ax)
-    rnd.draw_params.time_begin = frame
-    rnd.draw_params.time_end = frame
-    rnd.draw_params.show_labels = False
+def steps():
+    while True:
+        yield playback['step']
+        playback['step'] = min(playback['step'] + 1, max_time_steps - 1)
 
-    scenario.draw(rnd)
-    planning_problem_set.draw(rnd)
 
-    rnd.render()
+# matplotlib 기본 단축키(home/back/forward)와 겹치지 않도록 제거
+for name in ('keymap.home', 'keymap.back', 'keymap.forward'):
+    plt.rcParams[name] = [key for key in plt.rcParams[name] if key not in SEEK_KEYS]
+fig.canvas.mpl_connect('key_press_event', on_key)
 
-    ax.set_title(f"Time Step: {frame}")
+
+# 정적 지도 (lanelet / 정적 장애물 / planning problem) 는 한 번만 그린다
+rnd = MPRenderer(ax=ax)
+rnd.draw_params.time_begin = 0
+rnd.draw_params.time_end = 0
+rnd.draw_params.show_labels = False
+scenario.lanelet_network.draw(rnd)
+for obstacle in scenario.static_obstacles:
+    obstacle.draw(rnd)
+planning_problem_set.draw(rnd)
+rnd.render()
+
+# 동적 장애물은 collection 하나를 두고 매 frame 꼭짓점 배열만 바꾼다 (artist 를 새로 만들지 않음)
+obstacle_table = ObstacleStateTable.from_scenario(scenario)
+obstacles = PolyCollection([], facecolors='#1565c0', edgecolors='#0d47a1', zorder=30)
+ax.add_collection(obstacles)
+title = ax.set_title("")
+
+
+def update(frame):
+    states, valid = obstacle_table.at(frame)
+    obstacles.set_verts(box_corners_batch(states[valid], obstacle_table.lengths[valid], obstacle_table.widths[valid]))
+    title.set_text(f"Time Step: {frame}")
+    return obstacles, title
 
 
 # FuncAnimation으로 애니메이션 생성
 anim = FuncAnimation(
     fig,
     update,
-    frames=max_time_steps,  # 0 ~ max_time_steps-1
+    frames=steps,  # 현재 step (키 입력으로 이동, 마지막 step 에서 멈춤)
     interval=500,  # frame 간 시간 (ms) - 500ms == 0.5초
-    repeat=False  # 다 끝나면 반복하지 않음
+    cache_frame_data=False
 )
 
 plt.show()
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCENARIO = os.path.join(ROOT, 'scenario', 'USA_Lanker-1_1_T-1.xml')
+
+
+def load_root_main():
+    """저장소 최상위 main.py (test/main.py 와 이름이 같아 import main 으로는 못 읽는다)."""
+    module = sys.modules.get('simulation_main')
+    if module is None:
+        spec = importlib.util.spec_from_file_location('simulation_main', os.path.join(ROOT, 'main.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['simulation_main'] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def lanker():
+    """(scenario, planning_problem_set, LaneletGraph) - 여러 test 가 같이 쓴다."""
+    from main_rev import load_scenario
+    from routing import LaneletGraph
+
+    scenario, planning_problem_set = load_scenario(SCENARIO)
+    return scenario, planning_problem_set, LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+
+
+@pytest.fixture
+def run_main():
+    """main.py 를 headless 로 한 번 돌린다. 인자는 main.py 명령행 그대로."""
+    def run(*args):
+        env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+        command = [sys.executable, os.path.join(ROOT, 'main.py'), '--scenario', SCENARIO, '--headless',
+                   '--no-record', '--feedback', 'V', *map(str, args)]
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=600)
+        assert result.returncode == 0, result.stderr[-2000:]
+        return result.stdout
+    return run
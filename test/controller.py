@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+# car_model.Car2 의 회전 모델: angle += steering_angle * dt * speed / STEER_RATIO
+STEER_RATIO = 100
+MAX_STEER = math.pi / 3
+TURN_STEP = math.pi / 20  # Car2.turn(1) 한 번에 바뀌는 steering
+
+
+def wrap_angle(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+# ===================================
+# 조향 법칙 (scalar / numpy 배열 모두 가능)
+# ===================================
+def stanley_steering(x, y, heading, speed, road, k, softening=1.0):
+    """heading 오차 + atan(k * 횡오차 / (speed + softening))."""
+    road_heading = road.getHeadingArray(x)
+    # scanRoad 와 같은 부호: 도로보다 아래(+y)에 있으면 양수
+    cross_track = (y - road.getYArray(x)) * np.cos(road_heading)
+    steering = wrap_angle(road_heading - heading) - np.arctan(k * cross_track / (np.abs(speed) + softening))
+    return np.clip(steering, -MAX_STEER, MAX_STEER)
+
+
+def pure_pursuit_steering(x, y, heading, road, lookahead, gain=1.0):
+    """도로 위 lookahead 만큼 앞 점을 향하는 원호의 곡률로 조향."""
+    road_heading = road.getHeadingArray(x)
+    target_x = x + lookahead * np.cos(road_heading)
+    target_y = road.getYArray(target_x)
+    alpha = wrap_angle(np.arctan2(target_y - y, target_x - x) - heading)
+    curvature = 2 * np.sin(alpha) / np.hypot(target_x - x, target_y - y)
+    return np.clip(gain * STEER_RATIO * curvature, -MAX_STEER, MAX_STEER)
+
+
+# ===================================
+# Car2 용 컨트롤러
+# ===================================
+class StanleyController():
+    def __init__(self, k=2.0, softening=1.0):
+        self.k = k
+        self.softening = softening
+
+    def steering(self, car, road):
+        return float(stanley_steering(car.pose[0], car.pose[1], car.angle, car.speed, road,
+                                      self.k, self.softening))
+
+    def apply(self, car, road):
+        # Car2.turn 은 TURN_STEP 단위로 steering 을 바꾼다
+        car.turn((self.steering(car, road) - car.steering_angle) / TURN_STEP)
+
+
+class PurePursuitController():
+    def __init__(self, lookahead=80.0, gain=1.0):
+        self.lookahead = lookahead
+        self.gain = gain
+
+    def steering(self, car, road):
+        return float(pure_pursuit_steering(car.pose[0], car.pose[1], car.angle, road,
+                                           self.lookahead, self.gain))
+
+    def apply(self, car, road):
+        car.turn((self.steering(car, road) - car.steering_angle) / TURN_STEP)
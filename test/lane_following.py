@@ -19,18 +19,29 @@ class CurvedRoad():
         if type == 'curved':
             self.y = curvedRoadY(self.x, self.start)
         elif type == '0':
-            self.y = y
+            self.y = np.zeros(self.x.shape[0])
         elif type == '45':
             self.y = turn45(self.x, self.x_offset, self.start, self.slope)
         else:
             raise ValueError('incorrect road type given')
         self.points = list(zip(self.x, self.y_offset - self.y))
+        self.heading = np.arctan(np.gradient(self.y_offset - self.y, self.x))
 
     def getY(self, x):
         if self.type == 'curved':
             return self.y_offset - paramaterizedTurn(x, self.start)
         if self.type == '45':
             return self.y_offset - paramaterizedTurn45(x, self.x_offset, self.start, self.slope)
+        if self.type == '0':
+            return self.y_offset
+
+    def getYArray(self, x):
+        # 여러 x 를 한 번에 (self.points 선형 보간)
+        return np.interp(x, self.x, self.y_offset - self.y)
+
+    def getHeadingArray(self, x):
+        # 도로 진행 방향 (screen 좌표계, car.angle 과 같은 기준)
+        return np.interp(x, self.x, self.heading)
 
     def scanRoad(self, car):
         # x,y = car.next_position()
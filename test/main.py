@@ -1,4 +1,6 @@
 # Import libraries
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import pygame
@@ -7,6 +9,12 @@ import math
 from car_model import Car2
 from lane_following import CurvedRoad
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from display_manager import DisplayManager
+from input_sources import InputPoller, KeyboardSource, apply_command
+from telemetry import TelemetryPublisher
+from traffic import find_leaders, idm_acceleration
+
 # Initialize pygame
 pygame.init()
 
@@ -21,11 +29,15 @@ YELLOW = (255, 255, 0)
 size = (600, 1400)  # 화면을 세로로 길게
 PI = math.pi
 
-def updateSteering(screen, car):
-    pygame.draw.arc(screen, GREEN, [20, 20, 250, 200], PI / 4, 3 * PI / 4, 5)
-    pygame.draw.arc(screen, RED, [20, 20, 250, 200], 3 * PI / 4, PI, 5)
-    pygame.draw.arc(screen, RED, [20, 20, 250, 200], 0, PI / 4, 5)
-    pygame.draw.circle(screen, BLACK, [145, 120], 20)
+# 다른 차량용 IDM 파라미터 (픽셀 단위, 차 길이 100 px)
+IDM_PX = {'v0': 80, 'T': 1.0, 'a': 15, 'b': 30, 's0': 20}
+
+def updateSteering(display, car):
+    screen = display.screen
+    rect = pygame.draw.arc(screen, GREEN, [20, 20, 250, 200], PI / 4, 3 * PI / 4, 5)
+    rect.union_ip(pygame.draw.arc(screen, RED, [20, 20, 250, 200], 3 * PI / 4, PI, 5))
+    rect.union_ip(pygame.draw.arc(screen, RED, [20, 20, 250, 200], 0, PI / 4, 5))
+    rect.union_ip(pygame.draw.circle(screen, BLACK, [145, 120], 20))
 
     x1 = 145 - 145
     y1 = 10 - 120
@@ -33,12 +45,13 @@ def updateSteering(screen, car):
     y2 = x1 * math.sin(car.steering_angle) + y1 * math.cos(car.steering_angle)
     x = x2 + 145
     y = y2 + 120
-    pygame.draw.line(screen, BLACK, [x, y], [145, 120], 5)
+    rect.union_ip(pygame.draw.line(screen, BLACK, [x, y], [145, 120], 5))
+    display.mark(rect)
 
 def drawRoad(screen):
     pygame.draw.line(screen, BLACK, (300, 1400), (300, 0), 60)
 
-def updateSpeedometer(screen, car):
+def updateSpeedometer(display, car):
     font = pygame.font.SysFont('Calibri', 25, True, False)
 
     if car.gear == "D":
@@ -50,10 +63,26 @@ def updateSpeedometer(screen, car):
     else:
         gear_text = font.render("Gear: unknown", True, BLACK)
 
-    screen.blit(gear_text, [300, 40])
+    display.blit(gear_text, [300, 40])
 
     speed_text = font.render("Speed: " + str(car.speed / 5), True, BLACK)
-    screen.blit(speed_text, [300, 60])
+    display.blit(speed_text, [300, 60])
+
+def updateTraffic(car, others, delta):
+    """다른 차량들은 한 차선에서 앞차(ego 포함)를 IDM 으로 따라간다 (위쪽으로 진행)."""
+    cars = others + [car]
+    progress = np.array([-c.pose[1] for c in cars])
+    speed = np.array([c.speed for c in cars], dtype=float)
+    lanes = np.zeros(len(cars), dtype=np.int64)
+    leader, distance = find_leaders(lanes, progress, np.full(len(cars), -1), np.array([np.inf]))
+    m = len(others)
+    leader, distance = leader[:m], distance[:m]
+    has_leader = leader >= 0
+    gap = np.where(has_leader, distance - car.length, np.inf)
+    dv = np.where(has_leader, speed[:m] - speed[np.maximum(leader, 0)], 0.0)
+    acceleration = idm_acceleration(speed[:m], gap, dv, **IDM_PX)
+    for c, a in zip(others, acceleration):
+        c.speed = max(c.speed + a * delta, 0)
 
 def gameLoop(action, car, screen):
     if action == 1 or action == 'a' or action == 'left':
@@ -76,8 +105,6 @@ if __name__ == "__main__":
 
     screen = pygame.display.set_mode(size)
     pygame.display.set_caption("Vertical Car Sim - Multiple Cars")
-    background = pygame.Surface(screen.get_size())
-    background.fill((0, 0, 0))
 
     done = False
     clock = pygame.time.Clock()
@@ -95,41 +122,33 @@ if __name__ == "__main__":
 
     for c in [car2, car3, car4]:
         c.constant_speed = True
-        c.speed = 40  # 느리게
+        c.speed = 40  # 느리게 출발, 이후 IDM 이 속도를 정함
         c.angle = -math.pi / 2  # 다 위쪽
 
     # --- Road
     road = CurvedRoad(1200, 300, 1300, '45')
 
-    screen.fill(WHITE)
+    # 도로는 움직이지 않으므로 배경으로 캐시
+    background = pygame.Surface(screen.get_size())
+    background.fill(WHITE)
+    drawRoad(background)
+    road.plotRoad(background)
+    background = background.convert()
+    display = DisplayManager(screen, background)
 
     rate = 10
 
-    while not done:
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP]:
-            car.accelerate(1)
-        if keys[pygame.K_DOWN]:
-            car.accelerate(-1)
-        if keys[pygame.K_LEFT]:
-            car.turn(-1)
-        if keys[pygame.K_RIGHT]:
-            car.turn(1)
+    # 화면 좌표계 (y 아래로) 라서 왼쪽 키가 turn(-1)
+    poller = InputPoller(KeyboardSource(accel_step=1, turn_step=-1), rate=60).start()
+    # reward 등은 print 대신 telemetry 로 (python telemetry.py 로 확인)
+    telemetry = TelemetryPublisher().start()
 
+    while not done:
         t += 1
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 done = True
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    car.turn(-1)
-                elif event.key == pygame.K_RIGHT:
-                    car.turn(1)
-                elif event.key == pygame.K_UP:
-                    car.accelerate(1)
-                elif event.key == pygame.K_DOWN:
-                    car.accelerate(-1)
             elif event.type == pygame.KEYUP:
                 if event.key == pygame.K_DOWN:
                     car.release_down(-1)
@@ -138,21 +157,22 @@ if __name__ == "__main__":
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 print("User pressed a mouse button")
 
-        screen.fill(WHITE)
+        apply_command(car, *poller.latest())
 
-        # --- Draw everything
-        drawRoad(screen)
-        road.plotRoad(screen)
+        display.begin_frame()
+
+        updateTraffic(car, [car2, car3, car4], 1 / rate)
 
-        car.update(1 / rate)
-        for c in [car2, car3, car4]:
+        # --- Draw everything
+        for c in [car, car2, car3, car4]:
             c.update(1 / rate)
+            display.mark(c.rect)
 
-        updateSteering(screen, car)
-        updateSpeedometer(screen, car)
+        updateSteering(display, car)
+        updateSpeedometer(display, car)
 
         # --- Reward (only for main car)
-        print(road.reward(car))
+        telemetry.publish(t / rate, t, car.speed, frame_time=1 / rate, reward=road.reward(car))
 
         # --- Goal check
         if car.pose[1] < 50:
@@ -165,5 +185,8 @@ if __name__ == "__main__":
             print('Time out!')
             done = True
 
-        pygame.display.flip()
+        display.present()
         clock.tick(rate)
+
+    poller.stop()
+    telemetry.stop()
@@ -0,0 +1,135 @@
+import argparse
+import math
+import time
+
+import numpy as np
+
+from controller import (STEER_RATIO, PurePursuitController, StanleyController, pure_pursuit_steering,
+                        stanley_steering)
+from lane_following import CurvedRoad
+
+ROAD_TYPES = ['curved', '45', '0']
+
+
+def simulate_batch(road, steer_fn, n, speed=100, dt=0.1, initial_offset=20, max_time=None):
+    """n 대의 차량을 한 번에 시뮬레이션 (car_model.Car2 와 같은 회전 모델, constant speed).
+
+    steer_fn(x, y, heading) -> steering (n,). 출발 위치는 도로에서 initial_offset 만큼 벗어나 있다.
+    반환: cost (repo reward 와 같은 squared error / 100 의 평균), 횡오차 RMS, 도로 끝 도달 여부
+    """
+    start, end = road.x[0], road.x[-1]
+    if max_time is None:
+        max_time = 1.5 * (end - start) / speed
+    x = np.full(n, float(start))
+    y = np.full(n, road.getYArray(start) + initial_offset)
+    heading = np.full(n, road.heading[0])
+    squared_error = np.zeros(n)
+    count = np.zeros(n)
+
+    for _ in range(int(math.ceil(max_time / dt))):
+        active = x < end
+        if not active.any():
+            break
+        steering = steer_fn(x, y, heading)
+        heading = np.where(active, heading + steering * dt * speed / STEER_RATIO, heading)
+        x = np.where(active, x + np.cos(heading) * speed * dt, x)
+        y = np.where(active, y + np.sin(heading) * speed * dt, y)
+        error = y - road.getYArray(x)
+        squared_error += np.where(active, error ** 2, 0)
+        count += active
+
+    mean_squared = squared_error / np.maximum(count, 1)
+    return mean_squared / 100, np.sqrt(mean_squared), x >= end
+
+
+def simulate_car(road, controller, screen, speed=100, dt=0.1, initial_offset=20, max_time=None):
+    """simulate_batch 와 같은 조건으로 car_model.Car2 한 대를 controller 로 몬다 (scalar 기준 경로).
+
+    반환: (cost, 횡오차 RMS, 도로 끝 도달 여부, 궤적 [(x, y)])
+    """
+    from car_model import Car2
+
+    start, end = road.x[0], road.x[-1]
+    if max_time is None:
+        max_time = 1.5 * (end - start) / speed
+    car = Car2((0, 255, 0), float(start), float(road.getYArray(start) + initial_offset), screen, speed=speed)
+    car.angle = road.heading[0]
+    car.constant_speed = True
+    trajectory = []
+    squared_error = 0.0
+    for _ in range(int(math.ceil(max_time / dt))):
+        if car.pose[0] >= end:
+            break
+        controller.apply(car, road)
+        car.update(dt)
+        trajectory.append(tuple(car.pose))
+        squared_error += (car.pose[1] - road.getYArray(car.pose[0])) ** 2
+    mean_squared = squared_error / max(len(trajectory), 1)
+    return mean_squared / 100, math.sqrt(mean_squared), car.pose[0] >= end, trajectory
+
+
+def sweep_stanley(road, n, speed, dt, initial_offset):
+    k, softening = np.meshgrid(np.logspace(-2, 2, n), np.linspace(0.1, 50, n), indexing='ij')
+    k, softening = k.ravel(), softening.ravel()
+    cost, rms, finished = simulate_batch(
+        road, lambda x, y, h: stanley_steering(x, y, h, speed, road, k, softening), k.size, speed, dt, initial_offset)
+    return {'k': k, 'softening': softening}, cost, rms, finished
+
+
+def sweep_pure_pursuit(road, n, speed, dt, initial_offset):
+    lookahead, gain = np.meshgrid(np.linspace(5, 300, n), np.linspace(0.2, 2.0, n), indexing='ij')
+    lookahead, gain = lookahead.ravel(), gain.ravel()
+    cost, rms, finished = simulate_batch(
+        road, lambda x, y, h: pure_pursuit_steering(x, y, h, road, lookahead, gain), lookahead.size, speed, dt, initial_offset)
+    return {'lookahead': lookahead, 'gain': gain}, cost, rms, finished
+
+
+# sweep 이름 -> (sweep 함수, 같은 gain 으로 Car2 를 모는 controller)
+SWEEPS = [('stanley', sweep_stanley, StanleyController),
+          ('pure pursuit', sweep_pure_pursuit, PurePursuitController)]
+
+
+def report(name, road_type, params, cost, rms, finished, top):
+    # 끝까지 못 간 조합은 뒤로
+    order = np.lexsort((cost, ~finished))[:top]
+    print(f"--- {name} / road '{road_type}' ({cost.size} combinations, {finished.sum()} finished)")
+    for i in order:
+        gains = ', '.join(f"{key}={value[i]:.3f}" for key, value in params.items())
+        print(f"  {gains}: cost {cost[i]:.3f}, lateral RMS {rms[i]:.2f} px, finished {bool(finished[i])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='headless lane-following gain sweep')
+    parser.add_argument('--grid', type=int, default=50, help='gain grid size per axis')
+    parser.add_argument('--speed', type=float, default=100)
+    parser.add_argument('--dt', type=float, default=0.1)
+    parser.add_argument('--offset', type=float, default=20, help='initial lateral offset from the road (px)')
+    parser.add_argument('--top', type=int, default=3)
+    parser.add_argument('--roads', nargs='+', default=ROAD_TYPES, choices=ROAD_TYPES)
+    parser.add_argument('--verify', action='store_true',
+                        help='drive car_model.Car2 with the best gains and compare with the batched cost')
+    args = parser.parse_args()
+
+    screen = None
+    if args.verify:
+        import os
+        import pygame
+
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        screen = pygame.display.set_mode((1400, 800))
+
+    t0 = time.perf_counter()
+    total = 0
+    for road_type in args.roads:
+        road = CurvedRoad(1200, 0, 500, road_type)
+        for name, sweep, controller_class in SWEEPS:
+            params, cost, rms, finished = sweep(road, args.grid, args.speed, args.dt, args.offset)
+            total += cost.size
+            report(name, road_type, params, cost, rms, finished, args.top)
+            if args.verify:
+                best = np.lexsort((cost, ~finished))[0]
+                controller = controller_class(**{key: float(value[best]) for key, value in params.items()})
+                car_cost = simulate_car(road, controller, screen, args.speed, args.dt, args.offset)[0]
+                print(f"  Car2 + {controller_class.__name__}: cost {car_cost:.3f} (batched {cost[best]:.3f})")
+    print(f"{total} runs in {time.perf_counter() - t0:.2f} s")
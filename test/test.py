@@ -1,11 +1,16 @@
+import os
+import sys
 import pygame
 import math
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
 from commonroad.common.file_reader import CommonRoadFileReader
-from commonroad.visualization.mp_renderer import MPRenderer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from display_manager import DisplayManager
+from input_sources import InputPoller, KeyboardSource, apply_command
+from obstacle_states import ObstacleStateTable
+from scenario_render import render_static_map, draw_dynamic_obstacles
 
 # ===================================
 # Car2 클래스 및 보조 함수 정의
@@ -48,7 +53,7 @@ def dampenSpeed(speed, velocity_dampening, delta):
             new_speed = 0
     return int(new_speed)
 
-def updateSpeedometer(screen, car):
+def updateSpeedometer(display, car):
     font = pygame.font.SysFont('Calibri', 25, True, False)
 
     if car.gear == "D":
@@ -60,35 +65,27 @@ def updateSpeedometer(screen, car):
     else:
         gear_text = font.render("Gear: unknown", True, BLACK)
 
-    screen.blit(gear_text, [300, 40])
+    display.blit(gear_text, [300, 40])
 
     speed_text = font.render("Speed: " + str(car.speed / 5), True, BLACK)
-    screen.blit(speed_text, [300, 60])
+    display.blit(speed_text, [300, 60])
 
 
-def updateOtherVehiclesInfo(screen, scenario, current_time_step):
+def updateOtherVehiclesInfo(display, table, current_time_step):
     font = pygame.font.SysFont('Calibri', 20, True, False)
 
     start_y = 100  # 정보를 출력할 y 시작 위치
     spacing = 30   # 차량 하나당 출력 간격
 
-    for idx, obstacle in enumerate(scenario.dynamic_obstacles):
-        predicted_state = None
-
-        # prediction trajectory 안에서 현재 time_step에 해당하는 상태 찾기
-        for state in obstacle.prediction.trajectory.state_list:
-            if state.time_step == current_time_step:
-                predicted_state = state
-                break
+    # 현재 time_step 의 모든 장애물 상태를 한 번에 가져오기
+    states, valid = table.at(current_time_step)
 
-        if predicted_state:
-            pos_x = predicted_state.position[0]
-            pos_y = predicted_state.position[1]
-            speed = predicted_state.velocity
+    for idx in np.flatnonzero(valid):
+        pos_x, pos_y, _, speed = states[idx]
 
-            info_text = f"ID {obstacle.obstacle_id}: ({int(pos_x)}, {int(pos_y)}), {int(speed)} m/s"
-            text_surface = font.render(info_text, True, BLUE)
-            screen.blit(text_surface, (50, start_y + idx * spacing))
+        info_text = f"ID {table.ids[idx]}: ({int(pos_x)}, {int(pos_y)}), {int(speed)} m/s"
+        text_surface = font.render(info_text, True, BLUE)
+        display.blit(text_surface, (50, start_y + idx * spacing))
 
 
 def replace_color(image, source_color, target_color, tolerance=120):
@@ -187,7 +184,7 @@ class Car2():
         self.rect = self.image.get_rect()
         self.rect.center = (self.pose[0], self.pose[1])
 
-        self.screen.blit(self.image, (self.pose[0] - self.rect.width/2, self.pose[1] - self.rect.height/2))
+        self.rect = self.screen.blit(self.image, (self.pose[0] - self.rect.width/2, self.pose[1] - self.rect.height/2))
 
 # ===================================
 # CommonRoad + Pygame 통합
@@ -203,6 +200,7 @@ scenario, planning_problem_set = CommonRoadFileReader(file_path).open()
 # 최대 타임스텝 계산
 max_time_step = max([obs.prediction.final_time_step for obs in scenario.dynamic_obstacles]) if scenario.dynamic_obstacles else 50
 # max_time_step = 100
+obstacle_table = ObstacleStateTable.from_scenario(scenario)
 
 # pygame 초기화
 pygame.init()
@@ -210,6 +208,10 @@ screen = pygame.display.set_mode((3200, 1600))
 pygame.display.set_caption('CommonRoad + Car Driving')
 clock = pygame.time.Clock()
 
+# 지도는 한 번만 렌더링, 장애물/차량/텍스트는 바뀐 영역만 갱신
+background, view = render_static_map(scenario, planning_problem_set, (3200, 1600), figsize=(40, 20))
+display = DisplayManager(screen, background)
+
 # Car2 생성
 car = Car2(color=(0, 255, 0), x=1400, y=1100, screen=screen)
 car.constant_speed = True
@@ -219,6 +221,9 @@ car.angle = - math.radians(70)  # 위쪽 방향
 # 시뮬레이션 시간 관리
 current_time_step = 0
 
+# 키 입력은 별도 스레드에서 polling (화면 좌표계라 왼쪽 키가 turn(-1))
+poller = InputPoller(KeyboardSource(accel_step=1, turn_step=-1), rate=60).start()
+
 running = True
 while running:
     dt = clock.tick(30) / 1000  # 프레임 시간 (초)
@@ -228,49 +233,22 @@ while running:
             running = False
 
     # 키 입력 처리
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_UP]:
-        car.accelerate(1)
-    if keys[pygame.K_DOWN]:
-        car.accelerate(-1)
-    if keys[pygame.K_LEFT]:
-        car.turn(-1)
-    if keys[pygame.K_RIGHT]:
-        car.turn(1)
-
-    # ------ CommonRoad 지도 + Dynamic Obstacles 갱신 ------
-    fig, ax = plt.subplots(figsize=(40, 20))
-    renderer = MPRenderer(ax=ax)
-    renderer.draw_params.show_labels = False
-    renderer.draw_params.time_begin = current_time_step
-    renderer.draw_params.time_end = current_time_step
-    scenario.draw(renderer)
-    planning_problem_set.draw(renderer)
-    renderer.render()
-
-    canvas = FigureCanvas(fig)
-    canvas.draw()
-    renderer_backend = canvas.get_renderer()
-    raw_data = renderer_backend.buffer_rgba()
-    size = canvas.get_width_height()
-    background = pygame.image.frombuffer(raw_data, size, "RGBA")
-    background = pygame.transform.scale(background, (3200, 1600))
-
-    plt.close(fig)
-
-    # ------------------------------------------------------
+    apply_command(car, *poller.latest())
 
     # 화면 그리기
-    screen.blit(background, (0, 0))
+    display.begin_frame()
+    draw_dynamic_obstacles(display, view, obstacle_table, None, current_time_step)
     car.update(dt)
-    updateSpeedometer(screen, car)  # <<<<<<<<<<<<<<<<<<<<<< 추가
-    updateOtherVehiclesInfo(screen, scenario, current_time_step)  # <<<<<< 다른 차들 정보 추가
+    display.mark(car.rect)
+    updateSpeedometer(display, car)  # <<<<<<<<<<<<<<<<<<<<<< 추가
+    updateOtherVehiclesInfo(display, obstacle_table, current_time_step)  # <<<<<< 다른 차들 정보 추가
 
-    pygame.display.flip()
+    display.present()
 
     # 타임스텝 업데이트
     current_time_step += 1
     if current_time_step >= max_time_step:
         current_time_step = max_time_step
 
+poller.stop()
 pygame.quit()
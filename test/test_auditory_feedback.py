@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from auditory_feedback import SAMPLE_RATE, AuditoryFeedback, NullAudioOutput, ToneBank, mix_buffers, synthesize_tone
+
+
+def test_tone_bank_synthesis():
+    specs = {'mono': (440, 0.1, 0.5, 0.0), 'left': (880, 0.05, 1.0, -1.0)}
+    bank = ToneBank(specs)
+    mono, left = bank['mono'], bank['left']
+    assert mono.dtype == np.int16 and mono.shape == (int(SAMPLE_RATE * 0.1), 2)
+    np.testing.assert_array_equal(mono[:, 0], mono[:, 1])
+    assert abs(np.abs(mono).max() - 0.5 * 32767) < 0.01 * 32767
+    # fade-in / fade-out: 양 끝 샘플은 0
+    assert mono[0, 0] == 0 and mono[-1, 0] == 0
+    # pan -1 이면 오른쪽 채널은 무음
+    assert np.abs(left[:, 1]).max() == 0 and np.abs(left[:, 0]).max() > 30000
+    assert 'mono' in bank and 'missing' not in bank
+
+
+def test_mix_buffers_clips_to_int16():
+    loud = synthesize_tone(440, 0.05, 1.0)
+    mixed = mix_buffers([loud, loud, synthesize_tone(440, 0.02, 1.0)])
+    assert mixed.shape == loud.shape and mixed.dtype == np.int16
+    assert mixed.max() == 32767 and mixed.min() == -32768
+
+
+def test_bounded_queue_drops_instead_of_blocking():
+    feedback = AuditoryFeedback(output=NullAudioOutput(), queue_size=3, cooldown={})
+    # worker 를 시작하지 않았으므로 큐는 비워지지 않는다
+    results = [feedback.cue('proximity_far') for _ in range(5)]
+    assert results == [True, True, True, False, False]
+    assert feedback.dropped == 2 and feedback.queue.qsize() == 3
+
+
+def test_cooldown_and_queue_share_one_clock():
+    clock = iter(np.arange(0.0, 100.0, 0.1)).__next__
+    output = NullAudioOutput(clock=clock)
+    feedback = AuditoryFeedback(output=output, clock=clock)
+    assert feedback.cue('proximity_far', now=1.0)
+    assert not feedback.cue('proximity_far', now=1.5)  # cooldown 0.6 s
+    assert feedback.cue('proximity_far', now=1.6)
+    # 큐에 쌓인 timestamp 는 cooldown 에 쓴 값과 같다
+    assert [t for _, t in list(feedback.queue.queue)] == [1.0, 1.6]
+    feedback.reset()
+    assert feedback.cue('proximity_far', now=1.7)
+
+
+def test_worker_plays_mixed_cues():
+    output = NullAudioOutput()
+    feedback = AuditoryFeedback(output=output).start()
+    try:
+        assert feedback.on_proximity(2.0)
+        assert feedback.on_lane_departure(-2.5)
+        assert not feedback.on_lane_departure(1.0)
+        deadline = time.perf_counter() + 2.0
+        while sum(len(names) for _, _, names, _ in output.events()) < 2 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+    finally:
+        feedback.stop()
+    played = sorted(name for _, _, names, _ in output.events() for name in names)
+    assert played == ['lane_departure_right', 'proximity_critical']
+    assert all(latency >= 0 for latency in output.latencies())
@@ -0,0 +1,71 @@
+import pygame
+import pytest
+
+from display_manager import DisplayManager, merge_rects
+
+
+def test_merge_rects_unions_overlaps_transitively():
+    rects = [(0, 0, 10, 10), (50, 50, 5, 5), (8, 8, 10, 10), (17, 17, 4, 4), (0, 0, 0, 10), (100, 0, 1, 1)]
+    merged = merge_rects(rects)
+    assert sorted(map(tuple, merged)) == [(0, 0, 21, 21), (50, 50, 5, 5), (100, 0, 1, 1)]
+    # 결과끼리는 겹치지 않는다
+    for i, a in enumerate(merged):
+        assert a.collidelist(merged[i + 1:]) == -1
+
+
+def test_merge_rects_keeps_touching_rects_apart():
+    # 모서리만 닿는 rect 는 겹치지 않으므로 합치지 않는다
+    assert len(merge_rects([(0, 0, 10, 10), (10, 0, 10, 10)])) == 2
+
+
+@pytest.fixture
+def pushed(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pygame.display, 'flip', lambda: calls.append('flip'))
+    monkeypatch.setattr(pygame.display, 'update', lambda rects: calls.append(list(rects)))
+    return calls
+
+
+def test_present_updates_dirty_rects_and_falls_back_to_flip(pushed):
+    display = DisplayManager(pygame.Surface((100, 100)), full_update_ratio=0.5)
+    # 첫 프레임은 배경 전체를 그리므로 flip
+    display.begin_frame()
+    display.mark((0, 0, 10, 10))
+    display.present()
+    assert pushed[-1] == 'flip' and display.pixels_pushed == 100 * 100
+
+    # 이번 프레임 영역 + 지난 프레임 영역 (지워야 하므로) 만 update
+    display.begin_frame()
+    display.mark((20, 20, 10, 10))
+    display.present()
+    assert sorted(map(tuple, pushed[-1])) == [(0, 0, 10, 10), (20, 20, 10, 10)]
+    assert display.pixels_pushed == 200
+
+    # 바뀐 면적이 화면의 절반을 넘으면 flip
+    display.begin_frame()
+    display.mark((0, 0, 100, 60))
+    display.present()
+    assert pushed[-1] == 'flip' and display.pixels_pushed == 100 * 100
+
+    # 화면 밖은 잘라서 등록한다
+    display.begin_frame()
+    assert display.mark((90, 90, 50, 50)) == pygame.Rect(90, 90, 10, 10)
+    display.present()
+    assert pushed[-1] == 'flip'  # 지난 프레임의 (0, 0, 100, 60) 을 지워야 하므로 여전히 큼
+    display.begin_frame()
+    display.present()
+    assert pushed[-1] == [pygame.Rect(90, 90, 10, 10)]
+
+
+def test_begin_frame_restores_background_under_previous_rects(pushed):
+    background = pygame.Surface((40, 40))
+    background.fill((0, 0, 255))
+    display = DisplayManager(pygame.Surface((40, 40)), background=background)
+    display.begin_frame()
+    display.present()
+    display.begin_frame()
+    display.mark(display.screen.fill((255, 0, 0), (5, 5, 10, 10)))
+    display.present()
+    assert display.screen.get_at((10, 10))[:3] == (255, 0, 0)
+    display.begin_frame()
+    assert display.screen.get_at((10, 10))[:3] == (0, 0, 255)
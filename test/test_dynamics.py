@@ -0,0 +1,89 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from dynamics import ArcDynamics, EulerDynamics, RK4Dynamics
+
+from conftest import load_root_main
+
+
+def make_car(speed=8.0, steering_angle=0.4, angle=0.3, constant_speed=True):
+    return SimpleNamespace(pose=[1.0, -2.0], vel=[0.0, 0.0], angle=angle, speed=speed,
+                           steering_angle=steering_angle, constant_speed=constant_speed, speed_dampening=0.1)
+
+
+def closed_form(car, t, steer_ratio=20):
+    """speed / steering 일정 -> 반지름 speed / yaw_rate 인 원."""
+    yaw_rate = car.steering_angle * car.speed / steer_ratio
+    angle = car.angle + yaw_rate * t
+    radius = car.speed / yaw_rate
+    return (car.pose[0] + radius * (math.sin(angle) - math.sin(car.angle)),
+            car.pose[1] - radius * (math.cos(angle) - math.cos(car.angle)), angle)
+
+
+def state(car):
+    return np.array([car.pose[0], car.pose[1], car.angle, car.speed])
+
+
+@pytest.mark.parametrize('steering_angle', [0.4, -1.3])
+def test_arc_matches_closed_form_circle(steering_angle):
+    start = make_car(steering_angle=steering_angle)
+    car = make_car(steering_angle=steering_angle)
+    dynamics = ArcDynamics(max_step=0.05)
+    for _ in range(40):
+        dynamics.step(car, 0.1)
+    np.testing.assert_allclose((car.pose[0], car.pose[1], car.angle), closed_form(start, 4.0), atol=1e-9)
+    np.testing.assert_allclose(car.vel, (8.0 * math.cos(car.angle), 8.0 * math.sin(car.angle)))
+
+
+def test_rk4_converges_to_arc():
+    reference = make_car()
+    ArcDynamics().step(reference, 2.0)
+    errors = []
+    for max_step in (0.2, 0.1, 0.05):
+        car = make_car()
+        RK4Dynamics(max_step=max_step).step(car, 2.0)
+        errors.append(np.abs(state(car) - state(reference)).max())
+    # 4 차 방법: step 을 반으로 줄이면 오차는 약 1/16
+    assert errors[-1] < 1e-7
+    for coarse, fine in zip(errors, errors[1:]):
+        assert 10 < coarse / fine < 20
+    # Euler 는 1 차라서 같은 step 에서 훨씬 부정확하다
+    euler = make_car()
+    EulerDynamics(max_step=0.05).step(euler, 2.0)
+    assert np.abs(state(euler) - state(reference)).max() > 1000 * errors[-1]
+
+
+@pytest.mark.parametrize('dynamics', [EulerDynamics(max_step=0.01), RK4Dynamics(max_step=0.01),
+                                      ArcDynamics(max_step=0.01)], ids=lambda d: type(d).__name__)
+def test_result_independent_of_frame_splitting(dynamics):
+    """같은 substep 으로 나뉘면 프레임을 어떻게 자르든 (0.1 한 번 vs 0.01 열 번) 결과가 같다."""
+    whole = make_car(constant_speed=False)
+    dynamics.step(whole, 0.1)
+    split = make_car(constant_speed=False)
+    for _ in range(10):
+        dynamics.step(split, 0.01)
+    np.testing.assert_allclose(state(split), state(whole), rtol=1e-12, atol=1e-12)
+
+
+def test_arc_is_exact_for_any_splitting():
+    whole = make_car()
+    ArcDynamics(max_step=1 / 60).step(whole, 1.0)
+    uneven = make_car()
+    for dt in (0.013, 0.2, 1 / 30, 0.4, 1.0 - 0.013 - 0.2 - 1 / 30 - 0.4):
+        ArcDynamics(max_step=1 / 60).step(uneven, dt)
+    np.testing.assert_allclose(state(uneven), state(whole), atol=1e-9)
+
+
+def test_car_holds_steering_through_substeps_then_dampens():
+    Car2 = load_root_main().Car2
+    car = Car2(color='green', x=1.0, y=-2.0, angle=0.3, speed=8.0, dynamics=ArcDynamics(max_step=0.01))
+    car.constant_speed = True
+    car.steering_angle = 0.4
+    expected = closed_form(make_car(), 0.1)
+    car.update(0.1)
+    # 10 개 substep 내내 같은 조향, 프레임이 끝난 뒤 한 번 복원
+    np.testing.assert_allclose((car.pose[0], car.pose[1], car.angle), expected, atol=1e-12)
+    assert car.steering_angle == 0
@@ -0,0 +1,50 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from haptic_feedback import HapticCommand, HapticFeedback, SimulatedHapticDevice, compute_haptic_command
+
+
+def test_ring_buffer_keeps_latest_samples():
+    device = SimulatedHapticDevice(capacity=4)
+    for k in range(10):
+        # 명령은 두 번에 한 번만 새로 만들어진다 -> latency 는 그때만 기록
+        device.send(HapticCommand(float(k), 0.0, created_at=float(k // 2)), sent_at=k + 0.25)
+    assert device.count == 10 and device.overwritten == 6
+    np.testing.assert_array_equal(device.recent(device.torque), [6, 7, 8, 9])
+    np.testing.assert_array_equal(device.recent(device.sent_at), [6.25, 7.25, 8.25, 9.25])
+    np.testing.assert_array_equal(np.isnan(device.recent(device.latency)), [False, True, False, True])
+    stats = device.stats(rate=1.0)
+    assert stats['samples'] == 10 and stats['overwritten'] == 6
+    assert stats['mean_rate'] == 1.0 and stats['jitter_max'] == 0.0
+    assert stats['latency_mean'] == 3.75  # (6.25 - 3 + 8.25 - 4) / 2
+
+
+def test_command_clamps_torque_and_scales_vibration():
+    car = SimpleNamespace(steering_angle=0.0)
+    command = compute_haptic_command(car, lane_offset=10.0, nearest_distance=6.25)
+    assert command.torque == -5.0
+    assert command.vibration == 0.5
+
+
+def test_dispatch_loop_runs_near_1khz_and_records_latency():
+    device = SimulatedHapticDevice()
+    haptic = HapticFeedback(device, rate=1000).start()
+    car = SimpleNamespace(steering_angle=0.1)
+    try:
+        start = time.perf_counter()
+        while time.perf_counter() - start < 0.5:
+            haptic.update(car, lane_offset=0.2)
+            time.sleep(0.01)
+    finally:
+        haptic.stop()
+    stats = haptic.stats()
+    # CI 부하를 감안해서 느슨하게: 목표 주기 근처에서 돌고, 밀린 주기는 overruns 로 센다
+    assert 700 < stats['mean_rate'] < 1100
+    assert stats['samples'] + stats['overruns'] >= 400
+    latency = device.recent(device.latency)
+    latency = latency[~np.isnan(latency)]
+    # update 한 번당 (거의) 한 번씩만 latency 가 기록된다
+    assert 20 <= latency.size <= 60
+    assert 0 <= stats['latency_mean'] < 0.01
@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+from dynamics import ArcDynamics
+from keyframes import Timeline, capture_car, capture_route
+from routing import Route
+from traffic import TrafficSimulation
+
+from conftest import load_root_main
+
+
+def capture(car, route, traffic):
+    return (capture_car(car), capture_route(route),
+            {name: getattr(traffic, name).copy() for name in ('lanelet', 's', 'v', 'next_lanelet', 'active')})
+
+
+def assert_same(a, b):
+    assert a[0] == b[0]
+    assert a[1] == b[1]
+    for name in a[2]:
+        np.testing.assert_array_equal(a[2][name], b[2][name])
+
+
+def test_seek_matches_full_replay(lanker):
+    """seek(k) 로 되돌린 상태 == 처음부터 k step 까지 진행한 상태 (ego, 경로, IDM 교통 모두)."""
+    _, planning_problem_set, graph = lanker
+    Car2, step_ego = load_root_main().Car2, load_root_main().step_ego
+    planning_problem = next(iter(planning_problem_set.planning_problem_dict.values()))
+    car = Car2(color='green', x=0, y=0, dynamics=ArcDynamics(max_step=1 / 60))
+    car.constant_speed = True
+    car.speed = 5
+    car.angle = math.radians(60)
+    route = Route.from_planning_problem(graph, planning_problem)
+    traffic = TrafficSimulation(graph, 40, dt=0.1, seed=1, time_step=-1)
+    timeline = Timeline(car, route, interval=10, extras=[traffic])
+
+    def step(dt, accelerate, turn):
+        step_ego(car, route, dt, accelerate, turn)
+        traffic.step(dt, egos=[(car.pose[0], car.pose[1], car.speed)])
+
+    rng = np.random.default_rng(0)
+    states = [capture(car, route, traffic)]  # states[k]: step k 를 시작하기 전
+    sim_time = 0.0
+    for k in range(120):
+        timeline.snapshot(k, sim_time)
+        dt, accelerate, turn = 1 / 30 + rng.uniform(-0.005, 0.005), rng.uniform(-1, 1), rng.uniform(-1, 1)
+        timeline.record(k, dt, accelerate, turn)
+        step(dt, accelerate, turn)
+        sim_time += dt
+        states.append(capture(car, route, traffic))
+
+    for target in (119, 3, 57, 0, 60, 101, 10):
+        seek_time = timeline.seek(target, step)
+        assert_same(capture(car, route, traffic), states[target])
+        assert math.isclose(seek_time, float(np.sum(timeline.dt[:target])), abs_tol=1e-9)
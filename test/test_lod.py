@@ -0,0 +1,99 @@
+import numpy as np
+
+from lod import LaneletLOD, douglas_peucker
+
+
+def line_distance(points, a, b):
+    ab = b - a
+    length = np.hypot(ab[0], ab[1])
+    inner = points - a
+    if length < 1e-12:
+        return np.hypot(inner[:, 0], inner[:, 1])
+    return np.abs(ab[0] * inner[:, 1] - ab[1] * inner[:, 0]) / length
+
+
+def reference_douglas_peucker(points, tolerance):
+    """재귀로 쓴 교과서 버전."""
+    if points.shape[0] < 3:
+        return [True] * points.shape[0]
+    distances = line_distance(points[1:-1], points[0], points[-1])
+    k = int(distances.argmax()) + 1
+    if distances[k - 1] <= tolerance:
+        return [True] + [False] * (points.shape[0] - 2) + [True]
+    return reference_douglas_peucker(points[:k + 1], tolerance)[:-1] + reference_douglas_peucker(points[k:], tolerance)
+
+
+def wiggly_line(rng, n):
+    t = np.linspace(0, 100, n)
+    return np.column_stack([t, 5 * np.sin(t / 7) + rng.normal(0, 0.3, n)])
+
+
+def test_douglas_peucker_matches_recursive_reference():
+    rng = np.random.default_rng(0)
+    for n in (3, 10, 200):
+        points = wiggly_line(rng, n)
+        for tolerance in (0.05, 0.5, 2.0, 50.0):
+            keep = douglas_peucker(points, tolerance)
+            np.testing.assert_array_equal(keep, reference_douglas_peucker(points, tolerance))
+
+
+def test_douglas_peucker_error_is_within_tolerance():
+    rng = np.random.default_rng(1)
+    points = wiggly_line(rng, 500)
+    for tolerance in (0.1, 1.0, 3.0):
+        kept = np.flatnonzero(douglas_peucker(points, tolerance))
+        assert kept[0] == 0 and kept[-1] == len(points) - 1
+        for first, last in zip(kept[:-1], kept[1:]):
+            inner = points[first + 1:last]
+            if len(inner):
+                assert line_distance(inner, points[first], points[last]).max() <= tolerance
+
+
+def test_douglas_peucker_edge_cases():
+    straight = np.column_stack([np.linspace(0, 10, 11), np.zeros(11)])
+    np.testing.assert_array_equal(np.flatnonzero(douglas_peucker(straight, 0.01)), [0, 10])
+    # tolerance 0 / 점 2 개 이하는 그대로
+    assert douglas_peucker(straight, 0.0).all()
+    assert douglas_peucker(straight[:2], 1.0).all()
+    # 닫힌 곡선 (양 끝이 같은 점) 은 끝점까지의 거리로 나눈다
+    angle = np.linspace(0, 2 * np.pi, 33)
+    loop = np.column_stack([np.cos(angle), np.sin(angle)])
+    keep = douglas_peucker(loop, 0.1)
+    assert 2 < keep.sum() < len(loop)
+
+
+def test_lanelet_lod_levels(lanker):
+    _, _, graph = lanker
+    lod = LaneletLOD.from_graph(graph)
+    assert len(lod) == len(graph)
+    # 0 단계는 원본
+    for (left, right), original_left, original_right in zip(lod.polylines(0, range(len(lod))), graph.lefts, graph.rights):
+        np.testing.assert_array_equal(left, original_left)
+        np.testing.assert_array_equal(right, original_right)
+    counts = [lod.vertex_count(level) for level in range(len(lod.tolerances))]
+    assert all(a >= b for a, b in zip(counts, counts[1:])) and counts[-1] < counts[0]
+    # 거친 단계도 원본의 점 중 일부이고 끝점은 남는다
+    coarse = len(lod.tolerances) - 1
+    for (left, _), original in zip(lod.polylines(coarse, range(len(lod))), graph.lefts):
+        np.testing.assert_array_equal(left[[0, -1]], original[[0, -1]])
+        assert all((original == point).all(axis=1).any() for point in left)
+
+
+def test_lanelet_lod_level_and_visibility(lanker):
+    _, _, graph = lanker
+    lod = LaneletLOD.from_graph(graph, pixel_tolerance=0.5)
+    assert lod.level_for_scale(1e6) == 0
+    assert lod.level_for_scale(1e-6) == len(lod.tolerances) - 1
+    levels = [lod.level_for_scale(scale) for scale in (0.01, 0.1, 1.0, 10.0, 100.0)]
+    assert levels == sorted(levels, reverse=True)
+    # 고른 단계의 오차는 pixel_tolerance px 이하
+    for scale in (0.05, 0.5, 5.0):
+        assert lod.tolerances[lod.level_for_scale(scale)] * scale <= lod.pixel_tolerance
+    x0, y0 = lod.bboxes[:, :2].min(axis=0)
+    x1, y1 = lod.bboxes[:, 2:].max(axis=0)
+    box = (x0, y0, (x0 + x1) / 2, (y0 + y1) / 2)
+    expected = [i for i, (l, r) in enumerate(zip(graph.lefts, graph.rights))
+                if np.concatenate([l, r])[:, 0].max() >= box[0] and np.concatenate([l, r])[:, 0].min() <= box[2]
+                and np.concatenate([l, r])[:, 1].max() >= box[1] and np.concatenate([l, r])[:, 1].min() <= box[3]]
+    np.testing.assert_array_equal(lod.visible(box), expected)
+    assert 0 < len(expected) < len(lod)
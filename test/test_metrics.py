@@ -0,0 +1,96 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+from metrics import TTC_BINS, RunLogWriter, run_kpis, run_table
+
+
+def write_log(path, steps=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    gears = ['D', 'R', 'STOP']
+    with RunLogWriter(str(path), scenario='synthetic', chunk_size=64) as log:
+        x = y = angle = 0.0
+        speed = 0.0
+        for k in range(steps):
+            speed = max(speed + rng.normal(0, 0.5), 0.0)
+            angle += rng.normal(0, 0.05)
+            x += speed * 0.1 * math.cos(angle)
+            y += speed * 0.1 * math.sin(angle)
+            car = SimpleNamespace(pose=(x, y), angle=angle, speed=speed, steering_angle=rng.normal(0, 5),
+                                  gear=gears[int(rng.integers(3))])
+            lane_offset = None if k % 13 == 0 else rng.normal(0, 0.5)
+            ttc = None if k % 5 else rng.uniform(0, 8)
+            log.append(k * 0.1, car, lane_offset, rng.uniform(1, 50), ttc, time_step=k)
+
+
+def assert_rows_equal(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        if isinstance(a[key], str):
+            assert a[key] == b[key]
+        else:
+            np.testing.assert_allclose(a[key], b[key], rtol=1e-9, atol=1e-12, err_msg=key)
+
+
+def test_kpis_independent_of_chunk_size(tmp_path):
+    """chunk 단위로 누적한 KPI 는 chunk 크기와 무관 (chunk 경계의 jerk / ttc 구간 포함)."""
+    path = tmp_path / 'run.log'
+    write_log(path)
+    reference = run_kpis(str(path), chunk_size=1 << 16)
+    for chunk_size in (1, 2, 7, 64, 999):
+        assert_rows_equal(run_kpis(str(path), chunk_size=chunk_size), reference)
+
+
+def test_parallel_table_matches_serial(tmp_path):
+    paths = []
+    for seed in range(3):
+        paths.append(str(tmp_path / f'run{seed}.log'))
+        write_log(paths[-1], steps=300, seed=seed)
+    serial = run_table(paths, workers=1, chunk_size=50)
+    parallel = run_table(paths, workers=2, chunk_size=50)
+    for a, b in zip(serial, parallel):
+        assert_rows_equal(a, b)
+
+
+def test_kpi_values_on_hand_built_log(tmp_path):
+    """작은 로그의 KPI 를 metrics 와 무관하게 (loop / 직접 계산) 구한 값과 비교."""
+    time = np.array([0.0, 0.1, 0.25, 0.35, 0.5, 0.3, 0.4, 0.6, 0.7])  # 0.5 -> 0.3 은 seek 로 되감음
+    speed = np.array([0.0, 1.0, 2.5, 3.0, 3.2, 3.2, 3.0, 2.0, 2.0])
+    distance = [None, 12.0, 8.0, 4.5, 3.0, 6.0, None, 2.25, 5.0]
+    ttc = [None, 9.0, 3.0, 1.5, 0.8, None, 1.9, 0.4, None]
+    lane = [0.1, -0.2, None, 0.5, 0.0, -0.4, 0.3, None, 0.2]
+    gears = ['STOP', 'D', 'D', 'D', 'D', 'D', 'R', 'R', 'STOP']
+    path = tmp_path / 'hand.log'
+    with RunLogWriter(str(path), scenario='hand', chunk_size=4) as log:
+        for k in range(time.size):
+            car = SimpleNamespace(pose=(k, 0.0), angle=0.0, speed=speed[k], steering_angle=0.0, gear=gears[k])
+            log.append(time[k], car, lane[k], distance[k], ttc[k], time_step=k)
+
+    # 각 샘플은 다음 샘플까지 유지 (되감은 구간은 0)
+    hold = [max(time[k + 1] - time[k], 0.0) for k in range(time.size - 1)]
+    jerks = []
+    for k in range(time.size - 2):
+        dt0, dt1 = time[k + 1] - time[k], time[k + 2] - time[k + 1]
+        if dt0 > 0 and dt1 > 0:
+            a0, a1 = (speed[k + 1] - speed[k]) / dt0, (speed[k + 2] - speed[k + 1]) / dt1
+            jerks.append((a1 - a0) / dt1)
+    jerks = np.array(jerks)
+    lanes = np.array([v for v in lane if v is not None])
+
+    for chunk_size in (1, 3, 100):
+        row = run_kpis(str(path), chunk_size=chunk_size)
+        assert row['steps'] == 9
+        assert math.isclose(row['duration'], sum(hold))
+        assert row['min_distance'] == 2.25
+        assert row['min_ttc'] == 0.4
+        # ttc < 2 인 샘플: 1.5 (0.15 s), 0.8 (되감음, 0 s), 1.9 (0.2 s), 0.4 (0.1 s)
+        assert math.isclose(row['ttc_warning_time'], 0.15 + 0.2 + 0.1)
+        assert math.isclose(row['lane_offset_rms'], math.sqrt(np.mean(lanes ** 2)))
+        assert jerks.size == row['jerk_count'] == 5
+        assert math.isclose(row['jerk_rms'], math.sqrt(np.mean(jerks ** 2)))
+        assert math.isclose(row['jerk_max'], np.abs(jerks).max())
+        assert math.isclose(row['time_STOP'], 0.1)
+        assert math.isclose(row['time_D'], 0.15 + 0.1 + 0.15 + 0.0 + 0.1)
+        assert math.isclose(row['time_R'], 0.2 + 0.1)
+        np.testing.assert_array_equal(row['ttc_histogram'], np.histogram([9.0, 3.0, 1.5, 0.8, 1.9, 0.4], TTC_BINS)[0])
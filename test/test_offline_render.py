@@ -0,0 +1,25 @@
+import sys
+
+from offline_render import render_run
+
+from conftest import load_root_main
+
+
+def test_parallel_gif_matches_serial(run_main, tmp_path, monkeypatch):
+    """여러 프로세스 / segment 로 나눠 그려도 한 프로세스에서 그린 GIF 와 byte 단위로 같다."""
+    # worker 의 'from main import Car2' 가 test/main.py 가 아닌 최상위 main.py 를 보도록 (fork 로 상속)
+    monkeypatch.setitem(sys.modules, 'main', load_root_main())
+    monkeypatch.setenv('SDL_VIDEODRIVER', 'dummy')
+    log = tmp_path / 'run.log'
+    run_main('--input', 'none', '--steps', 40, '--log', log)
+    serial = render_run(str(log), str(tmp_path / 'serial.gif'), size=(320, 240), workers=1, stride=2)
+    parallel = render_run(str(log), str(tmp_path / 'parallel.gif'), size=(320, 240), workers=2, stride=2,
+                          segments_per_worker=3)
+    assert serial['frames'] == parallel['frames'] == 20
+    assert parallel['segments'] > 1
+    assert (tmp_path / 'serial.gif').read_bytes() == (tmp_path / 'parallel.gif').read_bytes()
+
+    from PIL import Image
+
+    with Image.open(tmp_path / 'parallel.gif') as image:
+        assert image.n_frames == 20
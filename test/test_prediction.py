@@ -0,0 +1,90 @@
+import numpy as np
+
+from obstacle_states import ObstacleStateTable
+from prediction import (Prediction, TrajectoryPredictor, predicted_min_distance, rollout_ctrv, rollout_cv,
+                        wrap_angle)
+
+
+def circle_table(radius=20.0, speed=10.0, dt=0.1, steps=40):
+    """장애물 0: 반지름 radius 원 위를 반시계로 등속, 장애물 1: x 축 위 직진, 장애물 2: 10 step 부터 등장."""
+    w = speed / radius
+    t = np.arange(steps) * dt
+    states = np.zeros((3, steps, 4))
+    states[0, :, 0] = radius * np.sin(w * t)
+    states[0, :, 1] = radius * (1 - np.cos(w * t))
+    states[0, :, 2] = wrap_angle(w * t)
+    states[0, :, 3] = speed
+    states[1, :, 0] = speed * t
+    states[1, :, 3] = speed
+    states[2, :, 1] = 50.0
+    valid = np.ones((3, steps), dtype=bool)
+    valid[2, :10] = False
+    return ObstacleStateTable([1, 2, 3], states, valid, dt, [4.5] * 3, [2.0] * 3)
+
+
+def test_ctrv_follows_analytic_arc():
+    radius, speed, dt, steps = 20.0, 10.0, 0.05, 60
+    state = np.array([[3.0, -2.0, 0.7, speed]])
+    w = speed / radius
+    path = rollout_ctrv(state, np.array([w]), steps, dt)[0]
+    t = np.arange(steps + 1) * dt
+    # 중심은 진행 방향의 왼쪽 radius 거리
+    center = np.array([3.0, -2.0]) + radius * np.array([-np.sin(0.7), np.cos(0.7)])
+    np.testing.assert_allclose(np.hypot(*(path[:, :2] - center).T), radius, rtol=1e-12)
+    expected = center + radius * np.column_stack([np.sin(0.7 + w * t), -np.cos(0.7 + w * t)])
+    np.testing.assert_allclose(path[:, :2], expected, atol=1e-9)
+    np.testing.assert_allclose(path[:, 2], 0.7 + w * t)
+
+
+def test_ctrv_falls_back_to_cv_for_tiny_yaw_rate():
+    states = np.array([[0.0, 0.0, 0.3, 5.0], [1.0, 1.0, -2.0, 12.0]])
+    yaw_rates = np.array([1e-6, -5e-5])
+    ctrv = rollout_ctrv(states, yaw_rates, 20, 0.1)
+    cv = rollout_cv(states, 20, 0.1)
+    np.testing.assert_allclose(ctrv[..., :2], cv[..., :2])
+    # 문턱 바로 위에서도 원호 식은 CV 와 v * w * t^2 / 2 이내로 이어진다
+    w = 2e-4
+    near = rollout_ctrv(states, np.array([w, -w]), 20, 0.1)
+    np.testing.assert_allclose(near[..., :2], cv[..., :2], atol=0.5 * 12.0 * w * 2.0 ** 2)
+
+
+def test_predictor_estimates_yaw_rate_and_caches():
+    table = circle_table()
+    predictor = TrajectoryPredictor(table, horizon_steps=10, cache_size=2)
+    prediction = predictor.predict(5)
+    np.testing.assert_allclose(prediction.yaw_rate, [0.5, 0.0, 0.0], atol=1e-9)
+    np.testing.assert_array_equal(prediction.valid, [True, True, False])
+    # CTRV 예측은 실제 궤적 (step 5..15) 과 일치
+    np.testing.assert_allclose(prediction.ctrv[0, :, :2], table.states[0, 5:16, :2], atol=1e-9)
+    np.testing.assert_allclose(prediction.cv[1, :, :2], table.states[1, 5:16, :2], atol=1e-9)
+    # 처음 등장한 step 은 이전 상태가 없으므로 yaw rate 0
+    assert predictor.predict(10).yaw_rate[2] == 0.0
+
+    assert predictor.predict(5) is prediction
+    predictor.predict(6)  # cache_size=2 -> 가장 오래 안 쓴 10 이 빠진다
+    assert list(predictor._cache) == [5, 6]
+    table.states[0, 5, 0] += 1.0
+    assert predictor.predict(5) is prediction  # table 을 바꿔도 clear 전에는 캐시 값
+    predictor.clear()
+    refreshed = predictor.predict(5)
+    assert refreshed is not prediction
+    assert refreshed.ctrv[0, 0, 0] == prediction.ctrv[0, 0, 0] + 1.0
+
+
+def test_predicted_min_distance():
+    steps = 5
+    t = np.arange(steps + 1)
+    ego = np.column_stack([t, np.zeros(steps + 1), np.zeros(steps + 1)]).astype(float)
+    paths = np.zeros((3, steps + 1, 3))
+    paths[0, :, 0] = 10 - t   # 마주 오는 차: 거리 10, 8, 6, 4, 2, 0
+    paths[1, :, 1] = 3.0      # 옆 차선 정지: 가장 가까운 건 x = 0 인 step 0
+    paths[1, :, 0] = 0.0
+    paths[2, :, 0] = t        # invalid
+    prediction = Prediction(0, np.array([True, True, False]), paths, paths, np.zeros(3))
+    distance, step = predicted_min_distance(prediction, ego)
+    np.testing.assert_allclose(distance, [0.0, 3.0, np.inf])
+    np.testing.assert_array_equal(step[:2], [5, 0])
+    # ego 경로가 더 짧으면 그 길이까지만 본다
+    distance, step = predicted_min_distance(prediction, ego[:3], model='cv')
+    np.testing.assert_allclose(distance[:2], [6.0, 3.0])
+    assert step[0] == 2
@@ -0,0 +1,50 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from main_rev import load_scenario
+from routing import LaneletGraph, Route
+
+SCENARIO = os.path.join(ROOT, 'scenario', 'USA_Lanker-1_1_T-1.xml')
+
+
+def planned_route():
+    scenario, planning_problem_set = load_scenario(SCENARIO)
+    graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    planning_problem = next(iter(planning_problem_set.planning_problem_dict.values()))
+    route = Route.from_planning_problem(graph, planning_problem)
+    route.update(planning_problem.initial_state.position)
+    return graph, route
+
+
+def test_walk_along_route_does_not_replan():
+    """경로 lanelet 의 centerline 을 그대로 따라가면 (공유 경계, goal 끝 포함) 다시 계획하지 않는다."""
+    graph, route = planned_route()
+    planned = list(route.lanelets)
+    for i in planned:
+        for point in graph.centers[i]:
+            route.update(point)
+    assert route.replans == 1 and route.repairs == 0
+    assert route.lanelets == planned
+    assert route.reached_goal()
+
+
+def test_goal_stays_reached_past_goal():
+    graph, route = planned_route()
+    goal = route.lanelets[-1]
+    for point in graph.centers[goal]:
+        route.update(point)
+    replans = route.replans
+    # goal 을 지나 다음 lanelet 으로
+    for j in graph.successors[goal]:
+        for point in graph.centers[j][1:]:
+            route.update(point)
+    assert route.reached_goal()
+    assert route.replans == replans and route.lanelets is not None
+
+
+if __name__ == "__main__":
+    test_walk_along_route_does_not_replan()
+    test_goal_stays_reached_past_goal()
+    print('ok')
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from scenario_generator import PROFILES, generate_packed
+from shared_scenario import SharedScenarioStore
+
+
+def test_same_seed_same_scenario():
+    a, meta_a = generate_packed(seed=7, rows=2, cols=3, obstacles=100, num_steps=30, resolution=2.0)
+    b, meta_b = generate_packed(seed=7, rows=2, cols=3, obstacles=100, num_steps=30, resolution=2.0)
+    c, _ = generate_packed(seed=8, rows=2, cols=3, obstacles=100, num_steps=30, resolution=2.0)
+    assert meta_a == meta_b and a.keys() == b.keys()
+    for name in a:
+        np.testing.assert_array_equal(a[name], b[name], err_msg=name)
+    assert not np.array_equal(a['center_vertices'], c['center_vertices'])
+
+
+@pytest.mark.parametrize('profile', PROFILES)
+@pytest.mark.parametrize('segment_length', [0.5, 1.0, 25.0])
+def test_lanelets_are_usable(profile, segment_length):
+    arrays, meta = generate_packed(seed=1, rows=1, cols=2, lanes=2, segments=4, segment_length=segment_length,
+                                   profile=profile, obstacles=10, num_steps=10)
+    assert np.diff(arrays['center_offsets']).min() >= 2
+    with SharedScenarioStore.create(arrays, meta) as store:
+        graph = store.lanelet_graph()
+        assert len(graph) == 2 * 2 * 4
+        assert (graph.lengths > 0).all()
+        del graph  # 공유 메모리 view 는 close 전에 버린다
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        generate_packed(segment_length=0.0)
+    with pytest.raises(ValueError):
+        generate_packed(profile='spiral')
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+
+from conftest import ROOT
+from lod import LaneletLOD
+from scenario_render import GOAL_COLOR, STATIC_OBSTACLE_COLOR, CameraBackground, static_shapes
+
+SCREEN_SIZE = (320, 240)
+
+
+def test_camera_background_redraws_only_on_tile_or_scale_change(lanker):
+    scenario, planning_problem_set, graph = lanker
+    camera = CameraBackground(SCREEN_SIZE, LaneletLOD.from_graph(graph), tile=64)
+    scale = 4.0
+    # 격자 칸 한가운데에서 시작
+    center = np.round(np.array(graph.centers[0][0]) / (64 / scale)) * (64 / scale)
+    view, moved = camera.update(center, scale)
+    assert moved
+    # 격자 한 칸 (tile / scale m) 보다 작게 움직이면 그대로
+    _, moved = camera.update(center + 0.2 * 64 / scale, scale)
+    assert not moved
+    _, moved = camera.update(center + 1.0 * 64 / scale, scale)
+    assert moved
+    _, moved = camera.update(center + 1.0 * 64 / scale, scale * 1.25)
+    assert moved
+    camera.clear()
+    _, moved = camera.update(center + 1.0 * 64 / scale, scale * 1.25)
+    assert moved
+    # ego 는 화면 가운데에서 반 칸 이상 벗어나지 않는다
+    view, _ = camera.update(center, scale)
+    offset = view.to_screen(center) - np.array(SCREEN_SIZE) / 2
+    assert np.abs(offset).max() <= 32 + 1e-6
+
+
+def test_camera_background_draws_static_layers():
+    from main_rev import load_scenario
+    from routing import LaneletGraph
+
+    # 정적 장애물이 있는 scenario
+    scenario, planning_problem_set = load_scenario(os.path.join(ROOT, 'scenario', 'ZAM_Tutorial-1_2_T-1.xml'))
+    graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    shapes = static_shapes(scenario, planning_problem_set)
+    colors = {color for _, color, _ in shapes}
+    assert colors == {STATIC_OBSTACLE_COLOR, GOAL_COLOR}
+    camera = CameraBackground(SCREEN_SIZE, LaneletLOD.from_graph(graph), shapes=shapes)
+    for polygon, color, _ in shapes:
+        view, _ = camera.update(polygon.mean(axis=0), 10.0)
+        x, y = np.round(view.to_screen(polygon.mean(axis=0))).astype(int)
+        pixel = tuple(camera.surface.get_at((x, y)))[:3]
+        # goal 은 정적 장애물 위에 그린다
+        assert pixel in ((GOAL_COLOR,) if color == GOAL_COLOR else (color, GOAL_COLOR)), (pixel, color)
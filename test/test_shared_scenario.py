@@ -0,0 +1,101 @@
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scenario_generator import generate_packed
+from shared_scenario import SharedScenarioStore, load_packed, save_packed
+
+
+def attached_views(spec):
+    """worker 쪽: attach 후 graph / table 이 공유 메모리 view 인지 확인."""
+    store = SharedScenarioStore.attach(spec)
+    graph = store.lanelet_graph()
+    table = store.obstacle_table()
+    checks = {
+        'centers': np.shares_memory(graph.centers[0], store['center_vertices']),
+        'polygons': np.shares_memory(graph.polygons[-1], store['polygon_vertices']),
+        'paths': np.shares_memory(graph.paths[0].vertices, store['polygon_vertices']),
+        'bboxes': np.shares_memory(graph.bboxes, store['lanelet_bboxes']),
+        'states': np.shares_memory(table.states, store['obstacle_states']),
+        'locate': graph.locate(graph.centers[3][1]) is not None,
+    }
+    del graph, table
+    store.close()
+    return checks
+
+
+def check_attach(method):
+    arrays, meta = generate_packed(seed=3, rows=2, cols=2, obstacles=50, num_steps=20)
+    with SharedScenarioStore.create(arrays, meta) as store:
+        # with 문의 terminate() 는 SIGTERM 을 보내는데, 앞선 test 가 pygame.init() 한 뒤 fork 한 worker 는
+        # SDL 의 SIGTERM handler 를 물려받아 끝나지 않는다 -> close / join 으로 정상 종료시킨다
+        pool = multiprocessing.get_context(method).Pool(1)
+        try:
+            checks = pool.apply(attached_views, (store.spec,))
+        finally:
+            pool.close()
+            pool.join()
+    assert all(checks.values()), checks
+
+
+def test_attach_fork():
+    check_attach('fork')
+
+
+def test_attach_spawn():
+    check_attach('spawn')
+
+
+def test_close_refuses_while_views_are_alive():
+    arrays, meta = generate_packed(seed=4, rows=1, cols=1, obstacles=5, num_steps=5)
+    store = SharedScenarioStore.create(arrays, meta)
+    table = store.obstacle_table()
+    with pytest.raises(BufferError):
+        store.close()
+    # 이름은 이미 unlink 됐지만 남은 view 는 여전히 읽을 수 있다
+    with pytest.raises(FileNotFoundError):
+        SharedScenarioStore.attach(store.spec)
+    assert np.array_equal(table.states, arrays['obstacle_states'])
+    del table
+    store.close()
+    store.close()
+
+
+def test_unrelated_process_attach_does_not_unlink():
+    """multiprocessing 자식이 아닌 프로세스가 attach 했다 끝나도 (자기 resource tracker) segment 는 남는다."""
+    arrays, meta = generate_packed(seed=6, rows=1, cols=1, obstacles=5, num_steps=5)
+    with SharedScenarioStore.create(arrays, meta) as store:
+        script = ('import json, sys; from shared_scenario import SharedScenarioStore; '
+                  'store = SharedScenarioStore.attach(json.loads(sys.argv[1])); '
+                  'print(int(store["obstacle_ids"].sum())); store.close()')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, '-c', script, json.dumps(store.spec)], cwd=root,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert int(result.stdout) == int(arrays['obstacle_ids'].sum())
+        assert 'leaked' not in result.stderr
+        time.sleep(0.5)  # 자식의 tracker 가 정리를 끝낼 시간
+        other = SharedScenarioStore.attach(store.spec)
+        assert np.array_equal(other['obstacle_states'], arrays['obstacle_states'])
+        other.close()
+
+
+def test_packed_roundtrip(tmp_path):
+    arrays, meta = generate_packed(seed=5, rows=1, cols=2, obstacles=20, num_steps=10)
+    save_packed(tmp_path / 'scenario.npz', arrays, meta)
+    loaded, loaded_meta = load_packed(tmp_path / 'scenario.npz')
+    assert loaded_meta == meta
+    assert all(np.array_equal(arrays[name], loaded[name]) for name in arrays)
+
+
+if __name__ == "__main__":
+    for method in ('fork', 'spawn'):
+        check_attach(method)
+        print(method, 'ok')
@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pygame
+import pytest
+
+from conftest import ROOT
+from controller import stanley_steering
+from lane_following import CurvedRoad
+from sweep import ROAD_TYPES, SWEEPS, simulate_batch, simulate_car
+
+
+@pytest.fixture(scope='module')
+def screen():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    return pygame.display.set_mode((1400, 800))
+
+
+@pytest.mark.parametrize('road_type', ROAD_TYPES)
+def test_vectorized_sweep_matches_scalar_car(road_type, screen, monkeypatch):
+    """batch 안의 조합 하나하나가 car_model.Car2 + controller 로 몬 결과와 같다 (turn() 누적 오차만큼)."""
+    monkeypatch.chdir(ROOT)  # Car2 가 images/red_car.png 를 읽는다
+    road = CurvedRoad(1200, 0, 500, road_type)
+    for name, sweep, controller_class in SWEEPS:
+        params, cost, rms, finished = sweep(road, 3, 100, 0.1, 20)
+        for i in range(cost.size):
+            controller = controller_class(**{key: float(value[i]) for key, value in params.items()})
+            car_cost, car_rms, car_finished, _ = simulate_car(road, controller, screen, 100, 0.1, 20)
+            assert car_finished == finished[i], (name, i)
+            np.testing.assert_allclose([car_cost, car_rms], [cost[i], rms[i]], rtol=1e-6, err_msg=f'{name} {i}')
+
+
+def test_batch_rows_are_independent():
+    """한 조합의 결과는 같이 돌린 다른 조합과 무관하다 (n=1 로 따로 돌린 값과 같다)."""
+    road = CurvedRoad(1200, 0, 500, 'curved')
+    _, sweep, _ = SWEEPS[0]
+    params, cost, rms, finished = sweep(road, 4, 100, 0.1, 20)
+    for i in (0, 5, 15):
+        k, softening = params['k'][i], params['softening'][i]
+        single = simulate_batch(road, lambda x, y, h: stanley_steering(x, y, h, 100, road, k, softening), 1)
+        np.testing.assert_allclose([single[0][0], single[1][0]], [cost[i], rms[i]], rtol=1e-12)
+        assert single[2][0] == finished[i]
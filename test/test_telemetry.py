@@ -0,0 +1,41 @@
+import time
+
+import numpy as np
+import pytest
+
+from telemetry import (SAMPLE_DTYPE, TelemetryConsumer, TelemetryPublisher, event_mask, event_names, pack_samples,
+                       unpack_samples)
+
+
+def test_pack_roundtrip():
+    samples = [(1.0, 0.5, 5, event_mask('seek', 'replan'), 3.0, 0.016, 0.002, 4.0, np.inf, np.nan)]
+    sequence, records = unpack_samples(pack_samples(samples, 7))
+    assert sequence == 7 and records.dtype == SAMPLE_DTYPE
+    assert event_names(int(records['events'][0])) == ['seek', 'replan']
+    with pytest.raises(ValueError):
+        unpack_samples(pack_samples(samples, 7)[:-1])
+
+
+def test_udp_roundtrip_without_loss():
+    """받는 쪽이 따라올 수 있는 속도면 publish 한 sample 이 순서대로 빠짐없이 도착한다."""
+    n = 2000
+    with TelemetryConsumer('127.0.0.1:0') as consumer:
+        publisher = TelemetryPublisher(consumer.address, batch_size=64, max_delay=0.01, queue_size=n).start()
+        received = []
+        for step in range(n):
+            publisher.publish(step * 0.1, step, speed=float(step % 30), nearest_distance=None,
+                              events=event_mask('proximity') if step % 100 == 0 else 0)
+            if step % 256 == 255:
+                received.append(consumer.receive(timeout=0.5))
+        publisher.stop()
+        deadline = time.perf_counter() + 2.0
+        while sum(len(r) for r in received) < n and time.perf_counter() < deadline:
+            received.append(consumer.receive(timeout=0.2))
+
+    samples = np.concatenate(received)
+    assert publisher.stats()['dropped'] == 0 and publisher.stats()['send_errors'] == 0
+    assert consumer.lost_packets == 0 and consumer.bad_packets == 0
+    np.testing.assert_array_equal(samples['step'], np.arange(n))
+    np.testing.assert_allclose(samples['sim_time'], np.arange(n) * 0.1)
+    assert np.isinf(samples['nearest_distance']).all()
+    assert np.count_nonzero(samples['events']) == n // 100
@@ -0,0 +1,21 @@
+import numpy as np
+
+from input_sources import ScriptedSource
+from metrics import open_run_log
+from tiling import write_tiled_scenario
+
+
+def test_tiled_run_log_matches_full_table(lanker, run_main, tmp_path):
+    """ego 주변 tile 만 읽어도 (tile 교체 포함) 전체 장애물 table 로 돌린 것과 같은 run log."""
+    scenario, _, _ = lanker
+    write_tiled_scenario(scenario, str(tmp_path / 'tiles'), tile_size=50.0, time_chunk=10)
+    times = np.arange(0, 10, 0.5)
+    ScriptedSource(times, np.where(times < 1, 0.2, 0.0), 0.5 * np.sin(times)).save(str(tmp_path / 'drive.npz'))
+
+    common = ('--input', 'script', '--script', tmp_path / 'drive.npz', '--steps', 300)
+    run_main(*common, '--log', tmp_path / 'full.log')
+    run_main(*common, '--log', tmp_path / 'tiled.log', '--tiles', tmp_path / 'tiles')
+    _, full = open_run_log(str(tmp_path / 'full.log'))
+    _, tiled = open_run_log(str(tmp_path / 'tiled.log'))
+    assert full.shape[0] == 300 and np.isfinite(full['nearest_distance']).any()
+    assert full.tobytes() == tiled.tobytes()
@@ -0,0 +1,114 @@
+import numpy as np
+
+from traffic import TrafficSimulation, equilibrium_gap, equilibrium_speed, find_leaders
+
+
+def brute_force_leaders(lanelet, s, next_lanelet, lane_lengths, successor=None, horizon=np.inf):
+    n = lanelet.shape[0]
+    leader = np.full(n, -1, dtype=np.int64)
+    distance = np.full(n, np.inf)
+    horizon = np.broadcast_to(horizon, (n,))
+    remaining = lane_lengths[lanelet] - s
+    front = np.array([not ((lanelet == lanelet[i]) & (s > s[i])).any() for i in range(n)], dtype=bool)
+    for i in range(n):
+        ahead = np.flatnonzero((lanelet == lanelet[i]) & (s > s[i]))
+        if ahead.size:
+            j = ahead[s[ahead].argmin()]
+            leader[i], distance[i] = j, s[j] - s[i]
+            continue
+        if next_lanelet[i] < 0:
+            continue
+        # 같은 lanelet 으로 합류하면서 합류 지점에 더 가까운 맨 앞 차량
+        merging = np.flatnonzero(front & (next_lanelet == next_lanelet[i]) & (remaining < remaining[i]))
+        if merging.size:
+            j = merging[remaining[merging].argmax()]
+            leader[i], distance[i] = j, remaining[i] - remaining[j]
+            continue
+        current, travelled = next_lanelet[i], remaining[i]
+        while True:
+            on_current = np.flatnonzero(lanelet == current)
+            if on_current.size:
+                j = on_current[s[on_current].argmin()]
+                leader[i], distance[i] = j, travelled + s[j]
+                break
+            if successor is None:
+                break
+            travelled += lane_lengths[current]
+            current = successor[current]
+            if current < 0 or travelled >= horizon[i]:
+                break
+    return leader, distance
+
+
+def test_find_leaders_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for n, lanes in ((1, 1), (5, 3), (200, 20), (500, 7), (30, 60)):
+        lane_lengths = rng.uniform(20, 80, lanes)
+        lanelet = rng.integers(lanes, size=n)
+        s = rng.uniform(0, 1, n) * lane_lengths[lanelet]
+        next_lanelet = np.where(rng.random(n) < 0.2, -1, (lanelet + rng.integers(1, max(lanes, 2), n)) % lanes)
+        next_lanelet[next_lanelet == lanelet] = -1
+        # 같은 lanelet 의 차량은 같은 다음 lanelet 으로 (합류가 여러 군데 생기도록 lanelet 수보다 적게)
+        plan = rng.integers(max(lanes // 2, 1), size=lanes)
+        next_lanelet = np.where(next_lanelet >= 0, plan[lanelet], -1)
+        next_lanelet[next_lanelet == lanelet] = -1
+        successor = np.where(rng.random(lanes) < 0.3, -1, rng.integers(lanes, size=lanes))
+        horizon = rng.uniform(0, 200, n)
+        for args in ((), (successor, horizon)):
+            leader, distance = find_leaders(lanelet, s, next_lanelet, lane_lengths, *args)
+            expected_leader, expected_distance = brute_force_leaders(lanelet, s, next_lanelet, lane_lengths, *args)
+            np.testing.assert_array_equal(leader, expected_leader)
+            np.testing.assert_allclose(distance, expected_distance)
+
+
+def test_find_leaders_merge_and_lookahead():
+    # lanelet 0, 1 이 2 로 합류, 2 -> 3 (빈 lanelet) -> 4
+    lane_lengths = np.array([50.0, 50.0, 30.0, 10.0, 40.0])
+    successor = np.array([2, 2, 3, 4, -1])
+    lanelet = np.array([0, 1, 2, 4])
+    s = np.array([40.0, 46.0, 5.0, 3.0])
+    next_lanelet = np.array([2, 2, 3, -1])
+    leader, distance = find_leaders(lanelet, s, next_lanelet, lane_lengths, successor)
+    # 0 번은 합류 지점에 더 가까운 1 번을, 1 번은 2 에 이미 들어간 차량을 본다
+    np.testing.assert_array_equal(leader, [1, 2, 3, -1])
+    np.testing.assert_allclose(distance, [6.0, 9.0, 25.0 + 10.0 + 3.0, np.inf])
+    # horizon 보다 멀면 보지 않는다
+    leader, _ = find_leaders(lanelet, s, next_lanelet, lane_lengths, successor, horizon=30.0)
+    np.testing.assert_array_equal(leader, [1, 2, -1, -1])
+
+
+def test_equilibrium_speed_inverts_gap():
+    v0 = np.array([10.0, 13.9, 20.0])
+    v = np.array([1.0, 7.0, 19.0])
+    gap = equilibrium_gap(v, v0, 1.5, 2.0)
+    np.testing.assert_allclose(equilibrium_speed(gap, v0, 1.5, 2.0), v, rtol=1e-6)
+
+
+def test_spawn_reports_cap_and_starts_in_equilibrium(lanker):
+    _, _, graph = lanker
+    traffic = TrafficSimulation(graph, 2000, seed=0)
+    assert traffic.requested == 2000 and 0 < len(traffic) < 2000
+    acceleration = traffic.step()
+    # 평형 간격으로 배치했으므로 첫 step 에 급제동하는 차량이 없다
+    assert acceleration.min() > -traffic.params['b'].max()
+
+
+def test_advance_keeps_fixed_step_and_brackets_clock(lanker):
+    _, _, graph = lanker
+    traffic = TrafficSimulation(graph, 100, seed=1, dt=0.1)
+    rng = np.random.default_rng(2)
+    t = 0.0
+    for frame_dt in rng.uniform(0.005, 0.35, 200):
+        traffic.advance(frame_dt)
+        t += frame_dt
+        clock = traffic.clock()
+        assert traffic.time_step - 1 <= clock <= traffic.time_step
+        assert abs(clock - t / traffic.dt) < 1e-6
+    # frame 간격과 무관하게 고정 dt step 을 같은 횟수 진행한 것과 같다
+    fixed = TrafficSimulation(graph, 100, seed=1, dt=0.1)
+    for _ in range(traffic.time_step):
+        fixed.step()
+    states, valid = traffic.at(traffic.time_step)
+    expected_states, expected_valid = fixed.at(fixed.time_step)
+    np.testing.assert_array_equal(valid, expected_valid)
+    np.testing.assert_allclose(states, expected_states)
@@ -0,0 +1,68 @@
+import numpy as np
+import pygame
+
+from display_manager import DisplayManager
+from visual_feedback import PATH_COLOR, WARNING_COLORS, View, VisualFeedbackLayer, ribbon_polygon
+
+SCREEN_SIZE = (320, 240)
+
+
+def reference_frame(view, positions, distances, paths):
+    """sprite 캐시 이전처럼 요소마다 새 SRCALPHA surface 를 만들어 그린 화면."""
+    screen = pygame.Surface(SCREEN_SIZE)
+    for (px, py), distance in zip(view.to_screen(positions), distances):
+        color = next((c for limit, c in WARNING_COLORS if distance <= limit), None)
+        if color is None:
+            continue
+        radius = max(int(view.scale * 2.5), 4)
+        surface = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+        screen.blit(surface, (int(px) - radius, int(py) - radius))
+    for path, width in paths:
+        polygon = view.to_screen(ribbon_polygon(path, width))
+        x0, y0 = np.floor(polygon.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(polygon.max(axis=0)).astype(int)
+        surface = pygame.Surface((max(x1 - x0, 1), max(y1 - y0, 1)), pygame.SRCALPHA)
+        pygame.draw.polygon(surface, PATH_COLOR, (polygon - (x0, y0)).tolist())
+        screen.blit(surface, (x0, y0))
+    return pygame.surfarray.array3d(screen)
+
+
+def straight_path(x, y, angle, n=10, step=1.0):
+    s = np.arange(n) * step
+    return np.column_stack([x + s * np.cos(angle), y + s * np.sin(angle), np.full(n, angle)])
+
+
+def test_cached_sprites_match_per_frame_surfaces():
+    view = View.centered((0, 0), 8.0, SCREEN_SIZE)
+    layer = VisualFeedbackLayer(SCREEN_SIZE)
+    display = DisplayManager(pygame.Surface(SCREEN_SIZE))
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        positions = rng.uniform(-15, 15, (6, 2))
+        distances = rng.uniform(0, 12, 6)
+        paths = [(straight_path(*rng.uniform(-10, 10, 2), rng.uniform(-np.pi, np.pi), step=s), w)
+                 for s, w in ((1.0, 2.0), (2.0, 1.8), (0.5, 3.0))]
+        display.begin_frame()
+        display.screen.fill((0, 0, 0))
+        layer.add_warning_zones(view, positions, distances)
+        for path, width in paths:
+            layer.add_predicted_path(view, path, width)
+        layer.draw(display)
+        np.testing.assert_array_equal(pygame.surfarray.array3d(display.screen),
+                                      reference_frame(view, positions, distances, paths))
+    # 반지름이 같으므로 경고 sprite 는 색 가짓수만큼만 만들어진다
+    assert len(layer._warning_sprites) <= len(WARNING_COLORS)
+
+
+def test_lane_departure_edge_is_cached():
+    layer = VisualFeedbackLayer(SCREEN_SIZE, edge_width=20)
+    display = DisplayManager(pygame.Surface(SCREEN_SIZE))
+    layer.add_lane_departure(0.5)
+    assert layer.draw(display) == []
+    layer.add_lane_departure(-2.0)
+    first = layer.draw(display)
+    layer.add_lane_departure(-3.0)
+    second = layer.draw(display)
+    assert first == second == [pygame.Rect(SCREEN_SIZE[0] - 20, 0, 20, SCREEN_SIZE[1])]
+    assert list(layer._edge_surfaces) == ['right']
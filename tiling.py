@@ -0,0 +1,276 @@
+import json
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from obstacle_states import ObstacleStateTable
+from routing import LaneletGraph
+from shared_scenario import concat_vertices, split_vertices
+
+INDEX_FILE = 'index.json'
+
+
+def tile_of(point, tile_size):
+    return int(math.floor(point[0] / tile_size)), int(math.floor(point[1] / tile_size))
+
+
+def lanelet_tile_file(key):
+    return 'lanelets_%d_%d.npz' % key
+
+
+def obstacle_tile_file(key):
+    return 'obstacles_%d_%d_%d.npz' % key
+
+
+# ===================================
+# scenario -> tile 디렉터리
+# ===================================
+def write_tiled_scenario(scenario, directory, tile_size=100.0, time_chunk=50):
+    """lanelet 은 bbox 가 겹치는 모든 공간 tile 에, 장애물 state 는 (그 step 의 위치 tile, step // time_chunk) 에 나눠 저장."""
+    os.makedirs(directory, exist_ok=True)
+    graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    table = ObstacleStateTable.from_scenario(scenario)
+
+    # ----- lanelet tile -----
+    members = {}
+    for i, (x0, y0, x1, y1) in enumerate(graph.bboxes):
+        (tx0, ty0), (tx1, ty1) = tile_of((x0, y0), tile_size), tile_of((x1, y1), tile_size)
+        for tx in range(tx0, tx1 + 1):
+            for ty in range(ty0, ty1 + 1):
+                members.setdefault((tx, ty), []).append(i)
+
+    for key, indices in members.items():
+        successors = [np.array([graph.ids[j] for j in graph.successors[i]], dtype=np.int64) for i in indices]
+        successor_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        successor_offsets[1:] = np.cumsum([len(s) for s in successors])
+        centers, center_offsets = concat_vertices([graph.centers[i] for i in indices])
+        lefts, left_offsets = concat_vertices([graph.lefts[i] for i in indices])
+        rights, right_offsets = concat_vertices([graph.rights[i] for i in indices])
+        np.savez(os.path.join(directory, lanelet_tile_file(key)),
+                 ids=np.array([graph.ids[i] for i in indices], dtype=np.int64),
+                 successors=np.concatenate(successors), successor_offsets=successor_offsets,
+                 adj_left=np.array([-1 if graph.adj_left[i] is None else graph.ids[graph.adj_left[i]] for i in indices], dtype=np.int64),
+                 adj_right=np.array([-1 if graph.adj_right[i] is None else graph.ids[graph.adj_right[i]] for i in indices], dtype=np.int64),
+                 center_vertices=centers, center_offsets=center_offsets,
+                 left_vertices=lefts, left_offsets=left_offsets,
+                 right_vertices=rights, right_offsets=right_offsets)
+
+    # ----- 장애물 (공간 x 시간) tile -----
+    obstacle, step = np.nonzero(table.valid)
+    states = table.states[obstacle, step]
+    tx = np.floor(states[:, 0] / tile_size).astype(np.int64)
+    ty = np.floor(states[:, 1] / tile_size).astype(np.int64)
+    chunk = step // time_chunk
+    keys = np.column_stack([tx, ty, chunk])
+    obstacle_keys = []
+    if keys.shape[0]:
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for k, key in enumerate(map(tuple, unique.tolist())):
+            rows = np.flatnonzero(inverse == k)
+            rows = rows[np.argsort(step[rows], kind='stable')]
+            np.savez(os.path.join(directory, obstacle_tile_file(key)),
+                     ids=table.ids[obstacle[rows]], time_steps=step[rows].astype(np.int64),
+                     states=states[rows], lengths=table.lengths[obstacle[rows]], widths=table.widths[obstacle[rows]])
+            obstacle_keys.append(key)
+
+    index = {
+        'tile_size': tile_size,
+        'time_chunk': time_chunk,
+        'dt': scenario.dt,
+        'num_steps': table.num_steps,
+        'lanelet_tiles': sorted(members),
+        'obstacle_tiles': sorted(obstacle_keys),
+    }
+    with open(os.path.join(directory, INDEX_FILE), 'w') as f:
+        json.dump(index, f)
+    return index
+
+
+# ===================================
+# tile 을 필요할 때만 읽는 loader
+# ===================================
+class TiledScenario():
+    """update(pose, time_step) 로 pose 주변 tile 만 읽어 두고, max_* 를 넘으면 오래 안 쓴 tile 부터 버린다.
+
+    메모리는 지도 크기와 상관없이 max_lanelet_tiles + max_obstacle_tiles 개 tile 로 제한된다.
+    at() / ids / lengths / widths / dt 는 ObstacleStateTable 과 같게 쓸 수 있다
+    (tile 구성이 바뀌면 장애물 순서가 바뀌므로 version 을 보고 예측 cache 등을 비운다).
+    """
+
+    def __init__(self, directory, radius=None, max_lanelet_tiles=36, max_obstacle_tiles=72):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.tile_size = index['tile_size']
+        self.time_chunk = index['time_chunk']
+        self.dt = index['dt']
+        self.num_steps = index['num_steps']
+        self.available_lanelet_tiles = {tuple(key) for key in index['lanelet_tiles']}
+        self.available_obstacle_tiles = {tuple(key) for key in index['obstacle_tiles']}
+        self.radius = radius if radius is not None else self.tile_size
+        self.max_lanelet_tiles = max_lanelet_tiles
+        self.max_obstacle_tiles = max_obstacle_tiles
+
+        self.lanelet_tiles = OrderedDict()
+        self.obstacle_tiles = OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+        self.version = 0
+        self._graph = None
+        self._obstacles = None
+        self._at_cache = {}
+
+    # ----- tile 관리 -----
+    def _window(self, position):
+        (tx0, ty0) = tile_of((position[0] - self.radius, position[1] - self.radius), self.tile_size)
+        (tx1, ty1) = tile_of((position[0] + self.radius, position[1] + self.radius), self.tile_size)
+        return [(tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)]
+
+    def _touch(self, cache, key, available, filename, limit):
+        if key in cache:
+            cache.move_to_end(key)
+            return False
+        if key not in available:
+            return False
+        with np.load(os.path.join(self.directory, filename(key))) as data:
+            cache[key] = {name: data[name] for name in data.files}
+        self.loads += 1
+        while len(cache) > limit:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def update(self, position, time_step):
+        """position 주변 tile 과 time_step (과 yaw rate 추정용 직전 step) 의 장애물 chunk 를 준비. 바뀌었으면 True."""
+        window = self._window(position)
+        chunks = {max(time_step - 1, 0) // self.time_chunk, max(time_step, 0) // self.time_chunk}
+        lanelets_changed = False
+        obstacles_changed = False
+        for key in window:
+            lanelets_changed |= self._touch(self.lanelet_tiles, key, self.available_lanelet_tiles,
+                                            lanelet_tile_file, self.max_lanelet_tiles)
+            for chunk in sorted(chunks):
+                obstacles_changed |= self._touch(self.obstacle_tiles, key + (chunk,), self.available_obstacle_tiles,
+                                                 obstacle_tile_file, self.max_obstacle_tiles)
+        if lanelets_changed:
+            self._graph = None
+        if obstacles_changed:
+            self._obstacles = None
+            self._at_cache = {}
+        if lanelets_changed or obstacles_changed:
+            self.version += 1
+            return True
+        return False
+
+    @property
+    def loaded_bytes(self):
+        return sum(array.nbytes for cache in (self.lanelet_tiles, self.obstacle_tiles)
+                   for tile in cache.values() for array in tile.values())
+
+    # ----- lanelet -----
+    @property
+    def graph(self):
+        """읽어 둔 tile 의 lanelet 으로 만든 LaneletGraph (읽지 않은 lanelet 으로 가는 연결은 빠진다)."""
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
+
+    def _build_graph(self):
+        ids, successors, adj_left, adj_right, centers, lefts, rights = [], [], [], [], [], [], []
+        seen = set()
+        for tile in self.lanelet_tiles.values():
+            tile_successors = split_vertices(tile['successors'], tile['successor_offsets'])
+            tile_centers = split_vertices(tile['center_vertices'], tile['center_offsets'])
+            tile_lefts = split_vertices(tile['left_vertices'], tile['left_offsets'])
+            tile_rights = split_vertices(tile['right_vertices'], tile['right_offsets'])
+            for k, lanelet_id in enumerate(tile['ids'].tolist()):
+                if lanelet_id in seen:
+                    continue
+                seen.add(lanelet_id)
+                ids.append(lanelet_id)
+                successors.append(tile_successors[k].tolist())
+                adj_left.append(int(tile['adj_left'][k]))
+                adj_right.append(int(tile['adj_right'][k]))
+                centers.append(tile_centers[k])
+                lefts.append(tile_lefts[k])
+                rights.append(tile_rights[k])
+        index = {lanelet_id: i for i, lanelet_id in enumerate(ids)}
+        return LaneletGraph(
+            ids,
+            [[index[j] for j in s if j in index] for s in successors],
+            [index.get(j) for j in adj_left],
+            [index.get(j) for j in adj_right],
+            centers, lefts, rights,
+        )
+
+    # ----- 장애물 -----
+    def _obstacle_arrays(self):
+        if self._obstacles is None:
+            tiles = list(self.obstacle_tiles.values())
+            if tiles:
+                ids = np.concatenate([t['ids'] for t in tiles])
+                lengths = np.concatenate([t['lengths'] for t in tiles])
+                widths = np.concatenate([t['widths'] for t in tiles])
+                unique, first = np.unique(ids, return_index=True)
+                self._obstacles = (unique, lengths[first], widths[first])
+            else:
+                self._obstacles = (np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+        return self._obstacles
+
+    @property
+    def ids(self):
+        return self._obstacle_arrays()[0]
+
+    @property
+    def lengths(self):
+        return self._obstacle_arrays()[1]
+
+    @property
+    def widths(self):
+        return self._obstacle_arrays()[2]
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    def at(self, time_step):
+        """읽어 둔 tile 안의 장애물 (states (n, 4), valid (n,)). 행 순서는 self.ids."""
+        cached = self._at_cache.get(time_step)
+        if cached is not None:
+            return cached
+        ids = self.ids
+        states = np.zeros((len(ids), 4))
+        valid = np.zeros(len(ids), dtype=bool)
+        chunk = time_step // self.time_chunk
+        for key, tile in self.obstacle_tiles.items():
+            if key[2] != chunk:
+                continue
+            lo, hi = np.searchsorted(tile['time_steps'], [time_step, time_step + 1])
+            if lo == hi:
+                continue
+            rows = np.searchsorted(ids, tile['ids'][lo:hi])
+            states[rows] = tile['states'][lo:hi]
+            valid[rows] = True
+        if len(self._at_cache) > 4:
+            self._at_cache.clear()
+        self._at_cache[time_step] = (states, valid)
+        return states, valid
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from main_rev import load_scenario
+
+    parser = argparse.ArgumentParser(description='split a CommonRoad scenario into spatial/temporal tiles')
+    parser.add_argument('scenario')
+    parser.add_argument('output')
+    parser.add_argument('--tile', type=float, default=100.0, help='tile size (m)')
+    parser.add_argument('--chunk', type=int, default=50, help='time steps per obstacle chunk')
+    args = parser.parse_args()
+
+    scenario, _ = load_scenario(args.scenario)
+    index = write_tiled_scenario(scenario, args.output, args.tile, args.chunk)
+    print(f"{len(index['lanelet_tiles'])} lanelet tiles, {len(index['obstacle_tiles'])} obstacle tiles -> {args.output}")
@@ -0,0 +1,433 @@
+import numpy as np
+
+from obstacle_states import X, Y, ORIENTATION, VELOCITY
+
+# Intelligent Driver Model 기본값 (도시부 승용차, m / s 단위)
+IDM_DEFAULTS = {'v0': 13.9, 'T': 1.5, 'a': 1.0, 'b': 2.0, 's0': 2.0}
+IDM_DELTA = 4
+
+
+def equilibrium_gap(v, v0, T, s0):
+    """IDM 이 가속도 0 으로 속도 v 를 유지하는 앞차와의 간격 (범퍼 사이)."""
+    return (s0 + v * T) / np.sqrt(1 - (v / v0) ** IDM_DELTA)
+
+
+def equilibrium_speed(gap, v0, T, s0, iterations=40):
+    """equilibrium_gap 의 역 (gap 에 대해 단조 증가라 이분법)."""
+    gap = np.broadcast_to(np.asarray(gap, dtype=float), np.shape(v0))
+    lo, hi = np.zeros_like(gap), np.asarray(v0, dtype=float) * (1 - 1e-9)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        fits = equilibrium_gap(mid, v0, T, s0) <= gap
+        lo, hi = np.where(fits, mid, lo), np.where(fits, hi, mid)
+    return lo
+
+
+# ===================================
+# IDM / 선행 차량 찾기 (배열 단위)
+# ===================================
+def idm_acceleration(v, gap, dv, v0, T, a, b, s0, delta=IDM_DELTA):
+    """gap: 앞차와의 bumper 간 거리 (앞차가 없으면 inf), dv: v - v_leader."""
+    desired = s0 + np.maximum(0.0, v * T + v * dv / (2 * np.sqrt(a * b)))
+    return a * (1 - (v / v0) ** delta - (desired / np.maximum(gap, 1e-3)) ** 2)
+
+
+def find_leaders(lanelet, s, next_lanelet, lane_lengths, successor=None, horizon=np.inf):
+    """선행 차량과 중심 간 경로 거리.
+
+    - 같은 lanelet 에 앞차가 있으면 바로 앞 차량.
+    - lanelet 의 맨 앞 차량들은 같은 next_lanelet 으로 들어가는 것끼리 (합류) 합류 지점까지 남은 거리
+      순으로 한 줄로 세워, 바로 앞 차량을 본다. 줄의 맨 앞은 next_lanelet 의 첫 차량을 본다.
+    - next_lanelet 이 비어 있으면 successor (lanelet 마다 하나뿐인 다음 lanelet, 갈림길 / 끝은 -1) 를
+      따라가며 경로 거리 horizon (scalar 또는 차량별) 안의 첫 차량을 찾는다. 갈림길 너머는 보지 않는다.
+
+    (lanelet, s) 로 정렬한 배열 위에서 찾으므로 O(n log n) (+ 건너뛴 빈 lanelet 수만큼 반복).
+    반환: leader index (없으면 -1), 중심 간 경로 거리 (없으면 inf)
+    """
+    n = lanelet.shape[0]
+    leader = np.full(n, -1, dtype=np.int64)
+    distance = np.full(n, np.inf)
+    if n == 0:
+        return leader, distance
+    order = np.lexsort((s, lanelet))
+    sorted_lanelet, sorted_s = lanelet[order], s[order]
+
+    following = np.arange(1, n + 1)
+    same = np.zeros(n, dtype=bool)
+    same[:-1] = sorted_lanelet[1:] == sorted_lanelet[:-1]
+    sorted_leader = np.where(same, following, -1)
+    sorted_distance = np.where(same, sorted_s[np.minimum(following, n - 1)] - sorted_s, np.inf)
+
+    # 합류: 같은 next_lanelet 으로 가는 맨 앞 차량들을 남은 거리 순으로 줄 세운다
+    nxt = next_lanelet[order]
+    remaining = lane_lengths[sorted_lanelet] - sorted_s
+    queue = np.flatnonzero(~same & (nxt >= 0))
+    queue = queue[np.lexsort((remaining[queue], nxt[queue]))]
+    behind = np.zeros(queue.shape[0], dtype=bool)
+    behind[1:] = nxt[queue[1:]] == nxt[queue[:-1]]
+    rear, front = queue[1:][behind[1:]], queue[:-1][behind[1:]]
+    sorted_leader[rear] = front
+    sorted_distance[rear] = remaining[rear] - remaining[front]
+
+    # 줄의 맨 앞은 next_lanelet 부터 첫 차량이 나올 때까지 앞으로
+    pending = queue[~behind]
+    current = nxt[pending]
+    travelled = remaining[pending]
+    limit = np.broadcast_to(np.asarray(horizon, dtype=float), (n,))[order]
+    for _ in range(lane_lengths.shape[0]):
+        if pending.size == 0:
+            break
+        first = np.searchsorted(sorted_lanelet, current, side='left')
+        clipped = np.minimum(first, n - 1)
+        found = (first < n) & (sorted_lanelet[clipped] == current)
+        sorted_leader[pending[found]] = first[found]
+        sorted_distance[pending[found]] = travelled[found] + sorted_s[first[found]]
+        if successor is None:
+            break
+        travelled = travelled + lane_lengths[current]
+        current = successor[current]
+        keep = ~found & (current >= 0) & (travelled < limit[pending])
+        pending, current, travelled = pending[keep], current[keep], travelled[keep]
+
+    has_leader = sorted_leader >= 0
+    leader[order[has_leader]] = order[sorted_leader[has_leader]]
+    distance[order] = sorted_distance
+    return leader, distance
+
+
+# ===================================
+# centerline 좌표 <-> (lanelet, s)
+# ===================================
+class CenterlineIndex():
+    """모든 centerline 을 하나의 배열로 이어 붙여 (lanelet, s) -> (x, y, heading) 을 한 번에 계산."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        starts, directions, seg_lengths, seg_s, owner = [], [], [], [], []
+        self.base = np.zeros(len(graph))
+        self.first_segment = np.zeros(len(graph), dtype=np.int64)
+        self.last_segment = np.zeros(len(graph), dtype=np.int64)
+        offset = 0.0
+        count = 0
+        for i, center in enumerate(graph.centers):
+            ab = np.diff(center, axis=0)
+            lengths = np.hypot(ab[:, 0], ab[:, 1])
+            keep = lengths > 1e-9
+            if not keep.any():
+                ab, lengths, keep = np.array([[1e-9, 0.0]]), np.array([1e-9]), np.array([True])
+                center = np.vstack([center[:1], center[:1]])
+            ab, lengths = ab[keep], lengths[keep]
+            cumulative = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+            starts.append(center[:-1][keep])
+            directions.append(ab / lengths[:, None])
+            seg_lengths.append(lengths)
+            seg_s.append(offset + cumulative)
+            owner.append(np.full(len(lengths), i))
+            self.base[i] = offset
+            self.first_segment[i] = count
+            count += len(lengths)
+            self.last_segment[i] = count - 1
+            # lanelet 사이에 간격을 두어 s 가 경계를 넘어도 다른 lanelet 으로 새지 않게
+            offset += lengths.sum() + 1.0
+        self.starts = np.concatenate(starts) if starts else np.zeros((0, 2))
+        self.directions = np.concatenate(directions) if directions else np.zeros((0, 2))
+        self.segment_s = np.concatenate(seg_s) if seg_s else np.zeros(0)
+        self.lengths = np.maximum(graph.lengths, 1e-3)
+
+    def pose(self, lanelet, s):
+        """(x, y, heading) 배열."""
+        segment = np.searchsorted(self.segment_s, self.base[lanelet] + s, side='right') - 1
+        segment = np.clip(segment, self.first_segment[lanelet], self.last_segment[lanelet])
+        local = self.base[lanelet] + s - self.segment_s[segment]
+        direction = self.directions[segment]
+        xy = self.starts[segment] + local[:, None] * direction
+        return xy[:, 0], xy[:, 1], np.arctan2(direction[:, 1], direction[:, 0])
+
+    def station(self, i, point):
+        """point 를 lanelet i 의 centerline 에 투영한 arc length."""
+        first, last = self.first_segment[i], self.last_segment[i] + 1
+        a, direction = self.starts[first:last], self.directions[first:last]
+        lengths = np.diff(np.append(self.segment_s[first:last], self.base[i] + self.lengths[i]))
+        t = np.clip(((np.asarray(point) - a) * direction).sum(axis=1), 0, lengths)
+        d2 = ((a + t[:, None] * direction - point) ** 2).sum(axis=1)
+        k = int(d2.argmin())
+        return self.segment_s[first + k] - self.base[i] + t[k]
+
+
+# ===================================
+# IDM 교통
+# ===================================
+class TrafficSimulation():
+    """lanelet centerline 을 따라 IDM 으로 달리는 차량들. ego 는 선행 차량 후보로만 들어간다.
+
+    at(time_step) / lengths / widths / dt 를 ObstacleStateTable 과 같게 제공하므로
+    draw_dynamic_obstacles, nearest_obstacles, TrajectoryPredictor 에 그대로 넘길 수 있다.
+    (at 은 현재와 직전 time step 만 보관)
+    """
+
+    def __init__(self, graph, n, dt=0.1, seed=None, params=None, v0_spread=0.2,
+                 length=4.5, width=2.0, respawn=True, time_step=0, start_speed=0.75):
+        """n 대를 요청해도 지도에 평형 간격으로 들어가는 만큼만 만든다 (len(self) < self.requested 로 확인)."""
+        self.graph = graph
+        self.centerlines = CenterlineIndex(graph)
+        self.dt = dt
+        self.respawn = respawn
+        self.rng = np.random.default_rng(seed)
+        self.time_step = time_step
+
+        self.successor_table, self.successor_count = self._successor_table(graph)
+        # 선행 차량을 찾을 때 빈 lanelet 너머로 따라갈 다음 lanelet (갈림길 / 끝은 -1)
+        self.only_successor = np.where(self.successor_count == 1, self.successor_table[:, 0], -1)
+        has_predecessor = np.zeros(len(graph), dtype=bool)
+        for successors in graph.successors:
+            has_predecessor[successors] = True
+        self.sources = np.flatnonzero(~has_predecessor) if (~has_predecessor).any() else np.arange(len(graph))
+
+        params = {**IDM_DEFAULTS, **(params or {})}
+        self.requested = n
+        # 처음 속도 (희망 속도의 start_speed 배) 의 IDM 평형 간격으로 배치해야 시작하자마자 막히지 않는다.
+        # 그 간격으로 n 대가 들어가지 않으면 n 대가 들어가는 가장 넓은 간격 (최소 jam 간격) 과 그 평형 속도로
+        spacing = self._spawn_spacing(n, length + equilibrium_gap(start_speed * params['v0'], params['v0'],
+                                                                  params['T'], params['s0']),
+                                      length + params['s0'] + 2.0)
+        lanelet, s = self._spawn_slots(n, spacing)
+        next_lanelet = self._choose_next(lanelet)
+        # 합류하는 lanelet 끝에서 slot 이 나란히 놓이면 뒤쪽 차량을 뺀다 (빼면 다른 간격은 넓어지기만 한다)
+        _, distance = find_leaders(lanelet, s, next_lanelet, self.centerlines.lengths)
+        keep = distance >= spacing * (1 - 1e-9)
+        lanelet, s, next_lanelet = lanelet[keep], s[keep], next_lanelet[keep]
+        n = lanelet.shape[0]
+        self.params = {key: np.full(n, float(value)) for key, value in params.items()}
+        # 희망 속도만 차량별로 다르게
+        self.params['v0'] *= 1 + self.rng.uniform(-v0_spread, v0_spread, n)
+
+        self.ids = np.arange(n)
+        self.lengths = np.full(n, float(length))
+        self.widths = np.full(n, float(width))
+        self.lanelet = lanelet
+        self.s = s
+        p = self.params
+        self.v = np.minimum(equilibrium_speed(spacing - length, p['v0'], p['T'], p['s0']), start_speed * p['v0'])
+        self.next_lanelet = next_lanelet
+        self.active = np.ones(n, dtype=bool)
+        self.ego_lanelets = {}
+
+        self._states = self._compute_states()
+        self._previous = (self._states, self.active.copy())
+        self.ahead = 0.0  # advance(): 교통 시각이 ego 시각보다 앞선 시간 (s)
+
+    def __len__(self):
+        return self.ids.shape[0]
+
+    # ----- 초기화 -----
+    @staticmethod
+    def _successor_table(graph):
+        degree = np.array([len(s) for s in graph.successors], dtype=np.int64)
+        table = np.full((len(graph), max(degree.max(initial=0), 1)), -1, dtype=np.int64)
+        for i, successors in enumerate(graph.successors):
+            table[i, :len(successors)] = successors
+        return table, degree
+
+    def _slot_count(self, spacing):
+        return int(np.floor(self.centerlines.lengths / spacing).sum())
+
+    def _spawn_spacing(self, n, preferred, minimum):
+        """preferred 로 n 대가 들어가면 preferred, 아니면 n 대가 들어가는 가장 넓은 간격 (minimum 이상)."""
+        if self._slot_count(preferred) >= n:
+            return preferred
+        if self._slot_count(minimum) < n:
+            return minimum
+        lo, hi = minimum, preferred
+        for _ in range(30):
+            mid = (lo + hi) / 2
+            lo, hi = (mid, hi) if self._slot_count(mid) >= n else (lo, mid)
+        return lo
+
+    def _spawn_slots(self, n, spacing):
+        """모든 lanelet 을 spacing 간격 slot 으로 나눠 겹치지 않게 n 개를 고른다."""
+        lengths = self.centerlines.lengths
+        slots_per_lanelet = np.floor(lengths / spacing).astype(np.int64)
+        total = int(slots_per_lanelet.sum())
+        chosen = np.sort(self.rng.choice(total, size=min(n, total), replace=False))
+        boundaries = np.cumsum(slots_per_lanelet)
+        lanelet = np.searchsorted(boundaries, chosen, side='right')
+        slot = chosen - (boundaries[lanelet] - slots_per_lanelet[lanelet])
+        return lanelet.astype(np.int64), (slot + 0.5) * spacing
+
+    def _choose_next(self, lanelet):
+        degree = self.successor_count[lanelet]
+        pick = np.floor(self.rng.random(lanelet.shape[0]) * np.maximum(degree, 1)).astype(np.int64)
+        return np.where(degree > 0, self.successor_table[lanelet, pick], -1)
+
+    # ----- ego -----
+    def _ego_arrays(self, egos):
+        """egos: (x, y, speed) 목록 -> lanelet 위에 있는 ego 의 (lanelet, s, v)."""
+        lanelet, s, v = [], [], []
+        for k, (x, y, speed) in enumerate(egos):
+            i = self.graph.locate((x, y), hint=self.ego_lanelets.get(k))
+            self.ego_lanelets[k] = i
+            if i is None:
+                continue
+            lanelet.append(i)
+            s.append(self.centerlines.station(i, (x, y)))
+            v.append(speed)
+        return np.array(lanelet, dtype=np.int64), np.array(s, dtype=float), np.array(v, dtype=float)
+
+    # ----- 한 step -----
+    def step(self, dt=None, egos=(), ego_length=5.0):
+        dt = self.dt if dt is None else dt
+        self._previous = (self._states, self.active.copy())
+
+        active = np.flatnonzero(self.active)
+        ego_lanelet, ego_s, ego_v = self._ego_arrays(egos)
+        m = active.shape[0]
+        lanelet = np.concatenate([self.lanelet[active], ego_lanelet])
+        s = np.concatenate([self.s[active], ego_s])
+        v = np.concatenate([self.v[active], ego_v])
+        lengths = np.concatenate([self.lengths[active], np.full(ego_lanelet.shape[0], ego_length)])
+        next_lanelet = np.concatenate([self.next_lanelet[active], np.full(ego_lanelet.shape[0], -1)])
+
+        p = {key: value[active] for key, value in self.params.items()}
+        # 희망 간격 (s0 + vT) 의 두 배와 제동 거리보다 먼 차량은 가속도에 거의 영향이 없다
+        horizon = np.concatenate([2 * (p['s0'] + v[:m] * p['T']) + v[:m] ** 2 / (2 * p['b']) + lengths[:m],
+                                  np.zeros(ego_lanelet.shape[0])])
+        leader, distance = find_leaders(lanelet, s, next_lanelet, self.centerlines.lengths,
+                                        successor=self.only_successor, horizon=horizon)
+        leader, distance = leader[:m], distance[:m]
+        has_leader = leader >= 0
+        gap = np.where(has_leader, distance - (lengths[:m] + lengths[np.maximum(leader, 0)]) / 2, np.inf)
+        dv = np.where(has_leader, v[:m] - v[np.maximum(leader, 0)], 0.0)
+        acceleration = idm_acceleration(v[:m], gap, dv, p['v0'], p['T'], p['a'], p['b'], p['s0'])
+
+        # ballistic update: 속도는 0 아래로 내려가지 않는다
+        v_old = v[:m]
+        v_new = np.maximum(v_old + acceleration * dt, 0.0)
+        stopping = (v_new == 0) & (acceleration < 0)
+        ds = np.where(stopping, -v_old ** 2 / (2 * np.minimum(acceleration, -1e-9)), v_old * dt + 0.5 * acceleration * dt ** 2)
+        self.s[active] += ds
+        self.v[active] = v_new
+
+        self._advance_lanelets()
+        if self.respawn:
+            self._respawn()
+        self.time_step += 1
+        self._states = self._compute_states()
+        return acceleration
+
+    def advance(self, dt, egos=(), ego_length=5.0):
+        """ego 시계로 dt 만큼 진행. IDM 은 항상 self.dt 고정 step 으로 적분한다.
+
+        교통 시각이 ego 시각을 앞지를 때까지만 step 하므로 (time_step - 1, time_step) 두 sample 이
+        ego 시각을 감싼다. clock() 을 InterpolatedTable 에 넘기면 그 사이를 보간해서 읽는다.
+        """
+        self.ahead -= dt
+        while self.ahead < 0:
+            self.step(egos=egos, ego_length=ego_length)
+            self.ahead += self.dt
+
+    def clock(self):
+        """ego 시각에 해당하는 실수 time step (advance() 와 같이 쓴다)."""
+        return self.time_step - self.ahead / self.dt
+
+    def _advance_lanelets(self):
+        lane_lengths = self.centerlines.lengths
+        over = self.active & (self.s >= lane_lengths[self.lanelet])
+        while over.any():
+            idx = np.flatnonzero(over)
+            self.s[idx] -= lane_lengths[self.lanelet[idx]]
+            nxt = self.next_lanelet[idx]
+            dead = nxt < 0
+            self.active[idx[dead]] = False
+            moved = idx[~dead]
+            self.lanelet[moved] = nxt[~dead]
+            self.next_lanelet[moved] = self._choose_next(self.lanelet[moved])
+            over = self.active & (self.s >= lane_lengths[self.lanelet])
+
+    def _respawn(self):
+        """막다른 lanelet 끝에서 사라진 차량을 시작 lanelet 입구에 다시 넣는다 (입구가 비어 있을 때만).
+
+        입구 하나에는 step 마다 한 대만 (같은 입구를 고른 차량 중 앞 번호).
+        """
+        inactive = np.flatnonzero(~self.active)
+        if inactive.size == 0:
+            return
+        source = self.sources[self.rng.integers(self.sources.shape[0], size=inactive.shape[0])]
+        source, first = np.unique(source, return_index=True)
+        inactive = inactive[first]
+        # 입구 lanelet 마다 가장 뒤에 있는 차량의 위치
+        rear = np.full(len(self.graph), np.inf)
+        active = self.active
+        np.minimum.at(rear, self.lanelet[active], self.s[active])
+        clear = rear[source] >= self.lengths[inactive] + self.params['s0'][inactive]
+        k, i = inactive[clear], source[clear]
+        self.lanelet[k], self.s[k] = i, 0.0
+        self.v[k] = 0.5 * self.params['v0'][k]
+        self.next_lanelet[k] = self._choose_next(i)
+        self.active[k] = True
+
+    def _compute_states(self):
+        states = np.zeros((len(self), 4))
+        if len(self):
+            x, y, heading = self.centerlines.pose(self.lanelet, np.minimum(self.s, self.centerlines.lengths[self.lanelet]))
+            states[:, X], states[:, Y], states[:, ORIENTATION] = x, y, heading
+            states[:, VELOCITY] = self.v
+        return states
+
+    # ----- ObstacleStateTable 과 같은 조회 -----
+    @property
+    def num_steps(self):
+        return self.time_step + 1
+
+    def at(self, time_step):
+        if time_step == self.time_step:
+            return self._states, self.active
+        if time_step == self.time_step - 1:
+            return self._previous
+        return np.zeros((len(self), 4)), np.zeros(len(self), dtype=bool)
+
+    # ----- keyframe 용 -----
+    def snapshot(self):
+        return {
+            'time_step': self.time_step,
+            'arrays': {name: getattr(self, name).copy() for name in ('lanelet', 's', 'v', 'next_lanelet', 'active')},
+            'previous': self._previous,
+            'rng': self.rng.bit_generator.state,
+            'ego_lanelets': dict(self.ego_lanelets),
+            'ahead': self.ahead,
+        }
+
+    def restore(self, state):
+        self.time_step = state['time_step']
+        for name, array in state['arrays'].items():
+            setattr(self, name, array.copy())
+        self._previous = state['previous']
+        self.rng.bit_generator.state = state['rng']
+        self.ego_lanelets = dict(state['ego_lanelets'])
+        self.ahead = state['ahead']
+        self._states = self._compute_states()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from main_rev import load_scenario
+    from routing import LaneletGraph
+
+    parser = argparse.ArgumentParser(description='IDM traffic throughput')
+    parser.add_argument('--scenario', default='./scenario/USA_Lanker-1_1_T-1.xml')
+    parser.add_argument('--vehicles', type=int, default=2000)
+    parser.add_argument('--steps', type=int, default=600)
+    parser.add_argument('--dt', type=float, default=0.1)
+    args = parser.parse_args()
+
+    scenario, _ = load_scenario(args.scenario)
+    graph = LaneletGraph.from_lanelet_network(scenario.lanelet_network)
+    traffic = TrafficSimulation(graph, args.vehicles, dt=args.dt, seed=0)
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        traffic.step()
+    elapsed = time.perf_counter() - t0
+    simulated = args.steps * args.dt
+    print(f"{len(traffic)} vehicles ({traffic.requested} requested), {args.steps} steps: {elapsed * 1e3 / args.steps:.2f} ms/step, "
+          f"{simulated / elapsed:.0f}x real time, {traffic.active.sum()} active, mean speed {traffic.v[traffic.active].mean():.1f} m/s")
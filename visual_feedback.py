@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+import pygame
+
+# ===================================
+# 좌표 변환 (world[m] -> screen[px])
+# ===================================
+class View():
+    def __init__(self, matrix, offset):
+        self.matrix = np.asarray(matrix, dtype=float)  # 2x2
+        self.offset = np.asarray(offset, dtype=float)  # 2
+        self.scale = math.sqrt(abs(np.linalg.det(self.matrix)))  # px / m
+
+    @classmethod
+    def from_axes(cls, ax, canvas_size, screen_size):
+        """matplotlib axes의 데이터 좌표계를 (스케일된) pygame 화면 좌표계로 옮기는 변환."""
+        canvas_w, canvas_h = canvas_size
+        sx = screen_size[0] / canvas_w
+        sy = screen_size[1] / canvas_h
+        o, ex, ey = ax.transData.transform([(0, 0), (1, 0), (0, 1)])
+        # matplotlib display 좌표는 아래가 원점 -> y축 뒤집기
+        to_screen = np.array([[sx, 0], [0, -sy]])
+        matrix = to_screen @ np.column_stack([ex - o, ey - o])
+        offset = to_screen @ o + np.array([0, canvas_h * sy])
+        return cls(matrix, offset)
+
+    @classmethod
+    def centered(cls, center, scale, screen_size):
+        """center 를 화면 가운데에 두고 scale (px / m) 로 보는 변환 (y축 위쪽)."""
+        matrix = np.array([[scale, 0], [0, -scale]])
+        offset = np.array(screen_size, dtype=float) / 2 - matrix @ np.asarray(center, dtype=float)
+        return cls(matrix, offset)
+
+    def to_screen(self, points):
+        points = np.asarray(points, dtype=float)
+        return points @ self.matrix.T + self.offset
+
+    def to_world(self, points):
+        points = np.asarray(points, dtype=float)
+        return (points - self.offset) @ np.linalg.inv(self.matrix).T
+
+    def world_bbox(self, screen_size):
+        """화면에 보이는 world 영역 (x0, y0, x1, y1)."""
+        w, h = screen_size
+        corners = self.to_world([(0, 0), (w, 0), (0, h), (w, h)])
+        return (*corners.min(axis=0), *corners.max(axis=0))
+
+
+# ===================================
+# 시각 피드백 레이어
+# ===================================
+WARNING_COLORS = [
+    (2.5, (255, 0, 0, 140)),
+    (5, (255, 120, 0, 110)),
+    (10, (255, 220, 0, 80)),
+]
+PATH_COLOR = (0, 160, 255, 90)
+LANE_DEPARTURE_COLOR = (255, 0, 0, 110)
+
+
+def ribbon_polygon(path, width):
+    """경로 (n, 3 [x, y, angle]) 양 옆으로 width/2 만큼 띄운 다각형."""
+    normal = np.stack([-np.sin(path[:, 2]), np.cos(path[:, 2])], axis=1) * (width / 2)
+    left = path[:, :2] + normal
+    right = path[:, :2] - normal
+    return np.concatenate([left, right[::-1]])
+
+
+class VisualFeedbackLayer():
+    def __init__(self, screen_size, warning_threshold=10, lane_half_width=1.75, edge_width=40):
+        self.screen_size = screen_size
+        self.warning_threshold = warning_threshold
+        self.lane_half_width = lane_half_width
+        self.edge_width = edge_width
+        self._items = []  # (surface 또는 path 크기, 화면 위치, path 다각형 또는 None)
+        self._edge_surfaces = {}
+        self._warning_sprites = {}  # (반지름, 색) -> sprite
+        self._path_surface = None  # path 다각형을 그릴 때 재사용하는 SRCALPHA surface
+
+    def clear(self):
+        self._items = []
+
+    # ----- 요소 추가 -----
+    def add_warning_zones(self, view, positions, distances):
+        for (px, py), distance in zip(view.to_screen(positions), distances):
+            color = None
+            for limit, c in WARNING_COLORS:
+                if distance <= limit:
+                    color = c
+                    break
+            if color is None:
+                continue
+            radius = max(int(view.scale * 2.5), 4)
+            self._items.append((self.warning_sprite(radius, color), (int(px) - radius, int(py) - radius), None))
+
+    def warning_sprite(self, radius, color):
+        """반지름 / 색 별로 한 번만 그려두고 재사용한다."""
+        sprite = self._warning_sprites.get((radius, color))
+        if sprite is None:
+            sprite = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._warning_sprites[(radius, color)] = sprite
+        return sprite
+
+    def add_predicted_path(self, view, path, width):
+        # 다각형 모양은 매 프레임 바뀌므로 draw() 에서 공용 surface 에 그려서 바로 blit
+        polygon = view.to_screen(ribbon_polygon(path, width))
+        x0, y0 = np.floor(polygon.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(polygon.max(axis=0)).astype(int)
+        size = (max(x1 - x0, 1), max(y1 - y0, 1))
+        self._items.append((size, (x0, y0), (polygon - (x0, y0)).tolist()))
+
+    def path_surface(self, size):
+        """size 이상인 공용 SRCALPHA surface. 모자랄 때만 새로 만든다."""
+        surface = self._path_surface
+        if surface is None or surface.get_width() < size[0] or surface.get_height() < size[1]:
+            if surface is not None:
+                size = (max(size[0], surface.get_width()), max(size[1], surface.get_height()))
+            surface = self._path_surface = pygame.Surface(size, pygame.SRCALPHA)
+        return surface
+
+    def add_lane_departure(self, lane_offset, half_width=None):
+        # 차선을 벗어난 쪽 화면 가장자리를 붉게 표시
+        half_width = self.lane_half_width if half_width is None else half_width
+        if lane_offset is None or abs(lane_offset) <= half_width:
+            return
+        side = 'left' if lane_offset > 0 else 'right'
+        surface = self._edge_surfaces.get(side)
+        if surface is None:
+            surface = pygame.Surface((self.edge_width, self.screen_size[1]), pygame.SRCALPHA)
+            surface.fill(LANE_DEPARTURE_COLOR)
+            self._edge_surfaces[side] = surface
+        x = 0 if side == 'left' else self.screen_size[0] - self.edge_width
+        self._items.append((surface, (x, 0), None))
+
+    # ----- 합성 -----
+    def draw(self, display):
+        """쌓인 요소를 DisplayManager 로 그린다. 지난 프레임 영역 복원은 display 가 맡는다."""
+        rects = []
+        for surface, position, polygon in self._items:
+            if polygon is None:
+                rects.append(display.blit(surface, position))
+                continue
+            area = pygame.Rect((0, 0), surface)
+            scratch = self.path_surface(area.size)
+            scratch.fill((0, 0, 0, 0), area)
+            pygame.draw.polygon(scratch, PATH_COLOR, polygon)
+            rects.append(display.blit(scratch, position, area))
+        self._items = []
+        return rects